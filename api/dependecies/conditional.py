@@ -0,0 +1,114 @@
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Sequence, Tuple
+import hashlib
+
+from fastapi import Request, Response, status
+from sqlalchemy import Row, select
+from sqlalchemy.sql.elements import ColumnElement
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from api.dependecies.pagination import encode_cursor, keyset_window, paginate
+
+def make_etag(request: Request, *parts: Any) -> str:
+    """Weak ETag over the query string (filters, cursor, limit) and the given validator parts."""
+    digest = hashlib.sha1("|".join(map(str, (request.url.query, *parts))).encode()).hexdigest()
+    return f'W/"{digest}"'
+
+def validator_headers(etag: str, last_modified: datetime | None = None) -> dict[str, str]:
+    # no-cache lets clients store the page but makes them revalidate it on every poll
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(last_modified.astimezone(timezone.utc), usegmt=True)
+    return headers
+
+def is_not_modified(request: Request, etag: str, last_modified: datetime | None = None) -> bool:
+    """Evaluate If-None-Match, or If-Modified-Since when no If-None-Match was sent (RFC 9110, 13.2.2)."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # Weak comparison: W/"x" matches "x"
+        opaque = etag.removeprefix("W/")
+        tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        return "*" in tags or opaque in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is not None and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        # HTTP dates have second precision
+        return last_modified.replace(microsecond=0) <= since
+
+    return False
+
+def not_modified(headers: dict[str, str]) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+def is_conditional(request: Request) -> bool:
+    return "if-none-match" in request.headers or "if-modified-since" in request.headers
+
+def page_validators(
+    rows: Sequence[Any],
+    order: Sequence[ColumnElement],
+    changed_column: ColumnElement | None = None,
+) -> Tuple[datetime | None, str]:
+    """
+    Validators of a page in memory: ``max(changed_column)`` and a digest of its rows.
+
+    With a ``changed`` column the digest covers each row's sort keys and change time, so the
+    key columns are enough to compute it; without one it covers the full rows, so any edit
+    changes it. Rows may be model objects or the tuples of a projected (``fields=``) select.
+    """
+    if changed_column is None:
+        text = "".join(repr(tuple(row)) if isinstance(row, Row) else row.model_dump_json() for row in rows)
+        return None, hashlib.sha1(text.encode()).hexdigest()
+
+    columns = (*order, changed_column)
+    text = "".join(repr(tuple(getattr(row, column.key) for column in columns)) for row in rows)
+    last_modified = max((getattr(row, changed_column.key) for row in rows), default=None)
+    return last_modified, hashlib.sha1(text.encode()).hexdigest()
+
+def items_digest(items: Sequence[Any]) -> str:
+    """Digest of a page that is already in memory, e.g. one served from a reference cache."""
+    return hashlib.sha1("".join(item.model_dump_json() for item in items).encode()).hexdigest()
+
+async def conditional_page(
+    request: Request,
+    response: Response,
+    session: AsyncSession,
+    statement,
+    order: Sequence[ColumnElement],
+    cursor: str | None,
+    limit: int,
+    changed_column: ColumnElement | None = None,
+) -> Response | Tuple[list, str | None]:
+    """
+    Fetch one page of a list endpoint and answer a conditional GET for it.
+
+    Returns a 304 response when the client's copy is current. Otherwise the validators are
+    set on ``response`` and the page is returned as ``paginate`` returns it, so a plain GET
+    costs the one page query and its validators are derived from the rows it fetched.
+
+    A conditional GET of a list with a ``changed`` column is first checked against the sort
+    keys and change times of its page window alone, so an unchanged poll skips reading the rows.
+    """
+    if changed_column is not None and is_conditional(request):
+        keyed = select(*order, changed_column)
+        if statement.whereclause is not None:
+            keyed = keyed.where(statement.whereclause)
+        window = keyset_window(keyed, order, cursor, limit)
+        keys = list((await session.exec(window)).all())
+        next_cursor = encode_cursor([getattr(keys[limit - 1], column.key) for column in order]) if len(keys) > limit else None
+        last_modified, digest = page_validators(keys[:limit], order, changed_column)
+        headers = validator_headers(make_etag(request, digest, next_cursor), last_modified)
+        if is_not_modified(request, headers["ETag"], last_modified):
+            return not_modified(headers)
+
+    rows, next_cursor = await paginate(session, statement, order, cursor, limit)
+    last_modified, digest = page_validators(rows, order, changed_column)
+    headers = validator_headers(make_etag(request, digest, next_cursor), last_modified)
+    if is_not_modified(request, headers["ETag"], last_modified):
+        return not_modified(headers)
+    response.headers.update(headers)
+    return rows, next_cursor
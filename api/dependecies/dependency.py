@@ -1,13 +1,15 @@
-from typing import Annotated
-from fastapi import Query
-from sqlmodel import Session
+from typing import Annotated, Any
+from fastapi import Query, Request
+from sqlmodel.ext.asyncio.session import AsyncSession
 from fastapi import Depends
 from database.postgres.db import get_session_db
+from database.mongodb.audit import audit_logger, model_diff
 from enum import Enum
 from datetime import date
 from typing import Union, Optional
+import time
   
-SessionDep = Annotated[Session, Depends(get_session_db)]
+SessionDep = Annotated[AsyncSession, Depends(get_session_db)]
 
 class ComparativeFilter:
     def __init__(
@@ -29,14 +31,70 @@ ComparativeDep = Annotated[ComparativeFilter, Depends(ComparativeFilter)]
 class SelectFilter:
     def __init__(
         self,
-        offset: Annotated[int, Query()] = 0,
-        limit: Annotated[int, Query(le=100)] = 0
+        cursor: Annotated[Optional[str], Query(description="next_cursor returned with the previous page")] = None,
+        limit: Annotated[int, Query(ge=1, le=100)] = 50
         ):
-        self.offset = offset
+        self.cursor = cursor
         self.limit = limit
         
 SelectDep = Annotated[SelectFilter, Depends(SelectFilter)]
     
+class AuditTrail:
+    """Who is changing what in this request; ``log`` hands the event to the buffered audit logger."""
+    def __init__(self, request: Request):
+        # There is no authentication yet, so the actor is whoever the caller says it is
+        self.actor = request.headers.get("X-Actor") or (request.client.host if request.client else None)
+        self.method = request.method
+        self.path = request.url.path
+        self.started = time.perf_counter()
+
+    def log(
+        self,
+        action: str,
+        entity: str,
+        entity_id: Any = None,
+        before: Optional[dict] = None,
+        after: Optional[dict] = None
+    ):
+        """Record a committed change; ``before``/``after`` are ``model_dump(mode="json")`` snapshots of the row."""
+        audit_logger.record({
+            "kind": "audit",
+            "actor": self.actor,
+            "action": action,
+            "entity": entity,
+            "entity_id": entity_id,
+            "diff": model_diff(before or {}, after or {}),
+            "method": self.method,
+            "path": self.path,
+            "latency_ms": (time.perf_counter() - self.started) * 1000,
+        })
+
+AuditDep = Annotated[AuditTrail, Depends(AuditTrail)]
+
 class Learners(str, Enum):
     schooler = "schooler"
-    teacher = "teacher"    
\ No newline at end of file
+    teacher = "teacher"
+
+class People(str, Enum):
+    schooler = "schooler"
+    teacher = "teacher"
+    admin = "admin"
+
+class ExportEntity(str, Enum):
+    schoolers = "schoolers"
+    teachers = "teachers"
+    assignments = "assignments"
+    submissions = "submissions"
+
+class DeleteEntity(str, Enum):
+    classes = "classes"
+    subjects = "subjects"
+    schoolers = "schoolers"
+    teachers = "teachers"
+    admins = "admins"
+    assignments = "assignments"
+    submissions = "submissions"
+
+class ExportFormat(str, Enum):
+    ndjson = "ndjson"
+    csv = "csv"
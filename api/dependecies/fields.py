@@ -0,0 +1,48 @@
+from typing import Annotated, Any, List, Sequence, Type
+
+from fastapi import HTTPException, Query, status
+from sqlalchemy.sql.elements import ColumnElement
+from sqlmodel import SQLModel, select
+
+FieldsQuery = Annotated[
+    str | None,
+    Query(description="Comma-separated fields to return, e.g. id,first_name,last_name; all fields by default")
+]
+
+def parse_fields(fields: str | None, public: Type[SQLModel]) -> List[str] | None:
+    """
+    Validate a ``fields=`` value against the fields of ``public``.
+
+    Returns the requested fields in the order they were given, without duplicates, or None
+    when every field was asked for, so callers can keep the full-model path for that case.
+    """
+    if fields is None:
+        return None
+    requested = list(dict.fromkeys(field.strip() for field in fields.split(",") if field.strip()))
+    unknown = [field for field in requested if field not in public.model_fields]
+    if unknown or not requested:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Unknown fields {unknown}; choose from {list(public.model_fields)}." if unknown else "No fields given."
+        )
+    return None if set(requested) == set(public.model_fields) else requested
+
+def project(statement, model: Type[SQLModel], fields: Sequence[str], *required: ColumnElement):
+    """
+    A select of only the columns of ``fields`` with the filters of ``statement``, a single-table select.
+
+    ``required`` columns (the sort key, a ``changed`` column) are selected too even when not
+    requested, since pagination and the conditional GET validators read them from the rows.
+    """
+    columns = {field: getattr(model, field) for field in fields}
+    for column in required:
+        columns.setdefault(column.key, column)
+    # A fresh select rather than with_only_columns, which would keep select(model)'s scalar results
+    projected = select(*columns.values())
+    if statement.whereclause is not None:
+        projected = projected.where(statement.whereclause)
+    return projected
+
+def project_rows(rows: Sequence[Any], fields: Sequence[str]) -> List[dict[str, Any]]:
+    """Items of a projected page, straight from the row tuples."""
+    return [{field: row._mapping[field] for field in fields} for row in rows]
@@ -1,20 +1,38 @@
-from sqlmodel import SQLModel, Relationship, Field, Column, DateTime, func
-from sqlalchemy import String
+from sqlmodel import SQLModel, Relationship, Field, Column, DateTime, func, select
+from sqlalchemy import BigInteger, Computed, ForeignKey, Index, Integer, String, Text, UniqueConstraint, and_, literal_column, text
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred
 from datetime import datetime, date
-from typing import Optional, List
-from pydantic import EmailStr
+from enum import Enum
+from typing import Optional, List, Generic, TypeVar
+from pydantic import BaseModel, EmailStr
+
+T = TypeVar("T")
+
+class Page(BaseModel, Generic[T]):
+    items: List[T]
+    next_cursor: Optional[str] = None
 
 class ClassBase(SQLModel):
-    name: str = Field(unique=True, nullable=False, sa_type=String(3))
+    name: str = Field(nullable=False, sa_type=String(3))
     
 class ClassCreate(ClassBase):
     pass
 
 class Class(ClassBase, table=True):
+    # Names are unique among live classes only, so a deleted class's name can be reused before it is purged
+    __table_args__ = (
+        Index("uq_class_name_live", "name", unique=True, postgresql_where=text("deleted_at IS NULL")),
+        Index("ix_class_deleted_at", "deleted_at", postgresql_where=text("deleted_at IS NOT NULL")),
+    )
+
+    # Child rows are removed by the ON DELETE CASCADE foreign keys; passive_deletes stops the ORM loading them first
     id: Optional[int] = Field(default=None, primary_key=True)
     added: date = Field(default_factory=date.today, nullable=False)
+    # Set by a delete; the purge worker removes the row and everything under it later
+    deleted_at: Optional[datetime] = Field(default=None, sa_column=Column(DateTime(timezone=True), nullable=True))
     schoolers: List["Schooler"] = Relationship(
-        sa_relationship_kwargs={"cascade": "delete, delete-orphan"},
+        sa_relationship_kwargs={"cascade": "delete, delete-orphan", "passive_deletes": True},
         back_populates="class_item"
     )
 
@@ -32,17 +50,20 @@ class UserBase(SQLModel):
     age: int = Field(nullable=False, gt=0)
 
 class TeacherBase(UserBase):
+    # No cascade here: deleting a class or subject that still has a teacher is refused instead
     class_id: int = Field(nullable=False, unique=True, foreign_key="class.id")
-    subject_id: int = Field(nullable=False, foreign_key="subject.id")
+    subject_id: int = Field(nullable=False, index=True, foreign_key="subject.id")
     
 class TeacherCreate(TeacherBase):
     pass
     
 class Teacher(TeacherBase, table=True):
+    __table_args__ = (Index("ix_teacher_last_name_id", "last_name", "id"),)
+
     id: Optional[int] = Field(default=None, primary_key=True)
     added: date = Field(default_factory=date.today)
     assignments: List["Assignment"] = Relationship(
-        sa_relationship_kwargs={"cascade": "delete, delete-orphan"},
+        sa_relationship_kwargs={"cascade": "delete, delete-orphan", "passive_deletes": True},
         back_populates="teacher"
     )
 
@@ -57,17 +78,23 @@ class TeacherWithAssignments(TeacherPublic):
     assignments: List["Assignment"]
 
 class SchoolerBase(UserBase):
-    class_id: int = Field(foreign_key="class.id")   
+    class_id: int = Field(foreign_key="class.id", ondelete="CASCADE")
      
-class SchoolerCreate(UserBase):
+class SchoolerCreate(SchoolerBase):
     pass
     
 class Schooler(SchoolerBase, table=True):
+    # (class_id, last_name, id) serves both the class_id foreign key and class-filtered keyset pages
+    __table_args__ = (
+        Index("ix_schooler_class_id_last_name_id", "class_id", "last_name", "id"),
+        Index("ix_schooler_last_name_id", "last_name", "id"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     added: date = Field(default_factory=date.today)
     class_item: Class = Relationship(back_populates="schoolers")
     assignments: List["SubmittedAssignment"] = Relationship(
-        sa_relationship_kwargs={"cascade": "delete, delete-orphan"},
+        sa_relationship_kwargs={"cascade": "delete, delete-orphan", "passive_deletes": True},
         back_populates="schooler"
     )
     
@@ -84,6 +111,8 @@ class AdminCreate(UserBase):
     pass
 
 class Admin(UserBase, table=True):
+    __table_args__ = (Index("ix_admin_last_name_admin_id", "last_name", "admin_id"),)
+
     admin_id: int | None = Field(default=None, primary_key=True)
     added: date = Field(default_factory=date.today)
 
@@ -91,16 +120,23 @@ class AdminPublic(UserBase):
     admin_id: int
 
 class SubjectBase(SQLModel):
-    name: str = Field(unique=True, nullable=False, sa_type=String(100))
+    name: str = Field(nullable=False, sa_type=String(100))
 
 class SubjectCreate(SubjectBase):
     pass
     
 class Subject(SubjectBase, table=True):
+    __table_args__ = (
+        Index("uq_subject_name_live", "name", unique=True, postgresql_where=text("deleted_at IS NULL")),
+        Index("ix_subject_deleted_at", "deleted_at", postgresql_where=text("deleted_at IS NOT NULL")),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     added: date = Field(default_factory=date.today)
+    # Set by a delete; the purge worker removes the row and everything under it later
+    deleted_at: Optional[datetime] = Field(default=None, sa_column=Column(DateTime(timezone=True), nullable=True))
     assignments: List["Assignment"] = Relationship(
-        sa_relationship_kwargs={"cascade": "delete, delete-orphan"},
+        sa_relationship_kwargs={"cascade": "delete, delete-orphan", "passive_deletes": True},
         back_populates="subject"
     )
         
@@ -111,8 +147,8 @@ class SubjectPublicWithAssignments(SubjectPublic):
     assignments: List["AssignmentPublic"] = []
     
 class AssignmetBase(SQLModel):
-    teacher_id: int = Field(nullable=False, foreign_key="teacher.id")
-    subject_id: int = Field(nullable=False, foreign_key="subject.id")
+    teacher_id: int = Field(nullable=False, index=True, foreign_key="teacher.id", ondelete="CASCADE")
+    subject_id: int = Field(nullable=False, index=True, foreign_key="subject.id", ondelete="CASCADE")
     title: str = Field(nullable=False, sa_type=String(150))
     description: str = Field(nullable=False, sa_type=String(1000))
     assign_type: str = Field(nullable=False, sa_type=String(25))
@@ -141,7 +177,7 @@ class Assignment(AssignmetBase, table=True):
     teacher: Teacher = Relationship(back_populates="assignments")
     subject: Subject = Relationship(back_populates="assignments")
     submitted_assignments: List["SubmittedAssignment"] = Relationship(
-        sa_relationship_kwargs={"cascade": "delete, delete-orphan"},
+        sa_relationship_kwargs={"cascade": "delete, delete-orphan", "passive_deletes": True},
         back_populates="assignment"
     )
     
@@ -154,17 +190,37 @@ class AssignmentPublicWithData(AssignmentPublic):
     teacher: TeacherPublic
     subject: SubjectPublic
     
+# Longest work a schooler may hand in, inline or offloaded to submissionbody
+SUBMISSION_MAX_LENGTH = 15000
+
 class SubmittedAssignmentBase(SQLModel):
-    work: str = Field(nullable=False, description="work that schoolers handed in", sa_type=String(15000))
+    work: str = Field(nullable=False, description="work that schoolers handed in", sa_type=String(SUBMISSION_MAX_LENGTH))
     grade: Optional[int] = Field(default=None)
-    schooler_id: int = Field(foreign_key="schooler.id")
-    assignment_id: int = Field(foreign_key="assignment.id") 
+    schooler_id: int = Field(foreign_key="schooler.id", ondelete="CASCADE")
+    assignment_id: int = Field(foreign_key="assignment.id", ondelete="CASCADE")
 
 class SubmittedAssignmentCreate(SubmittedAssignmentBase):
-    pass
+    # submissionbody is unbounded, so the cap is checked here rather than by the column
+    work: str = Field(max_length=SUBMISSION_MAX_LENGTH, description="work that schoolers handed in")
     
+# NULL when the body is longer than SUBMISSION_INLINE_LIMIT and kept in submissionbody instead
+_submission_work = Column("work", String(SUBMISSION_MAX_LENGTH), nullable=True)
+
 class SubmittedAssignment(SubmittedAssignmentBase, table=True):
+    # The unique key leads with schooler_id; the composite index covers assignment_id lookups in roster order
+    __table_args__ = (
+        UniqueConstraint("schooler_id", "assignment_id"),
+        Index("ix_submittedassignment_assignment_id_submitted_id", "assignment_id", "submitted", "id"),
+    )
+    # The body is deferred, so loading a submission never reads it; whoever needs it
+    # selects work_text() or undefers it, and an unloaded body is left out of model_dump
+    __mapper_args__ = {"properties": {"work": deferred(_submission_work)}}
+
     id: Optional[int] = Field(default=None, primary_key=True)
+    work: Optional[str] = Field(default=None, sa_column=_submission_work)
+    # UTF-8 length and sha256 of the body, so listings can describe it without reading it
+    work_size: int = Field(default=0, sa_column=Column(Integer, nullable=False, server_default="0"))
+    work_hash: Optional[str] = Field(default=None, sa_type=String(64))
     submitted: datetime = Field(
         sa_column=Column(
             DateTime(timezone=True),
@@ -177,10 +233,224 @@ class SubmittedAssignment(SubmittedAssignmentBase, table=True):
     schooler: Schooler = Relationship(back_populates="assignments")
     assignment: Assignment = Relationship(back_populates="submitted_assignments")
 
+def full_name(model):
+    """``first_name || ' ' || last_name`` of a person table; the trigram indexes are built on exactly this expression."""
+    # A literal instead of a bind parameter, otherwise the planner can't match the expression index
+    return model.first_name + literal_column("' '") + model.last_name
+
+def live(model):
+    """Rows of a soft-deletable table (Class, Subject) that haven't been deleted; the partial indexes are built on this predicate."""
+    return model.deleted_at.is_(None)
+
+def in_live(column, model):
+    """``column`` points at a live row of ``model``, for hiding the rows under a deleted class or subject until they are purged."""
+    return column.in_(select(model.id).where(live(model)))
+
+def live_submission():
+    """A submission whose schooler's class and whose assignment's subject are both live."""
+    return and_(
+        SubmittedAssignment.schooler_id.in_(select(Schooler.id).where(in_live(Schooler.class_id, Class))),
+        SubmittedAssignment.assignment_id.in_(select(Assignment.id).where(in_live(Assignment.subject_id, Subject)))
+    )
+
+# Trigram indexes for fuzzy name lookup, one per person table
+for _person in (Schooler, Teacher, Admin):
+    Index(
+        f"ix_{_person.__tablename__}_full_name_trgm",
+        full_name(_person).label("full_name"),
+        postgresql_using="gin",
+        postgresql_ops={"full_name": "gin_trgm_ops"}
+    )
+
+# Text search configuration shared by the generated columns and the search queries
+SEARCH_CONFIG = "english"
+
+# Postgres maintains the search vectors itself; they are added to the tables without being mapped,
+# so loading an Assignment or a submission never drags them along
+Assignment.__table__.append_column(Column(
+    "search_vector",
+    TSVECTOR,
+    Computed(
+        f"setweight(to_tsvector('{SEARCH_CONFIG}', title), 'A') || setweight(to_tsvector('{SEARCH_CONFIG}', description), 'B')",
+        persisted=True
+    )
+))
+Index("ix_assignment_search_vector", Assignment.__table__.c.search_vector, postgresql_using="gin")
+
+# Written by the application from the full text, since a generated column can't see bodies kept in submissionbody
+SubmittedAssignment.__table__.append_column(Column("search_vector", TSVECTOR))
+Index("ix_submittedassignment_search_vector", SubmittedAssignment.__table__.c.search_vector, postgresql_using="gin")
+
+class GradeSummary(SQLModel, table=True):
+    # Running per-subject aggregates of a schooler's graded submissions, kept in step by every grade write;
+    # the subject_id index serves the ON DELETE CASCADE from subject
+    __table_args__ = (Index("ix_gradesummary_subject_id", "subject_id"),)
+
+    schooler_id: int = Field(sa_column=Column(Integer, ForeignKey("schooler.id", ondelete="CASCADE"), primary_key=True))
+    subject_id: int = Field(sa_column=Column(Integer, ForeignKey("subject.id", ondelete="CASCADE"), primary_key=True))
+    graded: int = Field(default=0, sa_column=Column(Integer, nullable=False, server_default="0"))
+    grade_sum: int = Field(default=0, sa_column=Column(BigInteger, nullable=False, server_default="0"))
+    grade_sum_squares: int = Field(default=0, sa_column=Column(BigInteger, nullable=False, server_default="0"))
+
+class SubmissionBody(SQLModel, table=True):
+    # Bodies longer than SUBMISSION_INLINE_LIMIT; TOAST compresses them, and rows of
+    # submittedassignment stay narrow whether or not a query asks for the body
+    submitted_assignment_id: int = Field(
+        sa_column=Column(Integer, ForeignKey("submittedassignment.id", ondelete="CASCADE"), primary_key=True)
+    )
+    body: str = Field(sa_column=Column(Text, nullable=False))
+
 class SubmittedAssignmentPublic(SubmittedAssignmentBase):
     id: int
     submitted: datetime
+    work_size: int
+    work_hash: Optional[str] = None
+
+class SubmittedAssignmentSummary(SQLModel):
+    """A submission without its body, for listings; the body is served by its own endpoint."""
+    id: int
+    grade: Optional[int] = None
+    schooler_id: int
+    assignment_id: int
+    submitted: datetime
+    work_size: int
+    work_hash: Optional[str] = None
 
 class SubmittedAssignmentPublicWithData(SubmittedAssignmentPublic):
     assignment: AssignmentPublic
-    schooler: SchoolerPublic
\ No newline at end of file
+    schooler: SchoolerPublic
+
+class SubmissionRosterEntry(SQLModel):
+    submission: SubmittedAssignmentSummary
+    schooler: SchoolerPublic
+    late: bool
+class PoolStatus(SQLModel):
+    pool_class: str
+    size: Optional[int] = None
+    checked_out: Optional[int] = None
+    idle: Optional[int] = None
+    overflow: Optional[int] = None
+    checkouts: int
+    timeouts: int
+    wait_avg_ms: float
+    wait_max_ms: float
+    wait_last_ms: float
+
+class BulkStatus(str, Enum):
+    created = "created"
+    conflict = "conflict"
+    invalid = "invalid"
+
+class BulkItemResult(SQLModel):
+    index: int
+    status: BulkStatus
+    id: Optional[int] = None
+    detail: Optional[str] = None
+
+class BulkCreateResult(SQLModel):
+    created: int
+    conflicts: int
+    invalid: int
+    items: List[BulkItemResult]
+
+# Grades a bulk request may set; a whole batch is refused before any row is touched
+BULK_MIN_GRADE = 1
+BULK_MAX_GRADE = 12
+
+class GradeItem(SQLModel):
+    submitted_assignment_id: int
+    grade: int = Field(ge=BULK_MIN_GRADE, le=BULK_MAX_GRADE)
+
+class BulkGradeResult(SQLModel):
+    updated: int
+    missing: List[int]
+
+class BulkDeleteResult(SQLModel):
+    deleted: List[int]
+    missing: List[int]
+
+class RosterRowError(SQLModel):
+    line: int
+    errors: List[str]
+
+class RosterImportReport(SQLModel):
+    learner: str
+    received: int
+    staged: int
+    inserted: int
+    rejected: int
+    errors: List[RosterRowError]
+
+class CacheStatus(SQLModel):
+    name: str
+    rows: Optional[int] = None
+    hits: int
+    misses: int
+    invalidations: int
+    age_seconds: Optional[float] = None
+
+class AuditStatus(SQLModel):
+    queued: int
+    written: int
+    dropped: int
+    failed: int
+
+class PurgeStatus(SQLModel):
+    running: bool
+    purged: int
+    deleted_rows: int
+    failed: int
+
+class GradeStats(SQLModel):
+    scope: str
+    id: int
+    submissions: int
+    expected_submissions: int
+    graded: int
+    mean: Optional[float] = None
+    median: Optional[float] = None
+    p25: Optional[float] = None
+    p75: Optional[float] = None
+    p90: Optional[float] = None
+    min: Optional[int] = None
+    max: Optional[int] = None
+    histogram: dict[int, int] = {}
+    submission_rate: Optional[float] = None
+    late_rate: Optional[float] = None
+
+class SubjectAverage(SQLModel):
+    subject_id: int
+    graded: int
+    mean: Optional[float] = None
+    stddev: Optional[float] = None
+
+class SchoolerAverages(SQLModel):
+    schooler_id: int
+    subjects: List[SubjectAverage]
+
+class AssignmentSearchHit(SQLModel):
+    id: int
+    teacher_id: int
+    subject_id: int
+    title: str
+    assign_type: str
+    deadline: date
+    rank: float
+    snippet: str
+
+class SubmissionSearchHit(SQLModel):
+    id: int
+    schooler_id: int
+    assignment_id: int
+    grade: Optional[int] = None
+    submitted: datetime
+    rank: float
+    snippet: str
+
+class PersonMatch(SQLModel):
+    kind: str
+    id: int
+    first_name: str
+    last_name: str
+    email: str
+    similarity: float
@@ -0,0 +1,114 @@
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import date, datetime
+from typing import Any, Callable, Sequence, Tuple
+import binascii
+import json
+
+from fastapi import HTTPException, status
+from sqlalchemy import tuple_
+from sqlalchemy.sql.elements import ColumnElement
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+def _to_json(value: Any) -> Any:
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+def _from_json(value: Any, column: ColumnElement) -> Any:
+    if value is None:
+        return None
+    python_type = column.type.python_type
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is date:
+        return date.fromisoformat(value)
+    return python_type(value)
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Turn the sort key of the last row on a page into an opaque cursor token."""
+    raw = json.dumps([_to_json(value) for value in values], separators=(",", ":"))
+    return urlsafe_b64encode(raw.encode()).rstrip(b"=").decode()
+
+def decode_cursor(cursor: str, order: Sequence[ColumnElement]) -> Tuple[Any, ...]:
+    """Read a cursor produced by ``encode_cursor`` back into typed sort key values."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != len(order):
+            raise ValueError("cursor does not match the sort order")
+        return tuple(_from_json(value, column) for value, column in zip(values, order))
+    except (ValueError, TypeError, binascii.Error):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor.")
+
+def keyset_window(statement, order: Sequence[ColumnElement], cursor: str | None, limit: int, descending: bool = False):
+    """Restrict ``statement`` to the rows of one page, plus one row that tells whether another page follows."""
+    if cursor is not None:
+        # Row comparison lets Postgres seek straight into an index on the sort columns instead of skipping rows
+        key = tuple_(*order)
+        boundary = tuple_(*decode_cursor(cursor, order))
+        statement = statement.where(key < boundary if descending else key > boundary)
+
+    statement = statement.order_by(*(column.desc() if descending else column for column in order))
+    # The extra row avoids a count query
+    return statement.limit(limit + 1)
+
+async def paginate(
+    session: AsyncSession,
+    statement,
+    order: Sequence[ColumnElement],
+    cursor: str | None,
+    limit: int,
+    descending: bool = False,
+    row_key: Callable[[Any], Any] | None = None,
+) -> Tuple[list, str | None]:
+    """
+    Fetch one page of ``statement`` with keyset pagination.
+
+    Args:
+        session (AsyncSession): Database session.
+        statement: Filtered select to page through.
+        order (Sequence[ColumnElement]): Sort columns, ending with the primary key so the order is stable.
+        cursor (str | None): ``next_cursor`` of the previous page, or None for the first page.
+        limit (int): Page size.
+        descending (bool): Walk the sort order backwards.
+        row_key (Callable | None): Picks the object holding the sort columns out of a multi-entity row.
+
+    Returns:
+        Tuple[list, str | None]: Rows of the page and the cursor of the next page (None on the last page).
+    """
+    rows = list((await session.exec(keyset_window(statement, order, cursor, limit, descending))).all())
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = row_key(rows[-1]) if row_key else rows[-1]
+        next_cursor = encode_cursor([getattr(last, column.key) for column in order])
+
+    return rows, next_cursor
+
+def paginate_rows(
+    rows: Sequence[Any],
+    order: Sequence[ColumnElement],
+    cursor: str | None,
+    limit: int,
+) -> Tuple[list, str | None] | None:
+    """
+    Keyset-paginate rows that are already in memory, in the ``ORDER BY`` order Postgres returned them.
+
+    Takes the same cursors as ``paginate``. Sort keys are only compared for equality, since Python
+    doesn't know the database collation, so a page starts right after the row its cursor names.
+    Returns None when that row isn't among ``rows`` any more, and the caller pages in Postgres.
+    """
+    if cursor is not None:
+        boundary = decode_cursor(cursor, order)
+        keys = [tuple(getattr(row, column.key) for column in order) for row in rows]
+        if boundary not in keys:
+            return None
+        rows = rows[keys.index(boundary) + 1:]
+
+    page = list(rows[:limit])
+    next_cursor = None
+    if len(rows) > limit:
+        next_cursor = encode_cursor([getattr(page[-1], column.key) for column in order])
+
+    return page, next_cursor
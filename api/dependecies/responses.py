@@ -0,0 +1,38 @@
+from typing import Any
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+import pydantic_core
+
+try:
+    import orjson
+except ImportError:  # optional, installed with the "speedups" extra
+    orjson = None
+
+def _orjson_default(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return value.model_dump()
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response rendered without the standard library encoder.
+
+    Pydantic models (the ``*Public`` models and ``Page``) are serialized directly by pydantic-core.
+    Anything else goes through orjson when it is installed, otherwise through pydantic-core.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, BaseModel):
+            return content.__pydantic_serializer__.to_json(content)
+        if orjson is not None:
+            return orjson.dumps(content, default=_orjson_default)
+        return pydantic_core.to_json(content)
+
+def model_response(content: BaseModel, response: Response | None = None) -> FastJSONResponse:
+    """
+    Return a typed response model without FastAPI re-validating and re-encoding it.
+
+    Headers already set on the injected ``response`` (ETag, Cache-Control, ...) are carried over.
+    """
+    return FastJSONResponse(content, headers=dict(response.headers) if response is not None else None)
@@ -2,12 +2,26 @@ from api.routers.get import router_get
 from api.routers.post import router_post
 from api.routers.put import router_put
 from api.routers.delete import router_delete
+from api.routers.internal import router_internal
+from api.routers.export import router_export
+from api.routers.stats import router_stats
+from api.routers.search import router_search
+from api.routers.metrics import router_metrics
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
 import logging
+import os
 
-from database.postgres.db import create_db_and_tables
 from database.mongodb.db import client, database
+from database.postgres.db import engine
+from database.postgres.cache import CacheInvalidationListener
+from database.postgres.purge import purge_worker
+from database.mongodb.audit import audit_logger
+from api.dependecies.responses import FastJSONResponse
+from api.middleware.compression import CompressionMiddleware
+from api.middleware.metrics import MetricsMiddleware
+from api.middleware.queries import QueryStatsMiddleware
 
 app = FastAPI()
 
@@ -25,20 +39,41 @@ async def app_lifespan(app:FastAPI):
         raise Exception("Problem connecting to database cluster.")
     else:
         logger.info("Connected to database cluster.")
-        
-    try:
-        create_db_and_tables()
-        logger.info("Database tables created or verified.")
-    except Exception as e:
-        logger.error(f"Error loading postgres {e}")
     
+    # Audit events of the mutating routes are flushed to the logs collection in the background
+    await audit_logger.start()
+    
+    # Reference caches of other workers are invalidated over Postgres LISTEN/NOTIFY
+    cache_listener = CacheInvalidationListener(engine)
+    await cache_listener.start()
+
+    # Deleted classes and subjects are only marked; their rows are removed in small batches in the background
+    await purge_worker.start()
+        
     yield
     
+    await purge_worker.stop()
+    await cache_listener.stop()
+    await audit_logger.stop()
     await app.client.close()
     
-app: FastAPI = FastAPI(lifespan=app_lifespan)
+# Opt-in orjson/pydantic-core rendering for every route, not only the list endpoints
+response_class = FastJSONResponse if os.getenv("API_FAST_JSON", "").lower() in ("1", "true", "yes") else JSONResponse
+
+app: FastAPI = FastAPI(lifespan=app_lifespan, default_response_class=response_class)
+
+# The X-Query-* headers tell clients how the database was queried, so they are opt-in for tests and benchmarks
+app.add_middleware(QueryStatsMiddleware, headers=os.getenv("API_QUERY_HEADERS", "0").lower() in ("1", "true", "yes"))
+app.add_middleware(CompressionMiddleware, minimum_size=int(os.getenv("API_COMPRESSION_MIN_SIZE", "1024")))
+# Added last so it wraps compression: latency covers the whole response and sizes are what went on the wire
+app.add_middleware(MetricsMiddleware)
 
 app.include_router(router_get)
 app.include_router(router_post)
 app.include_router(router_put)
-app.include_router(router_delete)
\ No newline at end of file
+app.include_router(router_delete)
+app.include_router(router_internal)
+app.include_router(router_export)
+app.include_router(router_stats)
+app.include_router(router_search)
+app.include_router(router_metrics)
\ No newline at end of file
@@ -0,0 +1,139 @@
+from bisect import bisect_left
+from collections import defaultdict
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from time import perf_counter
+from typing import Sequence
+
+# Seconds; spans cache hits through slow exports
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Bytes on the wire, after compression
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+# Labels for requests no route matched and for made-up methods, so probing clients can't grow the label set
+UNMATCHED_ROUTE = "<unmatched>"
+KNOWN_METHODS = frozenset(("GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"))
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+class Histogram:
+    """Fixed-bucket histogram; observing is a bisect and two additions."""
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+    def cumulative(self):
+        """``(le, count)`` pairs in Prometheus order, ending with ``+Inf``."""
+        total = 0
+        for bound, count in zip([*self.buckets, "+Inf"], self.counts):
+            total += count
+            yield bound, total
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _labels(**labels) -> str:
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+class RouteMetrics:
+    """
+    Per-route request counters, latency and response size histograms, and in-flight gauges.
+
+    Everything is recorded from the event loop, so plain dicts are enough; each worker keeps
+    its own numbers and Prometheus scrapes every worker.
+    """
+
+    def __init__(self):
+        self.requests: dict[tuple[str, str, int], int] = defaultdict(int)
+        self.latency: dict[tuple[str, str], Histogram] = {}
+        self.size: dict[tuple[str, str], Histogram] = {}
+        self.in_flight: dict[str, int] = defaultdict(int)
+
+    def observe(self, method: str, route: str, status: int, seconds: float, size: int):
+        key = (method, route)
+        latency = self.latency.get(key)
+        if latency is None:
+            latency = self.latency[key] = Histogram(LATENCY_BUCKETS)
+            self.size[key] = Histogram(SIZE_BUCKETS)
+        latency.observe(seconds)
+        self.size[key].observe(size)
+        self.requests[(method, route, status)] += 1
+
+    def render(self) -> str:
+        """The metrics in the Prometheus text exposition format."""
+        lines = [
+            "# HELP http_requests_total Requests handled, by route template and status code.",
+            "# TYPE http_requests_total counter",
+        ]
+        for (method, route, status), count in sorted(self.requests.items()):
+            lines.append(f"http_requests_total{_labels(method=method, route=route, status=status)} {count}")
+
+        lines += [
+            "# HELP http_requests_in_flight Requests being handled right now.",
+            "# TYPE http_requests_in_flight gauge",
+        ]
+        for method, count in sorted(self.in_flight.items()):
+            lines.append(f"http_requests_in_flight{_labels(method=method)} {count}")
+
+        for name, description, histograms in (
+            ("http_request_duration_seconds", "Time from receiving the request to sending the last body byte.", self.latency),
+            ("http_response_size_bytes", "Response body size as sent.", self.size),
+        ):
+            lines += [f"# HELP {name} {description}", f"# TYPE {name} histogram"]
+            for (method, route), histogram in sorted(histograms.items()):
+                total = 0
+                for bound, total in histogram.cumulative():
+                    lines.append(f"{name}_bucket{_labels(method=method, route=route, le=bound)} {total}")
+                lines.append(f"{name}_sum{_labels(method=method, route=route)} {histogram.sum}")
+                lines.append(f"{name}_count{_labels(method=method, route=route)} {total}")
+
+        return "\n".join(lines) + "\n"
+
+route_metrics = RouteMetrics()
+
+class MetricsMiddleware:
+    """
+    Records every HTTP request into ``route_metrics`` under its route template.
+
+    The template (``/get/learners/list/{learner}``) is read from ``scope["route"]``, which the
+    router sets on the shared scope while dispatching, so no second route match is needed.
+    That also means it is only known once the request is done, which is why the in-flight
+    gauge is kept per method.
+    """
+
+    def __init__(self, app: ASGIApp, metrics: RouteMetrics = route_metrics):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"] if scope["method"] in KNOWN_METHODS else "OTHER"
+        started = perf_counter()
+        status = 500
+        size = 0
+
+        async def send_wrapper(message: Message):
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        self.metrics.in_flight[method] += 1
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            self.metrics.in_flight[method] -= 1
+            route = scope.get("route")
+            self.metrics.observe(
+                method, getattr(route, "path", UNMATCHED_ROUTE), status, perf_counter() - started, size
+            )
@@ -0,0 +1,34 @@
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from database.postgres.instrumentation import POSTGRES_N_PLUS_ONE_LIMIT, track_queries
+
+class QueryStatsMiddleware:
+    """
+    Gives every HTTP request its own ``QueryStats`` and reports them in response headers.
+
+    ``X-Query-Count``, ``X-Query-Time-Ms`` and ``X-Query-Slowest-Ms`` cover the queries run
+    before the response started; a streamed body's queries are counted but arrive too late
+    for the headers.
+    """
+
+    def __init__(self, app: ASGIApp, headers: bool = True, n_plus_one_limit: int = POSTGRES_N_PLUS_ONE_LIMIT):
+        self.app = app
+        self.headers = headers
+        self.n_plus_one_limit = n_plus_one_limit
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with track_queries(self.n_plus_one_limit, scope["path"]) as stats:
+            async def send_wrapper(message: Message):
+                if message["type"] == "http.response.start" and self.headers:
+                    headers = MutableHeaders(scope=message)
+                    headers["X-Query-Count"] = str(stats.count)
+                    headers["X-Query-Time-Ms"] = f"{stats.total * 1000:.3f}"
+                    headers["X-Query-Slowest-Ms"] = f"{stats.slowest * 1000:.3f}"
+                await send(message)
+
+            await self.app(scope, receive, send_wrapper)
@@ -1,130 +1,278 @@
-from fastapi import APIRouter, Path, status
-from typing import Annotated
+from fastapi import APIRouter, Body, HTTPException, Path, status
+from typing import Annotated, Callable, List, Optional, Type
 
 """FastAPI's dependecies and models"""
-from api.dependecies.models import Teacher, Admin, Schooler, Assignment, SubmittedAssignment, Subject, Class
-from api.dependecies.dependency import SessionDep
+from api.dependecies.models import (
+    Teacher, Admin, Schooler, Assignment, SubmittedAssignment, Subject, Class, BulkDeleteResult, live
+)
+from api.dependecies.dependency import SessionDep, AuditDep, DeleteEntity
+
+"""Imports for postgres db"""
+from sqlmodel import SQLModel, delete, func, select, update
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.sql.elements import ColumnElement
+from database.postgres.cache import ReferenceCache, class_cache, subject_cache, commit_and_invalidate
+from database.postgres.grade_summary import apply_submission_grades
 
 """Imports for mongodb"""
 from database.mongodb.db import collection
 
-router_delete: APIRouter = APIRouter() 
+router_delete: APIRouter = APIRouter()
+
+# Upper bound of ids accepted by one bulk delete
+MAX_BULK_DELETES = 10000
+
+# Entity -> (table model, primary key, audit name, graded submissions that leave the summary with it, caches).
+# Everything below a deleted row goes through the ON DELETE CASCADE foreign keys. Schooler and
+# subject deletes drop their summary rows the same way; assignments, submissions and teachers
+# only take some of a schooler's grades with them, so those are subtracted first.
+DELETES: dict[DeleteEntity, tuple[Type[SQLModel], ColumnElement, str, Optional[Callable], tuple[ReferenceCache, ...]]] = {
+    DeleteEntity.classes: (Class, Class.id, "class", None, (class_cache,)),
+    DeleteEntity.subjects: (Subject, Subject.id, "subject", None, (subject_cache,)),
+    DeleteEntity.schoolers: (Schooler, Schooler.id, "schooler", None, ()),
+    DeleteEntity.teachers: (
+        Teacher, Teacher.id, "teacher",
+        lambda ids: SubmittedAssignment.assignment_id.in_(select(Assignment.id).where(Assignment.teacher_id.in_(ids))),
+        ()
+    ),
+    DeleteEntity.admins: (Admin, Admin.admin_id, "admin", None, ()),
+    DeleteEntity.assignments: (
+        Assignment, Assignment.id, "assignment", lambda ids: SubmittedAssignment.assignment_id.in_(ids), ()
+    ),
+    DeleteEntity.submissions: (
+        SubmittedAssignment, SubmittedAssignment.id, "submittedassignment", lambda ids: SubmittedAssignment.id.in_(ids), ()
+    ),
+}
+
+# Classes and subjects are only marked deleted, so the request never waits on their cascade;
+# database.postgres.purge removes them later. A teacher still refuses the delete, via this column.
+SOFT_DELETES: dict[DeleteEntity, ColumnElement] = {
+    DeleteEntity.classes: Teacher.class_id,
+    DeleteEntity.subjects: Teacher.subject_id,
+}
+
+# The foreign keys that still refuse a delete instead of cascading, named as in migration 0001
+TEACHER_FOREIGN_KEYS = {"teacher_class_id_fkey", "teacher_subject_id_fkey"}
+
+def _still_taught() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail="Still taught by a teacher; delete the teacher or move them first."
+    )
+
+def _conflict(error: IntegrityError) -> HTTPException:
+    """The 409 for a delete refused by a constraint, naming the constraint unless it is a teacher's."""
+    # error.orig is SQLAlchemy's wrapper of the driver error; its own orig is the asyncpg exception
+    constraint = getattr(getattr(error.orig, "orig", None), "constraint_name", None)
+    if constraint in TEACHER_FOREIGN_KEYS:
+        return _still_taught()
+    detail = getattr(error.orig, "detail", None) or str(error.orig)
+    return HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail=f"Delete refused by constraint {constraint}: {detail}" if constraint else f"Delete refused: {detail}"
+    )
+
+async def _soft_delete_rows(session: AsyncSession, entity: DeleteEntity, ids: List[int]) -> List[SQLModel]:
+    """Stamp ``deleted_at`` on the live rows of ``entity`` with the given ids and commit."""
+    model, primary_key, _, _, caches = DELETES[entity]
+    taught = SOFT_DELETES[entity]
+    if (await session.exec(select(taught).where(taught.in_(ids)).limit(1))).first() is not None:
+        raise _still_taught()
+    deleted = (await session.scalars(
+        update(model)
+        .where(primary_key.in_(ids), live(model))
+        .values(deleted_at=func.now())
+        .returning(model)
+        .execution_options(synchronize_session=False)
+    )).all()
+    await commit_and_invalidate(session, *caches)
+    return deleted
+
+async def _delete_rows(session: AsyncSession, entity: DeleteEntity, ids: List[int]) -> List[SQLModel]:
+    """
+    Delete the rows of ``entity`` with the given ids in one statement and commit; classes and subjects are soft-deleted.
+
+    Returns:
+        List[SQLModel]: The deleted rows, as they were.
+
+    Raises:
+        HTTPException: 409 when a teacher still belongs to a class or subject being deleted,
+            or another constraint refuses the delete.
+    """
+    if entity in SOFT_DELETES:
+        return await _soft_delete_rows(session, entity, ids)
+    model, primary_key, _, graded, caches = DELETES[entity]
+    try:
+        if graded is not None:
+            await apply_submission_grades(session, graded(ids), -1)
+        # The identity map isn't synchronized; nothing in the request reads the rows afterwards
+        deleted = (await session.scalars(
+            delete(model).where(primary_key.in_(ids)).returning(model).execution_options(synchronize_session=False)
+        )).all()
+        await commit_and_invalidate(session, *caches)
+    except IntegrityError as error:
+        await session.rollback()
+        raise _conflict(error)
+    return deleted
+
+async def _delete_one(session: AsyncSession, audit, entity: DeleteEntity, entity_id: int) -> SQLModel | None:
+    deleted = await _delete_rows(session, entity, [entity_id])
+    if not deleted:
+        return None
+    audit.log("delete", DELETES[entity][2], entity_id, before=deleted[0].model_dump(mode="json"))
+    return deleted[0]
 
 # Delete assignment by assignment_id
 @router_delete.delete("/delete/assignment/{assignment_id}", status_code=status.HTTP_200_OK)
 async def delete_asign(
     session:SessionDep,
+    audit: AuditDep,
     assignment_id: Annotated[int, Path()]
 )->str:
-    
-    assignment = session.get(Assignment, assignment_id)
-    
+
+    assignment = await _delete_one(session, audit, DeleteEntity.assignments, assignment_id)
+
     if not assignment:
         return f"Assignment with id {assignment_id} not found."
-    
-    session.delete(assignment)
-    session.commit()
-    
+
     return f"Assignment {assignment} deleted successfully."
 
 # Delete submitted assignment by submitted_assignment_id
 @router_delete.delete("/delete/submmited/assignment/{submitted_assignment_id}", status_code=status.HTTP_200_OK)
 async def submitted_delete_asign(
     session:SessionDep,
+    audit: AuditDep,
     submitted_assignment_id: Annotated[int, Path()]
 )->str:
     """Delete an assignment by assignment_id."""
-    assignment = session.get(SubmittedAssignment, submitted_assignment_id)
-    
+    assignment = await _delete_one(session, audit, DeleteEntity.submissions, submitted_assignment_id)
+
     if not assignment:
         return f"Submitted assignment with id {submitted_assignment_id} not found."
-    
-    session.delete(assignment)
-    session.commit()
-    
+
     return f"Assignment {assignment} deleted successfully."
 
 # Delete class by class_id
-@router_delete.delete("/delete/class/{class_id}", status_code=status.HTTP_200_OK)
+@router_delete.delete(
+    "/delete/class/{class_id}",
+    status_code=status.HTTP_200_OK,
+    responses={409: {"description": "A teacher still teaches the class."}}
+)
 async def delete_class(
     session: SessionDep,
+    audit: AuditDep,
     class_id: Annotated[int, Path()]
 ) -> str:
-    
-    class_obj = session.get(Class, class_id)
-    
+
+    class_obj = await _delete_one(session, audit, DeleteEntity.classes, class_id)
+
     if not class_obj:
         return f"Class with id {class_id} not found."
-    
-    session.delete(class_obj)
-    session.commit()
-    
+
     return f"Class {class_obj} deleted successfully."
 
 # Delete subject by subject_id
-@router_delete.delete("/delete/subject/{subject_id}", status_code=status.HTTP_200_OK)
+@router_delete.delete(
+    "/delete/subject/{subject_id}",
+    status_code=status.HTTP_200_OK,
+    responses={409: {"description": "A teacher still teaches the subject."}}
+)
 async def delete_subject(
     session: SessionDep,
+    audit: AuditDep,
     subject_id: Annotated[int, Path()]
 ) -> str:
-    
-    subject = session.get(Subject, subject_id)
-    
+
+    subject = await _delete_one(session, audit, DeleteEntity.subjects, subject_id)
+
     if not subject:
         return f"Subject with id {subject_id} not found."
-    
-    session.delete(subject)
-    session.commit()
-    
+
     return f"Subject {subject} deleted successfully."
 
 # Delete schooler by schooler_id
 @router_delete.delete("/delete/schooler/{schooler_id}", status_code=status.HTTP_200_OK)
 async def delete_schooler(
     session: SessionDep,
+    audit: AuditDep,
     schooler_id: Annotated[int, Path()]
 ) -> str:
-    
-    schooler = session.get(Schooler, schooler_id)
-    
+
+    schooler = await _delete_one(session, audit, DeleteEntity.schoolers, schooler_id)
+
     if not schooler:
         return f"Schooler with id {schooler_id} not found."
-    
-    session.delete(schooler)
-    session.commit()
-    
+
     return f"Schooler {schooler} deleted successfully."
 
 # Delete teacher by teacher_id
 @router_delete.delete("/delete/teacher/{teacher_id}", status_code=status.HTTP_200_OK)
 async def delete_teacher(
     session: SessionDep,
+    audit: AuditDep,
     teacher_id: Annotated[int, Path()]
 ) -> str:
-    
-    teacher = session.get(Teacher, teacher_id)
-    
+
+    teacher = await _delete_one(session, audit, DeleteEntity.teachers, teacher_id)
+
     if not teacher:
         return f"Teacher with id {teacher_id} not found."
-    
-    session.delete(teacher)
-    session.commit()
-    
+
     return f"Teacher {teacher} deleted successfully."
 
 # Delete admin by admin_id
 @router_delete.delete("/delete/admin/{admin_id}", status_code=status.HTTP_200_OK)
 async def delete_admin(
     session: SessionDep,
+    audit: AuditDep,
     admin_id: Annotated[int, Path()]
 ) -> str:
-    
-    admin = session.get(Admin, admin_id)
-    
+
+    admin = await _delete_one(session, audit, DeleteEntity.admins, admin_id)
+
     if not admin:
         return f"Admin with id {admin_id} not found."
-    
-    session.delete(admin)
-    session.commit()
-    
-    return f"Admin {admin} deleted successfully."
\ No newline at end of file
+
+    return f"Admin {admin} deleted successfully."
+
+@router_delete.delete(
+    "/delete/bulk/{entity}",
+    response_model=BulkDeleteResult,
+    status_code=status.HTTP_200_OK,
+    responses={
+        409: {"description": "A teacher still teaches one of the classes or subjects; nothing was deleted."},
+        422: {"description": "Invalid request data."}
+    }
+)
+async def delete_bulk(
+    session: SessionDep,
+    audit: AuditDep,
+    entity: Annotated[DeleteEntity, Path(description="classes, subjects, schoolers, teachers, admins, assignments or submissions")],
+    ids: Annotated[List[int], Body(..., max_length=MAX_BULK_DELETES)]
+) -> BulkDeleteResult:
+    """
+    Delete many rows of one kind in a single statement, together with everything under them.
+
+    Args:
+        session (SessionDep): SQLModel session dependency.
+        audit (AuditDep): Audit trail of the request.
+        entity (DeleteEntity): Kind of rows to delete.
+        ids (List[int]): Ids to delete; repeated and unknown ids are fine.
+
+    Returns:
+        BulkDeleteResult: Deleted ids and the ids that didn't exist.
+
+    Status Codes:
+        200: Rows deleted, see ``missing`` for unknown ids.
+        409: A class or subject still has a teacher; the whole request is rolled back.
+        422: Invalid request data.
+    """
+    requested = list(dict.fromkeys(ids))
+    deleted = await _delete_rows(session, entity, requested)
+    _, primary_key, name, _, _ = DELETES[entity]
+    deleted_ids = {getattr(row, primary_key.key) for row in deleted}
+    audit.log("bulk_delete", name, sorted(deleted_ids))
+    return BulkDeleteResult(
+        deleted=sorted(deleted_ids), missing=[entity_id for entity_id in requested if entity_id not in deleted_ids]
+    )
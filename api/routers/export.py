@@ -0,0 +1,101 @@
+from fastapi import APIRouter, Path, Query, status
+from fastapi.responses import StreamingResponse
+from typing import Annotated, AsyncIterator, Type
+import csv
+import io
+
+"""FastAPI's dependecies and models"""
+from api.dependecies.models import (
+    Teacher, Schooler, Assignment, SubmittedAssignment, Subject, Class, in_live, live_submission,
+    TeacherPublic, SchoolerPublic, AssignmentPublic, SubmittedAssignmentSummary
+)
+from api.dependecies.dependency import ExportEntity, ExportFormat
+
+"""Imports for postgres db"""
+from sqlmodel import SQLModel, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy.sql.elements import ColumnElement
+from database.postgres.db import engine
+
+router_export: APIRouter = APIRouter()
+
+# Rows fetched per server-side cursor round trip
+EXPORT_BATCH_SIZE = 1000
+
+# Entity -> (table model, public model, rows that aren't under a deleted class or subject)
+EXPORTS: dict[ExportEntity, tuple[Type[SQLModel], Type[SQLModel], ColumnElement]] = {
+    ExportEntity.schoolers: (Schooler, SchoolerPublic, in_live(Schooler.class_id, Class)),
+    ExportEntity.teachers: (Teacher, TeacherPublic, in_live(Teacher.class_id, Class)),
+    ExportEntity.assignments: (Assignment, AssignmentPublic, in_live(Assignment.subject_id, Subject)),
+    # Bodies stay out of the export; fetch them per submission from /get/submitted/assignment/{id}/work
+    ExportEntity.submissions: (SubmittedAssignment, SubmittedAssignmentSummary, live_submission()),
+}
+
+MEDIA_TYPES = {
+    ExportFormat.ndjson: "application/x-ndjson",
+    ExportFormat.csv: "text/csv",
+}
+
+async def _stream_export(
+    model: Type[SQLModel],
+    public: Type[SQLModel],
+    visible: ColumnElement,
+    export_format: ExportFormat
+) -> AsyncIterator[str]:
+    """Stream every ``visible`` row of ``model`` serialized as ``public``, one cursor batch at a time."""
+    fields = list(public.model_fields)
+    # Selecting plain columns keeps rows out of the identity map, so memory stays flat
+    statement = (
+        select(*(getattr(model, field) for field in fields))
+        .where(visible)
+        .order_by(*model.__table__.primary_key.columns)
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+
+    if export_format == ExportFormat.csv:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(fields)
+        yield buffer.getvalue()
+
+    # The session is opened here rather than through SessionDep because it has to outlive the handler
+    async with AsyncSession(engine) as session:
+        result = await session.stream(statement)
+        async for partition in result.partitions():
+            rows = [public.model_validate(dict(row._mapping)) for row in partition]
+
+            if export_format == ExportFormat.ndjson:
+                yield "".join(row.model_dump_json() + "\n" for row in rows)
+            else:
+                buffer = io.StringIO()
+                writer = csv.writer(buffer)
+                writer.writerows(
+                    [row.model_dump(mode="json")[field] for field in fields] for row in rows
+                )
+                yield buffer.getvalue()
+
+@router_export.get("/export/{entity}", status_code=status.HTTP_200_OK, response_class=StreamingResponse)
+async def export_entity(
+    entity: Annotated[ExportEntity, Path(description="schoolers, teachers, assignments or submissions")],
+    export_format: Annotated[ExportFormat, Query(alias="format", description="ndjson or csv")] = ExportFormat.ndjson
+) -> StreamingResponse:
+    """
+    Export a whole table for sync jobs.
+
+    Args:
+        entity (ExportEntity): Table to export.
+        export_format (ExportFormat): ``ndjson`` (one JSON object per line) or ``csv`` with a header row.
+
+    Returns:
+        StreamingResponse: Rows streamed from a server-side cursor in primary key order.
+
+    Status Codes:
+        200: Export started.
+        422: Unknown entity or format.
+    """
+    model, public, visible = EXPORTS[entity]
+    return StreamingResponse(
+        _stream_export(model, public, visible, export_format),
+        media_type=MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{entity.value}.{export_format.value}"'}
+    )
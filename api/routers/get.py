@@ -1,36 +1,55 @@
-from fastapi import APIRouter, Path, Query, Body, status
-from typing import Annotated, List, Dict
+from fastapi import APIRouter, HTTPException, Path, Query, Body, Request, Response, status
+from fastapi.responses import StreamingResponse
+from typing import Annotated, Any, Union
 from datetime import date
 
 """FastAPI's dependecies and models"""
-from api.dependecies.models import Teacher, Admin, Schooler, Assignment, SubmittedAssignment, Subject, Class
+from api.dependecies.models import (
+    Teacher, Admin, Schooler, Assignment, SubmittedAssignment, Subject, Class, full_name, live, in_live,
+    Page, TeacherPublic, AdminPublic, SchoolerPublic, AssignmentPublic, SubjectPublic, ClassPublic,
+    SubmissionRosterEntry, SubmittedAssignmentSummary
+)
 from api.dependecies.dependency import SessionDep, ComparativeDep, SelectDep, Learners
+from api.dependecies.pagination import paginate, paginate_rows
+from api.dependecies.fields import FieldsQuery, parse_fields, project, project_rows
+from api.dependecies.responses import model_response
+from api.dependecies.conditional import conditional_page, is_not_modified, items_digest, make_etag, not_modified, validator_headers
 
 """Imports for postgres db"""
 from sqlmodel import select
+from sqlalchemy import Date, cast, not_
+from sqlalchemy.orm import contains_eager, defer
+from database.postgres.cache import class_cache, subject_cache
+from database.postgres.work_storage import iter_work, work_text
 
 """Imports for mongodb"""
 from database.mongodb.db import collection
 
 router_get = APIRouter()
 
-"""Get a list of learners (schoolers or theachers) with optional filters for name, age, class, and pagination."""
+"""Get a list of learners (schoolers or theachers) with optional filters for name, age, class, and cursor pagination."""
 @router_get.get("/get/learners/list/{learner}", status_code=status.HTTP_200_OK)
 async def get_schoolers(
     session:SessionDep,
+    request: Request,
+    response: Response,
     select_params: SelectDep,
     comparative_params: ComparativeDep,
     learner: Annotated[Learners, Path(description="schooler or teacher")],
-    name: Annotated[str | None, Query(description="Full schooler name")]=None,
+    name: Annotated[str | None, Query(description="Full name, first and last name separated by a space")]=None,
     class_id: Annotated[int | None, Query(description="Id of schooler's class")]=None,
     subject_id: Annotated[int | None, Query(description="Subject id for searching speciffic teacher")] = None,
-    )->List[Schooler]:
+    fields: FieldsQuery = None,
+    )->Page[Union[TeacherPublic, SchoolerPublic]]:
     
     person = Schooler if learner.value == "schooler" else Teacher
-    statement = select(person) 
+    public = TeacherPublic if person is Teacher else SchoolerPublic
+    selected = parse_fields(fields, public)
+    # People of a deleted class stay hidden until the purge removes them
+    statement = select(person).where(in_live(person.class_id, Class))
     
     if name is not None:
-        statement = statement.where(person.name == name)
+        statement = statement.where(full_name(person) == name)
         
     if class_id is not None:
         statement = statement.where(person.class_id == class_id)
@@ -53,15 +72,30 @@ async def get_schoolers(
     if learner.value == "teacher" and subject_id is not None:
         statement = statement.where(person.subject_id == subject_id) 
     
-    statement = statement.offset(select_params.offset).limit(select_params.limit)  
-    schoolers = session.exec(statement).all()
+    # Stable (last_name, id) order so cursors stay valid between pages
+    order = (person.last_name, person.id)
+    if selected is not None:
+        # Thin lists select just the requested columns and are served from the row tuples
+        statement = project(statement, person, selected, *order)
+
+    page = await conditional_page(
+        request, response, session, statement, order, select_params.cursor, select_params.limit
+    )
+    if isinstance(page, Response):
+        return page
+    schoolers, next_cursor = page
     
-    return schoolers
+    if selected is not None:
+        return model_response(Page[dict[str, Any]](items=project_rows(schoolers, selected), next_cursor=next_cursor), response)
+    return model_response(Page[public](items=schoolers, next_cursor=next_cursor), response)
 
 """Get added assignments."""
 @router_get.get("/get/assignments/", status_code=status.HTTP_200_OK)
 async def get_assign(
     session: SessionDep,
+    request: Request,
+    response: Response,
+    select_params: SelectDep,
     teacher_id: Annotated[int | None, Query()]=None,
     subject_id: Annotated[int | None, Query()]=None,
     assign_type: Annotated[str | None, Query()] = None,
@@ -70,11 +104,11 @@ async def get_assign(
     lte: Annotated[date | None, Query(description="Before or at this day. Only for added (type - date)")]=None,
     lt: Annotated[date | None, Query(description="Before this day. Only for added (type - date)")]=None,
     e: Annotated[date | None, Query(description="At this day. Only for added (type - date)")]=None,
-    offset: int = 0,
-    limit: Annotated[int, Query(le=100)] = 0
-    )->List[Assignment]:
+    fields: FieldsQuery = None,
+    )->Page[AssignmentPublic]:
     
-    statement = select(Assignment)
+    selected = parse_fields(fields, AssignmentPublic)
+    statement = select(Assignment).where(in_live(Assignment.subject_id, Subject))
     
     if teacher_id is not None:
         statement = statement.where(Assignment.teacher_id == teacher_id)
@@ -100,102 +134,234 @@ async def get_assign(
     if e is not None:
         statement = statement.where(Assignment.added == e)
     
-    statement = statement.offset(offset).limit(limit)
-    assignments = session.exec(statement=statement).all()
+    # Polls of an unchanged page are answered from the sort keys and change times of the page window
+    order = (Assignment.added, Assignment.id)
+    if selected is not None:
+        # changed stays selected for the validators even when the client doesn't want it
+        statement = project(statement, Assignment, selected, *order, Assignment.changed)
+
+    page = await conditional_page(
+        request, response, session, statement, order, select_params.cursor, select_params.limit, Assignment.changed
+    )
+    if isinstance(page, Response):
+        return page
+    assignments, next_cursor = page
     
-    return assignments
+    if selected is not None:
+        return model_response(Page[dict[str, Any]](items=project_rows(assignments, selected), next_cursor=next_cursor), response)
+    return model_response(Page[AssignmentPublic](items=assignments, next_cursor=next_cursor), response)
 
-"""Get schoolers and their submitted assignments for a given assignment ID, with option to include/exclude late submissions."""
-@router_get.get("/get/submitted/assignments/{assign_id}/", status_code=status.HTTP_200_OK)
+"""Get the submission roster of an assignment: every submission with its schooler, optionally without late ones."""
+@router_get.get(
+    "/get/submitted/assignments/{assign_id}/",
+    status_code=status.HTTP_200_OK,
+    responses={404: {"description": "Assignment not found."}}
+)
 async def get_submitted_asign(
     session: SessionDep,
+    select_params: SelectDep,
     assign_id: Annotated[int, Path(description="""Id of needed assign""")],
     handed_late: Annotated[bool, Query(description="""Exclude or
                                                         include assign that haded in late.
                                                         True means include""")]=True
-    )->Dict[
-        Schooler,
-        SubmittedAssignment
-        ]:
+    )->Page[SubmissionRosterEntry]:
     
-        try:
-            statement = select(Assignment).where(Assignment.assignment_id == assign_id)
-            result = session.exec(statement=statement)
-            assignment = result.one()
-        except Exception as e:
-            print(e)
+        # Late means handed in on a day after the deadline
+        late = cast(SubmittedAssignment.submitted, Date) > Assignment.deadline
+
+        # One join loads each submission together with its schooler and the deadline it is judged against
+        statement = (
+            select(SubmittedAssignment, late.label("late"))
+            .join(SubmittedAssignment.schooler)
+            .join(SubmittedAssignment.assignment)
+            # Bodies are deferred and served by /get/submitted/assignment/{id}/work; raiseload catches anything touching them here
+            .options(contains_eager(SubmittedAssignment.schooler), defer(SubmittedAssignment.work, raiseload=True))
+            .where(
+                SubmittedAssignment.assignment_id == assign_id,
+                in_live(Assignment.subject_id, Subject),
+                in_live(Schooler.class_id, Class)
+            )
+        )
+
+        if not handed_late:
+            statement = statement.where(not_(late))
+
+        rows, next_cursor = await paginate(
+            session,
+            statement,
+            (SubmittedAssignment.submitted, SubmittedAssignment.id),
+            select_params.cursor,
+            select_params.limit,
+            row_key=lambda row: row[0]
+        )
+
+        # Only an empty first page needs to tell a missing assignment apart from one without submissions
+        if not rows and select_params.cursor is None and (await session.exec(
+            select(Assignment.id).where(Assignment.id == assign_id, in_live(Assignment.subject_id, Subject))
+        )).first() is None:
+            raise HTTPException(status_code=404, detail=f"Assignment with id {assign_id} not found.")
 
-        statement_asign = select(SubmittedAssignment).where(SubmittedAssignment.assignment_id == assign_id)
-        statement_schooler = select(Schooler)
+        return model_response(Page[SubmissionRosterEntry](
+            items=[
+                SubmissionRosterEntry(
+                    submission=SubmittedAssignmentSummary.model_validate(submission), schooler=submission.schooler, late=is_late
+                )
+                for submission, is_late in rows
+            ],
+            next_cursor=next_cursor
+        ))
 
-        if handed_late == False:
-            statement_asign.where(SubmittedAssignment.submitted > assignment.deadline)
+@router_get.get(
+    "/get/submitted/assignment/{submitted_assignment_id}/work",
+    status_code=status.HTTP_200_OK,
+    response_class=StreamingResponse,
+    responses={
+        200: {"content": {"text/plain": {}}, "description": "The submitted work."},
+        304: {"description": "Work unchanged since the ETag the client holds."},
+        404: {"description": "Submission not found."}
+    }
+)
+async def get_submitted_work(
+    session: SessionDep,
+    request: Request,
+    submitted_assignment_id: Annotated[int, Path(description="Id of the submission")]
+) -> StreamingResponse:
+    """
+    Stream the work handed in with a submission.
 
-        assignments = session.exec(statement=statement_asign).all()
+    Args:
+        session (SessionDep): SQLModel session dependency.
+        request (Request): Incoming request, for If-None-Match.
+        submitted_assignment_id (int): Id of the submission.
 
-        for assign in assignments:
-            statement_schooler = statement_schooler.where(Schooler.schooler_id == assign.schooler_id)
+    Returns:
+        StreamingResponse: The work as UTF-8 text, with the body's sha256 as a strong ETag.
 
-        schoolers = session.exec(statement_schooler).all()
+    Status Codes:
+        200: Work streamed.
+        304: Work unchanged.
+        404: Submission not found.
+    """
+    # The ETag comes from the submission row, so a revalidation never reads the body
+    submission = (await session.exec(
+        select(SubmittedAssignment.id, SubmittedAssignment.work_hash)
+        .join(SubmittedAssignment.schooler)
+        .join(SubmittedAssignment.assignment)
+        .where(
+            SubmittedAssignment.id == submitted_assignment_id,
+            in_live(Schooler.class_id, Class),
+            in_live(Assignment.subject_id, Subject)
+        )
+    )).one_or_none()
+    if submission is None:
+        raise HTTPException(status_code=404, detail=f"Submission with id {submitted_assignment_id} not found.")
 
-        message ={"Schoolers": schoolers,
-                "Submitted Assignments": assignments}
+    headers = validator_headers(f'"{submission.work_hash}"')
+    if is_not_modified(request, headers["ETag"]):
+        return not_modified(headers)
 
-        return message
+    work = (await session.exec(select(work_text()).where(SubmittedAssignment.id == submitted_assignment_id))).one()
+    return StreamingResponse(iter_work(work), media_type="text/plain; charset=utf-8", headers=headers)
 
-"""Get a list of classes filtered by name, with pagination support (offset, limit)."""
+"""Get a list of classes filtered by name, with cursor pagination (cursor, limit)."""
 @router_get.get("/get/classes/", status_code=status.HTTP_200_OK)
 async def get_classes(
     session: SessionDep,
+    request: Request,
+    response: Response,
+    select_params: SelectDep,
     name: Annotated[str | None, Query(description="Class name to search for")] = None,
-    offset: int = 0,
-    limit: Annotated[int, Query(le=100)] = 0
-    ) -> List[Class]:
+    ) -> Page[ClassPublic]:
     
-    statement = select(Class)
+    # Served from the worker's reference cache; a table too big to cache, or a cursor whose row
+    # has since gone from it, goes to Postgres
+    cached = await class_cache.rows(session)
+    if cached is not None and name is not None:
+        cached = [row for row in cached if row.name == name]
+    page = None if cached is None else paginate_rows(cached, (Class.name, Class.id), select_params.cursor, select_params.limit)
+    if page is not None:
+        classes, next_cursor = page
+        headers = validator_headers(make_etag(request, items_digest(classes), next_cursor))
+        if is_not_modified(request, headers["ETag"]):
+            return not_modified(headers)
+        response.headers.update(headers)
+        return model_response(Page[ClassPublic](items=classes, next_cursor=next_cursor), response)
+    
+    statement = select(Class).where(live(Class))
     
     if name is not None:
         statement = statement.where(Class.name == name)
     
-    statement = statement.offset(offset).limit(limit)
-    classes = session.exec(statement).all()
+    order = (Class.name, Class.id)
+    page = await conditional_page(
+        request, response, session, statement, order, select_params.cursor, select_params.limit
+    )
+    if isinstance(page, Response):
+        return page
+    classes, next_cursor = page
     
-    return classes
+    return model_response(Page[ClassPublic](items=classes, next_cursor=next_cursor), response)
 
-"""Get a list of subjects filtered by name, with pagination support (offset, limit)."""
+"""Get a list of subjects filtered by name, with cursor pagination (cursor, limit)."""
 @router_get.get("/get/subjects/", status_code=status.HTTP_200_OK)
 async def get_subjects(
     session: SessionDep,
+    request: Request,
+    response: Response,
+    select_params: SelectDep,
     name: Annotated[str | None, Query(description="Subject name to search for")] = None,
-    offset: int = 0,
-    limit: Annotated[int, Query(le=100)] = 0
-    ) -> List[Subject]:
+    ) -> Page[SubjectPublic]:
     
-    statement = select(Subject)
+    # Served from the worker's reference cache; a table too big to cache, or a cursor whose row
+    # has since gone from it, goes to Postgres
+    cached = await subject_cache.rows(session)
+    if cached is not None and name is not None:
+        cached = [row for row in cached if row.name == name]
+    page = None if cached is None else paginate_rows(cached, (Subject.name, Subject.id), select_params.cursor, select_params.limit)
+    if page is not None:
+        subjects, next_cursor = page
+        headers = validator_headers(make_etag(request, items_digest(subjects), next_cursor))
+        if is_not_modified(request, headers["ETag"]):
+            return not_modified(headers)
+        response.headers.update(headers)
+        return model_response(Page[SubjectPublic](items=subjects, next_cursor=next_cursor), response)
+    
+    statement = select(Subject).where(live(Subject))
     
     if name is not None:
         statement = statement.where(Subject.name == name)
     
-    statement = statement.offset(offset).limit(limit)
-    subjects = session.exec(statement).all()
+    order = (Subject.name, Subject.id)
+    page = await conditional_page(
+        request, response, session, statement, order, select_params.cursor, select_params.limit
+    )
+    if isinstance(page, Response):
+        return page
+    subjects, next_cursor = page
     
-    return subjects
+    return model_response(Page[SubjectPublic](items=subjects, next_cursor=next_cursor), response)
 
-"""Get a list of admins filtered by name, with pagination support (offset, limit)."""
+"""Get a list of admins filtered by name, with cursor pagination (cursor, limit)."""
 @router_get.get("/get/admins/", status_code=status.HTTP_200_OK)
 async def get_admins(
     session: SessionDep,
-    name: Annotated[str | None, Query(description="Admin name to search for")] = None,
-    offset: int = 0,
-    limit: Annotated[int, Query(le=100)] = 0
-    ) -> List[Admin]:
+    request: Request,
+    response: Response,
+    select_params: SelectDep,
+    name: Annotated[str | None, Query(description="Full admin name, first and last name separated by a space")] = None,
+    ) -> Page[AdminPublic]:
     
     statement = select(Admin)
 
     if name is not None:
-        statement = statement.where(Admin.name == name)
+        statement = statement.where(full_name(Admin) == name)
     
-    statement  = statement.offset(offset).limit(limit)
-    admins = session.exec(statement).all()
-
-    return admins
\ No newline at end of file
+    order = (Admin.last_name, Admin.admin_id)
+    page = await conditional_page(
+        request, response, session, statement, order, select_params.cursor, select_params.limit
+    )
+    if isinstance(page, Response):
+        return page
+    admins, next_cursor = page
+    
+    return model_response(Page[AdminPublic](items=admins, next_cursor=next_cursor), response)
\ No newline at end of file
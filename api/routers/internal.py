@@ -0,0 +1,69 @@
+from fastapi import APIRouter, status
+from typing import List
+
+"""FastAPI's dependecies and models"""
+from api.dependecies.models import PoolStatus, CacheStatus, AuditStatus, PurgeStatus
+
+"""Imports for postgres db"""
+from database.postgres.db import engine
+from database.postgres.pool import pool_metrics
+from database.postgres.cache import REFERENCE_CACHES
+from database.postgres.purge import purge_worker
+
+"""Imports for mongodb"""
+from database.mongodb.audit import audit_logger
+
+router_internal: APIRouter = APIRouter(prefix="/internal", include_in_schema=False)
+
+@router_internal.get("/pool", response_model=PoolStatus, status_code=status.HTTP_200_OK)
+async def get_pool_status() -> PoolStatus:
+    """
+    Report the state of this worker's Postgres connection pool.
+
+    Returns:
+        PoolStatus: Checked-out, idle and overflow connections plus checkout wait times.
+
+    Status Codes:
+        200: Pool status returned.
+    """
+    # The snapshot is read from memory only, so it never waits on the pool it is reporting on
+    return PoolStatus(**pool_metrics.snapshot(engine.pool))
+
+@router_internal.get("/cache", response_model=List[CacheStatus], status_code=status.HTTP_200_OK)
+async def get_cache_status() -> List[CacheStatus]:
+    """
+    Report this worker's reference data caches.
+
+    Returns:
+        List[CacheStatus]: Cached rows, hit/miss/invalidation counters and cache age per table.
+
+    Status Codes:
+        200: Cache status returned.
+    """
+    return [CacheStatus(**cache.stats()) for cache in REFERENCE_CACHES.values()]
+
+@router_internal.get("/audit", response_model=AuditStatus, status_code=status.HTTP_200_OK)
+async def get_audit_status() -> AuditStatus:
+    """
+    Report this worker's audit event buffer.
+
+    Returns:
+        AuditStatus: Events waiting in the queue and written, dropped or failed so far.
+
+    Status Codes:
+        200: Audit status returned.
+    """
+    return AuditStatus(**audit_logger.stats())
+
+@router_internal.get("/purge", response_model=PurgeStatus, status_code=status.HTTP_200_OK)
+async def get_purge_status() -> PurgeStatus:
+    """
+    Report this worker's purge of soft-deleted classes and subjects.
+
+    Returns:
+        PurgeStatus: Whether the purge task runs, and rows purged or failed passes so far.
+
+    Status Codes:
+        200: Purge status returned.
+    """
+    return PurgeStatus(**purge_worker.stats())
@@ -0,0 +1,19 @@
+from fastapi import APIRouter, Response, status
+
+"""Request metrics recorded by the middleware"""
+from api.middleware.metrics import CONTENT_TYPE, route_metrics
+
+router_metrics: APIRouter = APIRouter(include_in_schema=False)
+
+@router_metrics.get("/metrics", status_code=status.HTTP_200_OK)
+async def get_metrics() -> Response:
+    """
+    Expose this worker's request metrics for Prometheus to scrape.
+
+    Returns:
+        Response: Counters, in-flight gauges and latency/size histograms in the text exposition format.
+
+    Status Codes:
+        200: Metrics returned.
+    """
+    return Response(content=route_metrics.render(), media_type=CONTENT_TYPE)
@@ -1,8 +1,10 @@
 
 
-from fastapi import APIRouter, Body, status, HTTPException
-from sqlmodel import select
-from typing import Annotated
+from fastapi import APIRouter, Body, Path, UploadFile, status, HTTPException
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+from typing import Annotated, List, Type
+import io
 from api.dependecies.models import (
     Class, ClassCreate, ClassPublic,
     Admin, AdminCreate, AdminPublic,
@@ -10,12 +12,21 @@ from api.dependecies.models import (
     Schooler, SchoolerCreate, SchoolerPublic,
     Subject, SubjectCreate, SubjectPublic,
     Assignment, AssignmentCreate, AssignmentPublic,
-    SubmittedAssignment, SubmittedAssignmentCreate, SubmittedAssignmentPublic
+    SubmittedAssignment, SubmittedAssignmentCreate, SubmittedAssignmentPublic,
+    BulkStatus, BulkItemResult, BulkCreateResult, RosterImportReport
 )
-from api.dependecies.dependency import SessionDep
+from api.dependecies.dependency import SessionDep, AuditDep, AuditTrail, Learners
+from database.postgres.bulk import insert_ignoring_conflicts, insert_one_ignoring_conflicts, insert_one_unless
+from database.postgres.roster import import_roster
+from database.postgres.cache import ReferenceCache, class_cache, subject_cache, commit_and_invalidate
+from database.postgres.grade_summary import apply_submission_grades
+from database.postgres.work_storage import work_columns, write_work_body
 
 router_post: APIRouter = APIRouter()
 
+# Upper bound of items accepted by one bulk request
+MAX_BULK_ITEMS = 10000
+
 # --- Admin POST ---
 @router_post.post(
     "/admins/",
@@ -29,7 +40,8 @@ router_post: APIRouter = APIRouter()
 )
 async def create_admin(
     admin: Annotated[AdminCreate, Body(...)],
-    session: SessionDep
+    session: SessionDep,
+    audit: AuditDep
 ) -> AdminPublic:
     """
     Create a new admin.
@@ -37,6 +49,7 @@ async def create_admin(
     Args:
         admin (AdminCreate): Admin data to create.
         session (SessionDep): SQLModel session dependency.
+        audit (AuditDep): Audit trail of the request.
 
     Returns:
         AdminPublic: Newly created admin.
@@ -50,18 +63,19 @@ async def create_admin(
     # Check for required fields
     if not admin.first_name or not admin.last_name or not admin.email or not admin.age:
         raise HTTPException(status_code=400, detail="All fields are required.")
-    # Check for duplicate email
-    existing = session.exec(select(Admin).where(Admin.email == admin.email)).first()
-    if existing:
-        raise HTTPException(status_code=409, detail="Admin already exists.")
     try:
-        admin_db = Admin.model_validate(admin)
-        session.add(admin_db)
-        session.commit()
-        session.refresh(admin_db)
-        return AdminPublic(**admin_db.dict())
+        # One INSERT ... ON CONFLICT DO NOTHING RETURNING; the unique email constraint catches duplicates
+        admin_db = await insert_one_ignoring_conflicts(
+            session, Admin, Admin.model_validate(admin).model_dump(exclude_none=True)
+        )
+        await session.commit()
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    if admin_db is None:
+        raise HTTPException(status_code=409, detail="Admin already exists.")
+    created = AdminPublic(**admin_db.dict())
+    audit.log("create", "admin", created.admin_id, after=created.model_dump(mode="json"))
+    return created
 
 # --- Teacher POST ---
 @router_post.post(
@@ -76,7 +90,8 @@ async def create_admin(
 )
 async def create_teacher(
     teacher: Annotated[TeacherCreate, Body(...)],
-    session: SessionDep
+    session: SessionDep,
+    audit: AuditDep
 ) -> TeacherPublic:
     """
     Create a new teacher.
@@ -84,6 +99,7 @@ async def create_teacher(
     Args:
         teacher (TeacherCreate): Teacher data to create.
         session (SessionDep): SQLModel session dependency.
+        audit (AuditDep): Audit trail of the request.
 
     Returns:
         TeacherPublic: Newly created teacher.
@@ -96,18 +112,24 @@ async def create_teacher(
     """
     if not teacher.first_name or not teacher.last_name or not teacher.email or not teacher.age or not teacher.subject_id or not teacher.class_id:
         raise HTTPException(status_code=400, detail="All fields are required.")
-    # Check for duplicate email
-    existing = session.exec(select(Teacher).where(Teacher.email == teacher.email)).first()
-    if existing:
-        raise HTTPException(status_code=409, detail="Teacher already exists.")
+    # Foreign keys are checked against the reference cache instead of failing inside the insert
+    if not await class_cache.existing_ids(session, [teacher.class_id]):
+        raise HTTPException(status_code=400, detail=f"Class with id {teacher.class_id} does not exist.")
+    if not await subject_cache.existing_ids(session, [teacher.subject_id]):
+        raise HTTPException(status_code=400, detail=f"Subject with id {teacher.subject_id} does not exist.")
     try:
-        teacher_db = Teacher.model_validate(teacher)
-        session.add(teacher_db)
-        session.commit()
-        session.refresh(teacher_db)
-        return TeacherPublic(**teacher_db.dict())
+        # One INSERT ... ON CONFLICT DO NOTHING RETURNING; the unique email and class_id constraints catch duplicates
+        teacher_db = await insert_one_ignoring_conflicts(
+            session, Teacher, Teacher.model_validate(teacher).model_dump(exclude_none=True)
+        )
+        await session.commit()
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    if teacher_db is None:
+        raise HTTPException(status_code=409, detail="Teacher already exists.")
+    created = TeacherPublic(**teacher_db.dict())
+    audit.log("create", "teacher", created.id, after=created.model_dump(mode="json"))
+    return created
 
 # --- Schooler POST ---
 @router_post.post(
@@ -122,7 +144,8 @@ async def create_teacher(
 )
 async def create_schooler(
     schooler: Annotated[SchoolerCreate, Body(...)],
-    session: SessionDep
+    session: SessionDep,
+    audit: AuditDep
 ) -> SchoolerPublic:
     """
     Create a new schooler.
@@ -130,6 +153,7 @@ async def create_schooler(
     Args:
         schooler (SchoolerCreate): Schooler data to create.
         session (SessionDep): SQLModel session dependency.
+        audit (AuditDep): Audit trail of the request.
 
     Returns:
         SchoolerPublic: Newly created schooler.
@@ -142,18 +166,22 @@ async def create_schooler(
     """
     if not schooler.first_name or not schooler.last_name or not schooler.email or not schooler.age or not hasattr(schooler, "class_id"):
         raise HTTPException(status_code=400, detail="All fields are required.")
-    # Check for duplicate email
-    existing = session.exec(select(Schooler).where(Schooler.email == schooler.email)).first()
-    if existing:
-        raise HTTPException(status_code=409, detail="Schooler already exists.")
+    # The class is checked against the reference cache instead of failing inside the insert
+    if not await class_cache.existing_ids(session, [schooler.class_id]):
+        raise HTTPException(status_code=400, detail=f"Class with id {schooler.class_id} does not exist.")
     try:
-        schooler_db = Schooler.model_validate(schooler)
-        session.add(schooler_db)
-        session.commit()
-        session.refresh(schooler_db)
-        return SchoolerPublic(**schooler_db.dict())
+        # One INSERT ... ON CONFLICT DO NOTHING RETURNING; the unique email constraint catches duplicates
+        schooler_db = await insert_one_ignoring_conflicts(
+            session, Schooler, Schooler.model_validate(schooler).model_dump(exclude_none=True)
+        )
+        await session.commit()
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    if schooler_db is None:
+        raise HTTPException(status_code=409, detail="Schooler already exists.")
+    created = SchoolerPublic(**schooler_db.dict())
+    audit.log("create", "schooler", created.id, after=created.model_dump(mode="json"))
+    return created
 
 # --- Subject POST ---
 @router_post.post(
@@ -168,7 +196,8 @@ async def create_schooler(
 )
 async def create_subject(
     subject: Annotated[SubjectCreate, Body(...)],
-    session: SessionDep
+    session: SessionDep,
+    audit: AuditDep
 ) -> SubjectPublic:
     """
     Create a new subject.
@@ -176,6 +205,7 @@ async def create_subject(
     Args:
         subject (SubjectCreate): Subject data to create.
         session (SessionDep): SQLModel session dependency.
+        audit (AuditDep): Audit trail of the request.
 
     Returns:
         SubjectPublic: Newly created subject.
@@ -188,18 +218,19 @@ async def create_subject(
     """
     if not subject.name:
         raise HTTPException(status_code=400, detail="Name is required.")
-    # Check for duplicate name
-    existing = session.exec(select(Subject).where(Subject.name == subject.name)).first()
-    if existing:
-        raise HTTPException(status_code=409, detail="Subject already exists.")
     try:
-        subject_db = Subject.model_validate(subject)
-        session.add(subject_db)
-        session.commit()
-        session.refresh(subject_db)
-        return SubjectPublic(**subject_db.dict())
+        # One INSERT ... ON CONFLICT DO NOTHING RETURNING; the unique name constraint catches duplicates
+        subject_db = await insert_one_ignoring_conflicts(
+            session, Subject, Subject.model_validate(subject).model_dump(exclude_none=True)
+        )
+        await commit_and_invalidate(session, subject_cache)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    if subject_db is None:
+        raise HTTPException(status_code=409, detail="Subject already exists.")
+    created = SubjectPublic(**subject_db.dict())
+    audit.log("create", "subject", created.id, after=created.model_dump(mode="json"))
+    return created
 
 # --- Class POST ---
 @router_post.post(
@@ -214,7 +245,8 @@ async def create_subject(
 )
 async def create_class(
     new_class: Annotated[ClassCreate, Body(...)],
-    session: SessionDep
+    session: SessionDep,
+    audit: AuditDep
 ) -> ClassPublic:
     """
     Create a new class.
@@ -222,6 +254,7 @@ async def create_class(
     Args:
         new_class (ClassCreate): Class data to create.
         session (SessionDep): SQLModel session dependency.
+        audit (AuditDep): Audit trail of the request.
 
     Returns:
         ClassPublic: Newly created class.
@@ -234,18 +267,19 @@ async def create_class(
     """
     if not new_class.name:
         raise HTTPException(status_code=400, detail="Name is required.")
-    # Check for duplicate name
-    existing = session.exec(select(Class).where(Class.name == new_class.name)).first()
-    if existing:
-        raise HTTPException(status_code=409, detail="Class already exists.")
     try:
-        class_db = Class.model_validate(new_class)
-        session.add(class_db)
-        session.commit()
-        session.refresh(class_db)
-        return ClassPublic(**class_db.dict())
+        # One INSERT ... ON CONFLICT DO NOTHING RETURNING; the unique name constraint catches duplicates
+        class_db = await insert_one_ignoring_conflicts(
+            session, Class, Class.model_validate(new_class).model_dump(exclude_none=True)
+        )
+        await commit_and_invalidate(session, class_cache)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    if class_db is None:
+        raise HTTPException(status_code=409, detail="Class already exists.")
+    created = ClassPublic(**class_db.dict())
+    audit.log("create", "class", created.id, after=created.model_dump(mode="json"))
+    return created
 
 # --- Assignment POST ---
 @router_post.post(
@@ -260,7 +294,8 @@ async def create_class(
 )
 async def create_assignment(
     assignment: Annotated[AssignmentCreate, Body(...)],
-    session: SessionDep
+    session: SessionDep,
+    audit: AuditDep
 ) -> AssignmentPublic:
     """
     Create a new assignment.
@@ -268,6 +303,7 @@ async def create_assignment(
     Args:
         assignment (AssignmentCreate): Assignment data to create.
         session (SessionDep): SQLModel session dependency.
+        audit (AuditDep): Audit trail of the request.
 
     Returns:
         AssignmentPublic: Newly created assignment.
@@ -280,18 +316,20 @@ async def create_assignment(
     """
     if not assignment.teacher_id or not assignment.subject_id or not assignment.title or not assignment.description or not assignment.assign_type or not assignment.deadline:
         raise HTTPException(status_code=400, detail="All fields are required.")
-    # Check for duplicate assignment (by title and teacher)
-    existing = session.exec(select(Assignment).where(Assignment.title == assignment.title, Assignment.teacher_id == assignment.teacher_id)).first()
-    if existing:
-        raise HTTPException(status_code=409, detail="Assignment already exists.")
     try:
-        assignment_db = Assignment.model_validate(assignment)
-        session.add(assignment_db)
-        session.commit()
-        session.refresh(assignment_db)
-        return AssignmentPublic(**assignment_db.dict())
+        # One INSERT ... SELECT ... WHERE NOT EXISTS RETURNING; a teacher's titles have no unique key
+        assignment_db = await insert_one_unless(
+            session, Assignment, Assignment.model_validate(assignment).model_dump(exclude_none=True),
+            (Assignment.teacher_id == assignment.teacher_id) & (Assignment.title == assignment.title)
+        )
+        await session.commit()
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    if assignment_db is None:
+        raise HTTPException(status_code=409, detail="Assignment already exists.")
+    created = AssignmentPublic(**assignment_db.dict())
+    audit.log("create", "assignment", created.id, after=created.model_dump(mode="json"))
+    return created
 
 # --- SubmittedAssignment POST ---
 @router_post.post(
@@ -306,7 +344,8 @@ async def create_assignment(
 )
 async def submit_assignment(
     submitted_assignment: Annotated[SubmittedAssignmentCreate, Body(...)],
-    session: SessionDep
+    session: SessionDep,
+    audit: AuditDep
 ) -> SubmittedAssignmentPublic:
     """
     Submit a schooler's assignment.
@@ -314,6 +353,7 @@ async def submit_assignment(
     Args:
         submitted_assignment (SubmittedAssignmentCreate): Submitted assignment data.
         session (SessionDep): SQLModel session dependency.
+        audit (AuditDep): Audit trail of the request.
 
     Returns:
         SubmittedAssignmentPublic: Newly created submitted assignment.
@@ -326,18 +366,321 @@ async def submit_assignment(
     """
     if not submitted_assignment.schooler_id or not submitted_assignment.assignment_id or not submitted_assignment.work:
         raise HTTPException(status_code=400, detail="All fields are required.")
-    # Check for duplicate submission
-    existing = session.exec(select(SubmittedAssignment).where(
-        SubmittedAssignment.schooler_id == submitted_assignment.schooler_id,
-        SubmittedAssignment.assignment_id == submitted_assignment.assignment_id
-    )).first()
-    if existing:
+    try:
+        # One INSERT ... ON CONFLICT DO NOTHING RETURNING; the unique (schooler_id, assignment_id) constraint catches duplicates
+        submitted_assignment_db = await insert_one_ignoring_conflicts(
+            session, SubmittedAssignment, {
+                **SubmittedAssignment.model_validate(submitted_assignment).model_dump(exclude_none=True),
+                **work_columns(submitted_assignment.work)
+            }
+        )
+        if submitted_assignment_db is not None:
+            await write_work_body(session, submitted_assignment_db.id, submitted_assignment.work, replace=False)
+            if submitted_assignment_db.grade is not None:
+                await apply_submission_grades(session, SubmittedAssignment.id == submitted_assignment_db.id, 1)
+        await session.commit()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    if submitted_assignment_db is None:
         raise HTTPException(status_code=409, detail="Submission already exists.")
+    # A long body isn't in the returned row, it went to submissionbody
+    created = SubmittedAssignmentPublic(**{**submitted_assignment_db.dict(), "work": submitted_assignment.work})
+    audit.log("create", "submittedassignment", created.id, after=created.model_dump(mode="json"))
+    return created
+
+async def _bulk_create(
+    session: AsyncSession,
+    audit: AuditTrail,
+    model: Type[SQLModel],
+    items: List[SQLModel],
+    key: str,
+    references: dict[str, ReferenceCache],
+    invalidates: tuple[ReferenceCache, ...] = ()
+) -> BulkCreateResult:
+    """
+    Insert a list of ``*Create`` items with multi-row statements and report the outcome of every item.
+
+    Args:
+        session (AsyncSession): Database session.
+        audit (AuditTrail): Audit trail of the request.
+        model (Type[SQLModel]): Table model to insert into.
+        items (List[SQLModel]): Validated ``*Create`` items.
+        key (str): Unique field used to match returned rows back to items (``email`` or ``name``).
+        references (dict[str, ReferenceCache]): Foreign key fields and the cached tables they point to.
+        invalidates (tuple[ReferenceCache, ...]): Caches of the table being written to.
+
+    Returns:
+        BulkCreateResult: Per-item created/conflict/invalid results in request order.
+    """
+    results: List[BulkItemResult | None] = [None] * len(items)
+
+    # One cache lookup per foreign key for the whole request, so a missing class doesn't abort the batch
+    for field, cache in references.items():
+        found = await cache.existing_ids(session, {getattr(item, field) for item in items})
+        for index, item in enumerate(items):
+            if results[index] is None and getattr(item, field) not in found:
+                results[index] = BulkItemResult(
+                    index=index,
+                    status=BulkStatus.invalid,
+                    detail=f"{field} {getattr(item, field)} does not exist."
+                )
+
+    valid = [(index, item) for index, item in enumerate(items) if results[index] is None]
+    rows = [model.model_validate(item).model_dump(exclude_none=True) for _, item in valid]
     try:
-        submitted_assignment_db = SubmittedAssignment.model_validate(submitted_assignment)
-        session.add(submitted_assignment_db)
-        session.commit()
-        session.refresh(submitted_assignment_db)
-        return SubmittedAssignmentPublic(**submitted_assignment_db.dict())
+        created = await insert_ignoring_conflicts(session, model, rows)
+        await commit_and_invalidate(session, *invalidates)
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+    # Rows skipped by ON CONFLICT are missing from RETURNING; the first item with a given key wins
+    primary_key = model.__table__.primary_key.columns.values()[0].key
+    created_by_key = {getattr(row, key): row for row in created}
+    for index, item in valid:
+        row = created_by_key.pop(getattr(item, key), None)
+        if row is None:
+            results[index] = BulkItemResult(index=index, status=BulkStatus.conflict, detail="Duplicates an existing unique value.")
+        else:
+            results[index] = BulkItemResult(index=index, status=BulkStatus.created, id=getattr(row, primary_key))
+
+    audit.log(
+        "bulk_create", model.__tablename__,
+        [result.id for result in results if result.status == BulkStatus.created]
+    )
+    return BulkCreateResult(
+        created=sum(result.status == BulkStatus.created for result in results),
+        conflicts=sum(result.status == BulkStatus.conflict for result in results),
+        invalid=sum(result.status == BulkStatus.invalid for result in results),
+        items=results
+    )
+
+# --- Admin bulk POST ---
+@router_post.post(
+    "/admins/bulk",
+    response_model=BulkCreateResult,
+    status_code=200,
+    responses={
+        422: {"description": "Invalid request data."},
+        500: {"description": "Internal server error."}
+    }
+)
+async def create_admins_bulk(
+    admins: Annotated[List[AdminCreate], Body(..., max_length=MAX_BULK_ITEMS)],
+    session: SessionDep,
+    audit: AuditDep
+) -> BulkCreateResult:
+    """
+    Create many admins in one request.
+
+    Items are inserted with one multi-row statement per batch; items whose email
+    already exists are reported as ``conflict`` instead of failing the request.
+
+    Args:
+        admins (List[AdminCreate]): Admin data to create.
+        session (SessionDep): SQLModel session dependency.
+        audit (AuditDep): Audit trail of the request.
+
+    Returns:
+        BulkCreateResult: Counts and per-item results in request order.
+
+    Status Codes:
+        200: Batch processed, see per-item results.
+        422: Invalid request data.
+        500: Internal server error.
+    """
+    return await _bulk_create(session, audit, Admin, admins, "email", {})
+
+# --- Teacher bulk POST ---
+@router_post.post(
+    "/teachers/bulk",
+    response_model=BulkCreateResult,
+    status_code=200,
+    responses={
+        422: {"description": "Invalid request data."},
+        500: {"description": "Internal server error."}
+    }
+)
+async def create_teachers_bulk(
+    teachers: Annotated[List[TeacherCreate], Body(..., max_length=MAX_BULK_ITEMS)],
+    session: SessionDep,
+    audit: AuditDep
+) -> BulkCreateResult:
+    """
+    Create many teachers in one request.
+
+    Items are inserted with one multi-row statement per batch; items whose email
+    already exists are reported as ``conflict`` instead of failing the request.
+    Items pointing at a class or subject that does not exist are reported as ``invalid``.
+
+    Args:
+        teachers (List[TeacherCreate]): Teacher data to create.
+        session (SessionDep): SQLModel session dependency.
+        audit (AuditDep): Audit trail of the request.
+
+    Returns:
+        BulkCreateResult: Counts and per-item results in request order.
+
+    Status Codes:
+        200: Batch processed, see per-item results.
+        422: Invalid request data.
+        500: Internal server error.
+    """
+    return await _bulk_create(session, audit, Teacher, teachers, "email", {"class_id": class_cache, "subject_id": subject_cache})
+
+# --- Schooler bulk POST ---
+@router_post.post(
+    "/schoolers/bulk",
+    response_model=BulkCreateResult,
+    status_code=200,
+    responses={
+        422: {"description": "Invalid request data."},
+        500: {"description": "Internal server error."}
+    }
+)
+async def create_schoolers_bulk(
+    schoolers: Annotated[List[SchoolerCreate], Body(..., max_length=MAX_BULK_ITEMS)],
+    session: SessionDep,
+    audit: AuditDep
+) -> BulkCreateResult:
+    """
+    Enroll many schoolers in one request.
+
+    Items are inserted with one multi-row statement per batch; items whose email
+    already exists are reported as ``conflict`` instead of failing the request.
+    Items pointing at a class that does not exist are reported as ``invalid``.
+
+    Args:
+        schoolers (List[SchoolerCreate]): Schooler data to create.
+        session (SessionDep): SQLModel session dependency.
+        audit (AuditDep): Audit trail of the request.
+
+    Returns:
+        BulkCreateResult: Counts and per-item results in request order.
+
+    Status Codes:
+        200: Batch processed, see per-item results.
+        422: Invalid request data.
+        500: Internal server error.
+    """
+    return await _bulk_create(session, audit, Schooler, schoolers, "email", {"class_id": class_cache})
+
+# --- Subject bulk POST ---
+@router_post.post(
+    "/subjects/bulk",
+    response_model=BulkCreateResult,
+    status_code=200,
+    responses={
+        422: {"description": "Invalid request data."},
+        500: {"description": "Internal server error."}
+    }
+)
+async def create_subjects_bulk(
+    subjects: Annotated[List[SubjectCreate], Body(..., max_length=MAX_BULK_ITEMS)],
+    session: SessionDep,
+    audit: AuditDep
+) -> BulkCreateResult:
+    """
+    Create many subjects in one request.
+
+    Items are inserted with one multi-row statement per batch; items whose name
+    already exists are reported as ``conflict`` instead of failing the request.
+
+    Args:
+        subjects (List[SubjectCreate]): Subject data to create.
+        session (SessionDep): SQLModel session dependency.
+        audit (AuditDep): Audit trail of the request.
+
+    Returns:
+        BulkCreateResult: Counts and per-item results in request order.
+
+    Status Codes:
+        200: Batch processed, see per-item results.
+        422: Invalid request data.
+        500: Internal server error.
+    """
+    return await _bulk_create(session, audit, Subject, subjects, "name", {}, (subject_cache,))
+
+# --- Class bulk POST ---
+@router_post.post(
+    "/classes/bulk",
+    response_model=BulkCreateResult,
+    status_code=200,
+    responses={
+        422: {"description": "Invalid request data."},
+        500: {"description": "Internal server error."}
+    }
+)
+async def create_classes_bulk(
+    classes: Annotated[List[ClassCreate], Body(..., max_length=MAX_BULK_ITEMS)],
+    session: SessionDep,
+    audit: AuditDep
+) -> BulkCreateResult:
+    """
+    Create many classes in one request.
+
+    Items are inserted with one multi-row statement per batch; items whose name
+    already exists are reported as ``conflict`` instead of failing the request.
+
+    Args:
+        classes (List[ClassCreate]): Class data to create.
+        session (SessionDep): SQLModel session dependency.
+        audit (AuditDep): Audit trail of the request.
+
+    Returns:
+        BulkCreateResult: Counts and per-item results in request order.
+
+    Status Codes:
+        200: Batch processed, see per-item results.
+        422: Invalid request data.
+        500: Internal server error.
+    """
+    return await _bulk_create(session, audit, Class, classes, "name", {}, (class_cache,))
+
+# --- Roster CSV import ---
+@router_post.post(
+    "/import/{learner}/csv",
+    response_model=RosterImportReport,
+    status_code=200,
+    responses={
+        400: {"description": "File is not UTF-8 CSV."},
+        500: {"description": "Internal server error."}
+    }
+)
+async def import_learners_csv(
+    learner: Annotated[Learners, Path(description="schooler or teacher")],
+    file: UploadFile,
+    session: SessionDep,
+    audit: AuditDep
+) -> RosterImportReport:
+    """
+    Import a schooler or teacher roster from a CSV upload.
+
+    Rows are validated against ``SchoolerCreate``/``TeacherCreate`` in chunks, loaded with ``COPY``
+    into a staging table and merged into the real table with one statement.
+
+    Args:
+        learner (Learners): Which roster the file contains.
+        file (UploadFile): CSV with a header row naming the ``*Create`` fields.
+        session (SessionDep): SQLModel session dependency.
+        audit (AuditDep): Audit trail of the request.
+
+    Returns:
+        RosterImportReport: Row counts and the rejected lines with their reasons.
+
+    Status Codes:
+        200: File processed, see the report for rejected rows.
+        400: File is not UTF-8 CSV.
+        500: Internal server error.
+    """
+    # The upload is spooled to disk by Starlette, wrapping it streams rows without reading it into memory
+    stream = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    try:
+        report = await import_roster(session, learner.value, stream)
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="File must be UTF-8 encoded CSV.")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        stream.detach()
+    audit.log("import", learner.value, after={"inserted": report.inserted, "rejected": report.rejected})
+    return report
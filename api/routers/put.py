@@ -1,22 +1,34 @@
-from fastapi import APIRouter, Path, Query, status
-from typing import Annotated
+from fastapi import APIRouter, Body, HTTPException, Path, Query, status
+from typing import Annotated, List
 from datetime import date
 
 """FastAPI's dependecies and models"""
-from api.dependecies.models import Teacher, Admin, Schooler, Assignment, SubmittedAssignment, Subject, Class
-from api.dependecies.dependency import SessionDep
+from api.dependecies.models import (
+    Teacher, Admin, Schooler, Assignment, SubmittedAssignment, Subject, Class,
+    GradeItem, BulkGradeResult, SUBMISSION_MAX_LENGTH
+)
+from api.dependecies.dependency import SessionDep, AuditDep
 
 """Imports for postgres db"""
 from sqlmodel import select
+from sqlalchemy import Integer, column, update, values
+from database.postgres.bulk import BULK_BATCH_SIZE
+from database.postgres.cache import class_cache, subject_cache, commit_and_invalidate
+from database.postgres.grade_summary import apply_grade_change, apply_grade_changes, apply_submission_grades
+from database.postgres.work_storage import update_work
 
 """Imports for mongodb"""
 from database.mongodb.db import collection
 
 router_put: APIRouter = APIRouter() 
 
+# Upper bound of grades accepted by one bulk request
+MAX_BULK_GRADES = 10000
+
 @router_put.put("/update/assignment/{assignment_id}/", status_code=status.HTTP_200_OK)
 async def update_assign(
     session: SessionDep,
+    audit: AuditDep,
     assignment_id: Annotated[int, Path()],
     title: Annotated[str | None, Query()] = None,
     description: Annotated[str | None, Query()] = None,
@@ -26,10 +38,11 @@ async def update_assign(
     teacher_id: Annotated[int | None, Query()] = None,
 ) -> str:
     
-    assignment = session.get(Assignment, assignment_id)
+    assignment = await session.get(Assignment, assignment_id)
     
     if not assignment:
         return f"Assignment with id {assignment_id} not found."
+    before = assignment.model_dump(mode="json")
     
     if title is not None:
         assignment.title = title
@@ -39,57 +52,147 @@ async def update_assign(
         assignment.deadline = deadline
     if assign_type is not None:
         assignment.assign_type = assign_type
+    # Grades are summarized per subject, so a subject change moves them over in the same transaction
+    moves_subject = subject_id is not None and subject_id != assignment.subject_id
+    if moves_subject:
+        await apply_submission_grades(session, SubmittedAssignment.assignment_id == assignment_id, -1)
+        await apply_submission_grades(session, SubmittedAssignment.assignment_id == assignment_id, 1, subject_id=subject_id)
     if subject_id is not None:
         assignment.subject_id = subject_id
     if teacher_id is not None:
         assignment.teacher_id = teacher_id
         
     session.add(assignment)
-    session.commit()
-    session.refresh(assignment)
+    await session.commit()
+    await session.refresh(assignment)
+    audit.log("update", "assignment", assignment_id, before, assignment.model_dump(mode="json"))
     
     return f"Assignment {assignment} updated successfully."
 
 @router_put.put("/give/garde/{grade}/assignment/{submitted_assignment_id}", status_code=status.HTTP_200_OK)
 async def give_grade(
     session: SessionDep,
+    audit: AuditDep,
     submitted_assignment_id: Annotated[int, Path()],
     grade: Annotated[int, Path()]
     )->str:
     
-    assignment = session.get(SubmittedAssignment, submitted_assignment_id)
+    # Lock the submission so concurrent regrades apply their summary deltas one after another
+    assignment = await session.get(SubmittedAssignment, submitted_assignment_id, with_for_update=True)
     if not assignment:
         return f"Assignment with id {submitted_assignment_id} not found."
+    before = assignment.model_dump(mode="json")
     
+    subject_id = (await session.exec(select(Assignment.subject_id).where(Assignment.id == assignment.assignment_id))).one()
+    await apply_grade_change(session, assignment.schooler_id, subject_id, assignment.grade, grade)
     assignment.grade = grade
     
     session.add(assignment)
-    session.commit()
-    session.refresh(assignment)
+    await session.commit()
+    await session.refresh(assignment)
+    audit.log("update", "submittedassignment", submitted_assignment_id, before, assignment.model_dump(mode="json"))
     
     return f"Grade {grade} added successfully to the assignment {assignment}."
 
+@router_put.put(
+    "/grades/bulk",
+    response_model=BulkGradeResult,
+    status_code=status.HTTP_200_OK,
+    responses={
+        422: {"description": "Invalid request data."},
+        500: {"description": "Internal server error."}
+    }
+)
+async def give_grades_bulk(
+    session: SessionDep,
+    audit: AuditDep,
+    grades: Annotated[List[GradeItem], Body(..., max_length=MAX_BULK_GRADES)]
+) -> BulkGradeResult:
+    """
+    Grade many submissions in one transaction.
+
+    Each batch is one ``UPDATE ... FROM (VALUES ...)`` that also returns the previous grades,
+    so the grade summary is adjusted without reading the submissions first.
+
+    Args:
+        session (SessionDep): SQLModel session dependency.
+        audit (AuditDep): Audit trail of the request.
+        grades (List[GradeItem]): Submission ids and their grades; the last grade of a repeated id wins.
+
+    Returns:
+        BulkGradeResult: Number of graded submissions and the ids that don't exist.
+
+    Status Codes:
+        200: Grades applied, see ``missing`` for unknown ids.
+        422: Invalid request data.
+        500: Internal server error.
+    """
+    # UPDATE ... FROM may not match one target row twice
+    requested = {item.submitted_assignment_id: item.grade for item in grades}
+    items = list(requested.items())
+    changes = []
+    try:
+        for start in range(0, len(items), BULK_BATCH_SIZE):
+            batch = values(column("id", Integer), column("grade", Integer), name="grades").data(items[start:start + BULK_BATCH_SIZE])
+            # FOR UPDATE in the CTE makes the old grade it reads the one being replaced, even under concurrent regrading
+            old = (
+                select(
+                    SubmittedAssignment.id,
+                    SubmittedAssignment.schooler_id,
+                    Assignment.subject_id,
+                    SubmittedAssignment.grade,
+                    batch.c.grade.label("new_grade")
+                )
+                .join(batch, batch.c.id == SubmittedAssignment.id)
+                .join(Assignment, Assignment.id == SubmittedAssignment.assignment_id)
+                .with_for_update(of=SubmittedAssignment)
+                .cte("old")
+            )
+            statement = (
+                update(SubmittedAssignment)
+                .where(SubmittedAssignment.id == old.c.id)
+                # Set explicitly so the column's onupdate=now() doesn't turn on-time work late
+                .values(grade=old.c.new_grade, submitted=SubmittedAssignment.submitted)
+                .returning(SubmittedAssignment.id, old.c.schooler_id, old.c.subject_id, old.c.grade, old.c.new_grade)
+            )
+            changes.extend((await session.exec(statement)).all())
+        await apply_grade_changes(
+            session, [(schooler_id, subject_id, old_grade, new_grade) for _, schooler_id, subject_id, old_grade, new_grade in changes]
+        )
+        await session.commit()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    updated = {change[0] for change in changes}
+    audit.log(
+        "bulk_grade", "submittedassignment", sorted(updated),
+        after={"graded": len(updated), "missing": len(requested) - len(updated)}
+    )
+    return BulkGradeResult(updated=len(updated), missing=[submission_id for submission_id in requested if submission_id not in updated])
+
 """"This is the function for schoolers to update their handed in assignments"""
 @router_put.put("/update/submitted/assignment/{assignment_id}/{schooler_id}/work/{work}", status_code=status.HTTP_200_OK)
 async def update_submitted_assign(
     session: SessionDep,
+    audit: AuditDep,
     assignment_id: Annotated[int, Path()],
     schooler_id: Annotated[int, Path()],
-    work: Annotated[str, Path()]
+    work: Annotated[str, Path(max_length=SUBMISSION_MAX_LENGTH)]
     )->str:
     
     statement = select(SubmittedAssignment).where(SubmittedAssignment.schooler_id == schooler_id)
     statement = statement.where(SubmittedAssignment.assignment_id == assignment_id)
     
     try:
-        assignment = session.exec(statement).one()
+        assignment = (await session.exec(statement)).one()
     except Exception as e:
         print(f"Error during finding assignment with {assignment_id} and {schooler_id}: {e}")
         
-    assignment.work = work
-    session.add(assignment)
-    session.commit()
-    session.refresh(assignment)
+    before = assignment.model_dump(mode="json")
+    await update_work(session, assignment.id, work)
+    await session.commit()
+    await session.refresh(assignment)
+    audit.log("update", "submittedassignment", assignment.id, before, assignment.model_dump(mode="json"))
     
     return f"Work is updated in the assignment - {assignment}"
 
@@ -97,15 +200,18 @@ async def update_submitted_assign(
 @router_put.put("/update/class/{class_id}/", status_code=status.HTTP_200_OK)
 async def update_class_info(
     session: SessionDep,
+    audit: AuditDep,
     class_id: Annotated[int, Path()],
     name: Annotated[str | None, Query()] = None,
     teacher_id: Annotated[int | None, Query()] = None
 ) -> str:
     
-    class_obj = session.get(Class, class_id)
+    class_obj = await session.get(Class, class_id)
     
-    if not class_obj:
+    # A deleted class waiting for the purge can't be changed any more
+    if not class_obj or class_obj.deleted_at is not None:
         return f"Class with id {class_id} not found."
+    before = class_obj.model_dump(mode="json")
     
     if name is not None:
         class_obj.name = name
@@ -113,8 +219,9 @@ async def update_class_info(
         class_obj.teacher_id = teacher_id
         
     session.add(class_obj)
-    session.commit()
-    session.refresh(class_obj)
+    await commit_and_invalidate(session, class_cache)
+    await session.refresh(class_obj)
+    audit.log("update", "class", class_id, before, class_obj.model_dump(mode="json"))
     
     return f"Class {class_obj} updated successfully."
 
@@ -122,21 +229,24 @@ async def update_class_info(
 @router_put.put("/update/subject/{subject_id}/name/{name}", status_code=status.HTTP_200_OK)
 async def update_subject_info(
     session: SessionDep,
+    audit: AuditDep,
     subject_id: Annotated[int, Path()],
     name: Annotated[str | None, Path()]
 ) -> str:
     
-    subject = session.get(Subject, subject_id)
+    subject = await session.get(Subject, subject_id)
     
-    if not subject:
+    if not subject or subject.deleted_at is not None:
         return f"Subject with id {subject_id} not found."
+    before = subject.model_dump(mode="json")
     
     if name is not None:
         subject.name = name
         
     session.add(subject)
-    session.commit()
-    session.refresh(subject)
+    await commit_and_invalidate(session, subject_cache)
+    await session.refresh(subject)
+    audit.log("update", "subject", subject_id, before, subject.model_dump(mode="json"))
     
     return f"Subject {subject} updated successfully."
 
@@ -144,16 +254,18 @@ async def update_subject_info(
 @router_put.put("/update/schooler/{schooler_id}/", status_code=status.HTTP_200_OK)
 async def update_schooler_info(
     session: SessionDep,
+    audit: AuditDep,
     schooler_id: Annotated[int, Path()],
     name: Annotated[str | None, Query()] = None,
     age: Annotated[int | None, Query()] = None,
     class_id: Annotated[int | None, Query()] = None
 ) -> str:
     
-    schooler = session.get(Schooler, schooler_id)
+    schooler = await session.get(Schooler, schooler_id)
     
     if not schooler:
         return f"Schooler with id {schooler_id} not found."
+    before = schooler.model_dump(mode="json")
     
     if name is not None:
         schooler.name = name
@@ -163,8 +275,9 @@ async def update_schooler_info(
         schooler.class_id = class_id
         
     session.add(schooler)
-    session.commit()
-    session.refresh(schooler)
+    await session.commit()
+    await session.refresh(schooler)
+    audit.log("update", "schooler", schooler_id, before, schooler.model_dump(mode="json"))
     
     return f"Schooler {schooler} updated successfully."
 
@@ -172,6 +285,7 @@ async def update_schooler_info(
 @router_put.put("/update/teacher/{teacher_id}/", status_code=status.HTTP_200_OK)
 async def update_teacher_info(
     session: SessionDep,
+    audit: AuditDep,
     teacher_id: Annotated[int, Path()],
     name: Annotated[str | None, Query()] = None,
     age: Annotated[int | None, Query()] = None,
@@ -179,10 +293,11 @@ async def update_teacher_info(
     class_id: Annotated[int | None, Query()] = None
 ) -> str:
     
-    teacher = session.get(Teacher, teacher_id)
+    teacher = await session.get(Teacher, teacher_id)
     
     if not teacher:
         return f"Teacher with id {teacher_id} not found."
+    before = teacher.model_dump(mode="json")
     
     if name is not None:
         teacher.name = name
@@ -194,8 +309,9 @@ async def update_teacher_info(
         teacher.class_id = class_id
         
     session.add(teacher)
-    session.commit()
-    session.refresh(teacher)
+    await session.commit()
+    await session.refresh(teacher)
+    audit.log("update", "teacher", teacher_id, before, teacher.model_dump(mode="json"))
     
     return f"Teacher {teacher} updated successfully."
 
@@ -203,19 +319,22 @@ async def update_teacher_info(
 @router_put.put("/update/admin/{admin_id}/", status_code=status.HTTP_200_OK)
 async def update_admin_info(
     session: SessionDep,
+    audit: AuditDep,
     admin_id: Annotated[int, Path()],
     name: Annotated[str | None, Query()] = None
 ) -> str:
     
-    admin = session.get(Admin, admin_id)
+    admin = await session.get(Admin, admin_id)
     
     if not admin:
         return f"Admin with id {admin_id} not found."
+    before = admin.model_dump(mode="json")
     if name is not None:
         admin.name = name
         
     session.add(admin)
-    session.commit()
-    session.refresh(admin)
+    await session.commit()
+    await session.refresh(admin)
+    audit.log("update", "admin", admin_id, before, admin.model_dump(mode="json"))
     
     return f"Admin {admin} updated successfully."
\ No newline at end of file
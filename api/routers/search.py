@@ -0,0 +1,197 @@
+from fastapi import APIRouter, Query, Response, status
+from typing import Annotated, List
+
+"""FastAPI's dependecies and models"""
+from api.dependecies.models import (
+    Teacher, Schooler, Admin, Assignment, SubmittedAssignment, Subject, Class, SEARCH_CONFIG, full_name,
+    in_live, live_submission,
+    Page, AssignmentSearchHit, SubmissionSearchHit, PersonMatch
+)
+from api.dependecies.dependency import SessionDep, SelectDep, People
+from api.dependecies.pagination import paginate
+from api.dependecies.responses import model_response
+
+"""Imports for postgres db"""
+from sqlmodel import select
+from sqlalchemy import Double, cast, func, literal, union_all
+from database.postgres.work_storage import work_text
+
+router_search: APIRouter = APIRouter(prefix="/search")
+
+# ts_headline options: a few short fragments around the matches instead of the whole document
+HEADLINE_OPTIONS = "StartSel=<mark>, StopSel=</mark>, MaxFragments=3, MaxWords=20, MinWords=5"
+
+# Person tables the name lookup runs over, with their primary keys and what hides the people of a deleted class
+PEOPLE = {
+    People.schooler: (Schooler, Schooler.id, in_live(Schooler.class_id, Class)),
+    People.teacher: (Teacher, Teacher.id, in_live(Teacher.class_id, Class)),
+    People.admin: (Admin, Admin.admin_id, None),
+}
+
+SearchQuery = Annotated[str, Query(min_length=1, max_length=200, description="Web search syntax: words, \"phrases\", or, -excluded")]
+
+def _ranked(vector, q: str):
+    """Match condition, rank and the parsed query for ``q`` against a search vector."""
+    query = func.websearch_to_tsquery(SEARCH_CONFIG, q)
+    # ts_rank is a real; as a double it survives the JSON round trip of the cursor exactly
+    rank = cast(func.ts_rank(vector, query), Double).label("rank")
+    return vector.op("@@")(query), rank, query
+
+@router_search.get("/assignments", status_code=status.HTTP_200_OK)
+async def search_assignments(
+    session: SessionDep,
+    response: Response,
+    select_params: SelectDep,
+    q: SearchQuery,
+    teacher_id: Annotated[int | None, Query()] = None,
+    subject_id: Annotated[int | None, Query()] = None,
+    class_id: Annotated[int | None, Query(description="Class taught by the assignment's teacher")] = None,
+) -> Page[AssignmentSearchHit]:
+    """
+    Full-text search over assignment titles and descriptions, best matches first.
+
+    Args:
+        session (SessionDep): SQLModel session dependency.
+        response (Response): Response whose headers are carried over.
+        select_params (SelectDep): Cursor and page size.
+        q (str): Search terms.
+        teacher_id (int | None): Only assignments of this teacher.
+        subject_id (int | None): Only assignments of this subject.
+        class_id (int | None): Only assignments of the teacher of this class.
+
+    Returns:
+        Page[AssignmentSearchHit]: Matches with their rank and a highlighted snippet.
+
+    Status Codes:
+        200: Page of matches.
+        400: Invalid cursor.
+    """
+    vector = Assignment.__table__.c.search_vector
+    matches, rank, query = _ranked(vector, q)
+    # Postgres evaluates the select list after ORDER BY ... LIMIT, so ts_headline only runs for the rows of the page
+    snippet = func.ts_headline(
+        SEARCH_CONFIG, Assignment.title + " " + Assignment.description, query, HEADLINE_OPTIONS
+    ).label("snippet")
+
+    statement = select(
+        Assignment.id, Assignment.teacher_id, Assignment.subject_id, Assignment.title,
+        Assignment.assign_type, Assignment.deadline, rank, snippet
+    ).where(matches, in_live(Assignment.subject_id, Subject))
+
+    if teacher_id is not None:
+        statement = statement.where(Assignment.teacher_id == teacher_id)
+    if subject_id is not None:
+        statement = statement.where(Assignment.subject_id == subject_id)
+    if class_id is not None:
+        statement = statement.join(Teacher, Teacher.id == Assignment.teacher_id).where(Teacher.class_id == class_id)
+
+    rows, next_cursor = await paginate(
+        session, statement, (rank, Assignment.id), select_params.cursor, select_params.limit, descending=True
+    )
+    return model_response(Page[AssignmentSearchHit](
+        items=[AssignmentSearchHit.model_validate(row._mapping) for row in rows],
+        next_cursor=next_cursor
+    ), response)
+
+@router_search.get("/submissions", status_code=status.HTTP_200_OK)
+async def search_submissions(
+    session: SessionDep,
+    response: Response,
+    select_params: SelectDep,
+    q: SearchQuery,
+    teacher_id: Annotated[int | None, Query()] = None,
+    subject_id: Annotated[int | None, Query()] = None,
+    class_id: Annotated[int | None, Query(description="Class of the submitting schooler")] = None,
+) -> Page[SubmissionSearchHit]:
+    """
+    Full-text search over submitted work, best matches first.
+
+    Args:
+        session (SessionDep): SQLModel session dependency.
+        response (Response): Response whose headers are carried over.
+        select_params (SelectDep): Cursor and page size.
+        q (str): Search terms.
+        teacher_id (int | None): Only submissions to assignments of this teacher.
+        subject_id (int | None): Only submissions to assignments of this subject.
+        class_id (int | None): Only submissions of schoolers in this class.
+
+    Returns:
+        Page[SubmissionSearchHit]: Matches with their rank and a highlighted snippet.
+
+    Status Codes:
+        200: Page of matches.
+        400: Invalid cursor.
+    """
+    vector = SubmittedAssignment.__table__.c.search_vector
+    matches, rank, query = _ranked(vector, q)
+    snippet = func.ts_headline(SEARCH_CONFIG, work_text(), query, HEADLINE_OPTIONS).label("snippet")
+
+    statement = select(
+        SubmittedAssignment.id, SubmittedAssignment.schooler_id, SubmittedAssignment.assignment_id,
+        SubmittedAssignment.grade, SubmittedAssignment.submitted, rank, snippet
+    ).where(matches, live_submission())
+
+    if teacher_id is not None or subject_id is not None:
+        statement = statement.join(Assignment, Assignment.id == SubmittedAssignment.assignment_id)
+        if teacher_id is not None:
+            statement = statement.where(Assignment.teacher_id == teacher_id)
+        if subject_id is not None:
+            statement = statement.where(Assignment.subject_id == subject_id)
+    if class_id is not None:
+        statement = statement.join(Schooler, Schooler.id == SubmittedAssignment.schooler_id).where(Schooler.class_id == class_id)
+
+    rows, next_cursor = await paginate(
+        session, statement, (rank, SubmittedAssignment.id), select_params.cursor, select_params.limit, descending=True
+    )
+    return model_response(Page[SubmissionSearchHit](
+        items=[SubmissionSearchHit.model_validate(row._mapping) for row in rows],
+        next_cursor=next_cursor
+    ), response)
+
+@router_search.get("/people", response_model=List[PersonMatch], status_code=status.HTTP_200_OK)
+async def lookup_people(
+    session: SessionDep,
+    q: Annotated[str, Query(min_length=2, max_length=100, description="Part of a name, typos allowed")],
+    kind: Annotated[List[People] | None, Query(description="Only these kinds of people; all by default")] = None,
+    limit: Annotated[int, Query(ge=1, le=20)] = 10,
+) -> List[PersonMatch]:
+    """
+    Typo-tolerant, as-you-type lookup of schoolers, teachers and admins by name.
+
+    Matches ``first_name || ' ' || last_name`` with pg_trgm word similarity, so a partial
+    or misspelled name still finds the person.
+
+    Args:
+        session (SessionDep): SQLModel session dependency.
+        q (str): What has been typed so far.
+        kind (List[People] | None): Restrict the lookup to some kinds of people.
+        limit (int): Number of matches to return.
+
+    Returns:
+        List[PersonMatch]: Best matches first.
+
+    Status Codes:
+        200: Matches found, possibly none.
+        422: Query too short or too long.
+    """
+    branches = []
+    for person in kind or list(PEOPLE):
+        model, primary_key, visible = PEOPLE[person]
+        name = full_name(model)
+        similarity = func.word_similarity(q, name).label("similarity")
+        # %> is answered by the GIN trigram index on the same expression; each table contributes its own top k
+        branch = (
+            select(
+                literal(person.value).label("kind"), primary_key.label("id"),
+                model.first_name, model.last_name, model.email, similarity
+            )
+            .where(name.op("%>")(q))
+            .order_by(similarity.desc(), primary_key)
+            .limit(limit)
+        )
+        branches.append(branch if visible is None else branch.where(visible))
+
+    matches = union_all(*branches).subquery()
+    statement = select(matches).order_by(matches.c.similarity.desc(), matches.c.kind, matches.c.id).limit(limit)
+    rows = (await session.exec(statement)).all()
+    return [PersonMatch.model_validate(row._mapping) for row in rows]
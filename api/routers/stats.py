@@ -0,0 +1,288 @@
+from fastapi import APIRouter, HTTPException, Path, status
+from typing import Annotated
+
+"""FastAPI's dependecies and models"""
+from api.dependecies.models import (
+    Teacher, Schooler, Assignment, SubmittedAssignment, Class, Subject, GradeSummary, live, in_live,
+    GradeStats, SubjectAverage, SchoolerAverages
+)
+from api.dependecies.dependency import SessionDep
+
+"""Imports for postgres db"""
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy import Date, and_, cast, func
+from sqlalchemy.sql.elements import ColumnElement
+
+router_stats: APIRouter = APIRouter(prefix="/stats")
+
+async def _grade_stats(
+    session: AsyncSession,
+    scope: str,
+    entity_id: int,
+    submission_filter: ColumnElement,
+    expected: ColumnElement,
+    found: ColumnElement,
+    join_schooler: bool = False
+) -> GradeStats:
+    """
+    Compute grade statistics over the submissions matched by ``submission_filter`` in one query.
+
+    Args:
+        session (AsyncSession): Database session.
+        scope (str): ``assignment``, ``class`` or ``schooler``.
+        entity_id (int): Id of the entity the statistics are for.
+        submission_filter (ColumnElement): Which submissions belong to the entity.
+        expected (ColumnElement): Uncorrelated scalar subquery counting the submissions the entity should have.
+        found (ColumnElement): Uncorrelated EXISTS telling whether the entity exists.
+        join_schooler (bool): Join Schooler when the filter needs it.
+
+    Returns:
+        GradeStats: Aggregates computed by Postgres.
+    """
+    grade = SubmittedAssignment.grade
+    late = cast(SubmittedAssignment.submitted, Date) > Assignment.deadline
+
+    def scoped(statement):
+        statement = statement.join(Assignment, Assignment.id == SubmittedAssignment.assignment_id)
+        if join_schooler:
+            statement = statement.join(Schooler, Schooler.id == SubmittedAssignment.schooler_id)
+        return statement.where(submission_filter)
+
+    # The histogram needs its own GROUP BY, so it rides along as a scalar subquery
+    buckets = scoped(
+        select(grade.label("grade"), func.count().label("n")).select_from(SubmittedAssignment)
+    ).where(grade.is_not(None)).group_by(grade).subquery()
+    histogram = select(func.jsonb_object_agg(buckets.c.grade, buckets.c.n)).scalar_subquery()
+
+    statement = scoped(select(
+        found.label("found"),
+        func.count(SubmittedAssignment.id).label("submissions"),
+        func.count(grade).label("graded"),
+        func.avg(grade).label("mean"),
+        func.percentile_cont(0.5).within_group(grade).label("median"),
+        func.percentile_cont(0.25).within_group(grade).label("p25"),
+        func.percentile_cont(0.75).within_group(grade).label("p75"),
+        func.percentile_cont(0.9).within_group(grade).label("p90"),
+        func.min(grade).label("min"),
+        func.max(grade).label("max"),
+        func.count(SubmittedAssignment.id).filter(late).label("late"),
+        expected.label("expected"),
+        histogram.label("histogram"),
+    ).select_from(SubmittedAssignment))
+
+    row = (await session.exec(statement)).one()
+    if not row.found:
+        raise HTTPException(status_code=404, detail=f"{scope.capitalize()} with id {entity_id} not found.")
+
+    return GradeStats(
+        scope=scope,
+        id=entity_id,
+        submissions=row.submissions,
+        expected_submissions=row.expected,
+        graded=row.graded,
+        mean=float(row.mean) if row.mean is not None else None,
+        median=row.median,
+        p25=row.p25,
+        p75=row.p75,
+        p90=row.p90,
+        min=row.min,
+        max=row.max,
+        histogram=row.histogram or {},
+        submission_rate=row.submissions / row.expected if row.expected else None,
+        late_rate=row.late / row.submissions if row.submissions else None,
+    )
+
+@router_stats.get(
+    "/assignment/{assignment_id}",
+    response_model=GradeStats,
+    status_code=status.HTTP_200_OK,
+    responses={404: {"description": "Assignment not found."}}
+)
+async def get_assignment_stats(
+    session: SessionDep,
+    assignment_id: Annotated[int, Path()]
+) -> GradeStats:
+    """
+    Grade statistics of one assignment.
+
+    Args:
+        session (SessionDep): SQLModel session dependency.
+        assignment_id (int): Id of the assignment.
+
+    Returns:
+        GradeStats: Count, mean, median, percentiles, histogram, submission rate and late rate.
+
+    Status Codes:
+        200: Statistics computed.
+        404: Assignment not found.
+    """
+    # Every schooler of the class taught by the assignment's teacher is expected to hand in
+    expected = (
+        select(func.count())
+        .select_from(Schooler)
+        .join(Teacher, Teacher.class_id == Schooler.class_id)
+        .join(Assignment, Assignment.teacher_id == Teacher.id)
+        .where(Assignment.id == assignment_id, in_live(Schooler.class_id, Class))
+        .correlate(None)
+        .scalar_subquery()
+    )
+    # An assignment of a deleted subject is gone, and so are the submissions of deleted classes' schoolers
+    found = (
+        select(Assignment.id)
+        .where(Assignment.id == assignment_id, in_live(Assignment.subject_id, Subject))
+        .correlate(None)
+        .exists()
+    )
+    return await _grade_stats(
+        session, "assignment", assignment_id,
+        and_(SubmittedAssignment.assignment_id == assignment_id, in_live(Schooler.class_id, Class)),
+        expected, found, join_schooler=True
+    )
+
+@router_stats.get(
+    "/class/{class_id}",
+    response_model=GradeStats,
+    status_code=status.HTTP_200_OK,
+    responses={404: {"description": "Class not found."}}
+)
+async def get_class_stats(
+    session: SessionDep,
+    class_id: Annotated[int, Path()]
+) -> GradeStats:
+    """
+    Grade statistics over all submissions of a class's schoolers.
+
+    Args:
+        session (SessionDep): SQLModel session dependency.
+        class_id (int): Id of the class.
+
+    Returns:
+        GradeStats: Count, mean, median, percentiles, histogram, submission rate and late rate.
+
+    Status Codes:
+        200: Statistics computed.
+        404: Class not found.
+    """
+    # Each schooler of the class is expected to hand in every assignment of the class's teacher
+    assignments = (
+        select(func.count())
+        .select_from(Assignment)
+        .join(Teacher, Teacher.id == Assignment.teacher_id)
+        .where(Teacher.class_id == class_id, in_live(Assignment.subject_id, Subject))
+        .correlate(None)
+        .scalar_subquery()
+    )
+    schoolers = (
+        select(func.count())
+        .select_from(Schooler)
+        .where(Schooler.class_id == class_id)
+        .correlate(None)
+        .scalar_subquery()
+    )
+    found = select(Class.id).where(Class.id == class_id, live(Class)).correlate(None).exists()
+    return await _grade_stats(
+        session, "class", class_id,
+        and_(Schooler.class_id == class_id, in_live(Assignment.subject_id, Subject)),
+        assignments * schoolers, found, join_schooler=True
+    )
+
+@router_stats.get(
+    "/schooler/{schooler_id}",
+    response_model=GradeStats,
+    status_code=status.HTTP_200_OK,
+    responses={404: {"description": "Schooler not found."}}
+)
+async def get_schooler_stats(
+    session: SessionDep,
+    schooler_id: Annotated[int, Path()]
+) -> GradeStats:
+    """
+    Grade statistics over all submissions of one schooler.
+
+    Args:
+        session (SessionDep): SQLModel session dependency.
+        schooler_id (int): Id of the schooler.
+
+    Returns:
+        GradeStats: Count, mean, median, percentiles, histogram, submission rate and late rate.
+
+    Status Codes:
+        200: Statistics computed.
+        404: Schooler not found.
+    """
+    # The schooler is expected to hand in every assignment of their class's teacher
+    expected = (
+        select(func.count())
+        .select_from(Assignment)
+        .join(Teacher, Teacher.id == Assignment.teacher_id)
+        .join(Schooler, Schooler.class_id == Teacher.class_id)
+        .where(Schooler.id == schooler_id, in_live(Schooler.class_id, Class), in_live(Assignment.subject_id, Subject))
+        .correlate(None)
+        .scalar_subquery()
+    )
+    # A schooler of a deleted class is gone; assignments of deleted subjects no longer count
+    found = (
+        select(Schooler.id)
+        .where(Schooler.id == schooler_id, in_live(Schooler.class_id, Class))
+        .correlate(None)
+        .exists()
+    )
+    return await _grade_stats(
+        session, "schooler", schooler_id,
+        and_(SubmittedAssignment.schooler_id == schooler_id, in_live(Assignment.subject_id, Subject)),
+        expected, found
+    )
+
+@router_stats.get(
+    "/schooler/{schooler_id}/averages",
+    response_model=SchoolerAverages,
+    status_code=status.HTTP_200_OK,
+    responses={404: {"description": "Schooler not found."}}
+)
+async def get_schooler_averages(
+    session: SessionDep,
+    schooler_id: Annotated[int, Path()]
+) -> SchoolerAverages:
+    """
+    Running grade average of a schooler per subject, read from the grade summary table.
+
+    Args:
+        session (SessionDep): SQLModel session dependency.
+        schooler_id (int): Id of the schooler.
+
+    Returns:
+        SchoolerAverages: Graded count, mean and standard deviation per subject.
+
+    Status Codes:
+        200: Averages read.
+        404: Schooler not found.
+    """
+    # A schooler of a deleted class is gone, as for get_schooler_stats
+    live_schooler = select(Schooler.id).where(Schooler.id == schooler_id, in_live(Schooler.class_id, Class))
+    # One primary key range scan over (schooler_id, subject_id), independent of how many submissions exist
+    statement = (
+        select(GradeSummary)
+        .where(
+            GradeSummary.schooler_id == schooler_id,
+            GradeSummary.graded > 0,
+            in_live(GradeSummary.subject_id, Subject),
+            live_schooler.exists()
+        )
+        .order_by(GradeSummary.subject_id)
+    )
+    summaries = (await session.exec(statement)).all()
+    if not summaries and (await session.exec(live_schooler)).first() is None:
+        raise HTTPException(status_code=404, detail=f"Schooler with id {schooler_id} not found.")
+
+    subjects = []
+    for summary in summaries:
+        mean = summary.grade_sum / summary.graded
+        variance = max(summary.grade_sum_squares / summary.graded - mean * mean, 0.0)
+        subjects.append(SubjectAverage(
+            subject_id=summary.subject_id,
+            graded=summary.graded,
+            mean=mean,
+            stddev=variance ** 0.5
+        ))
+    return SchoolerAverages(schooler_id=schooler_id, subjects=subjects)
@@ -0,0 +1,4 @@
+import os
+
+# Before api.main is imported: the query budget tests read the X-Query-* headers, which are off by default
+os.environ.setdefault("API_QUERY_HEADERS", "1")
@@ -0,0 +1,10 @@
+import random
+import uuid
+from benchmarks.generate import class_name
+
+def unique(prefix):
+    return f"{prefix}_{uuid.uuid4().hex[:8]}"
+
+def unique_class():
+    """A class name not taken by an earlier run, as far as 36^3 three character names allow."""
+    return class_name(random.randrange(1, 36 ** 3))
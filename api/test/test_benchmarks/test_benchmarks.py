@@ -0,0 +1,103 @@
+import asyncio
+import math
+import random
+import httpx
+from datetime import date
+from fastapi import FastAPI
+from benchmarks.generate import DatasetSpec, class_name, generate_rows
+from benchmarks.mongo_standin import InMemoryClient
+from benchmarks.report import build_report, compare, percentile
+from benchmarks.workloads import Call, Operation, run_workload
+
+app = FastAPI()
+
+@app.get("/ok")
+async def ok():
+    return {"ok": True}
+
+@app.get("/missing")
+async def missing():
+    return {"ok": False}
+
+spec = DatasetSpec(classes=3, subjects=2, schoolers_per_class=4, admins=2, assignments_per_teacher=2)
+
+def materialize(spec: DatasetSpec) -> dict:
+    return {table: (columns, list(rows)) for table, columns, rows in generate_rows(spec, date(2025, 9, 1))}
+
+def test_generated_rows_are_deterministic_and_consistent():
+    tables = materialize(spec)
+    assert tables == materialize(spec)
+    assert tables != materialize(DatasetSpec(**{**spec.__dict__, "seed": 7}))
+
+    assert len(tables["class"][1]) == 3 and len(tables["schooler"][1]) == 12 and len(tables["assignment"][1]) == 6
+    assert len({row[1] for row in tables["class"][1]}) == 3
+    # Every submission comes from a schooler of the class its assignment's teacher teaches
+    for row in tables["submittedassignment"][1]:
+        schooler_id, assignment_id = row[5], row[6]
+        teacher_id = (assignment_id - 1) // spec.assignments_per_teacher + 1
+        assert (schooler_id - 1) // spec.schoolers_per_class + 1 == teacher_id
+
+def test_class_names_fit_the_column():
+    assert class_name(1) == "001"
+    assert class_name(36) == "010"
+    assert len({class_name(class_id) for class_id in range(1, 2000)}) == 1999
+    assert max(len(class_name(class_id)) for class_id in range(1, 2000)) == 3
+
+def test_percentile_interpolates():
+    values = [float(value) for value in range(1, 101)]
+    assert percentile(values, 50) == 50.5
+    assert percentile(values, 99) == 99.01
+    assert percentile([3.0], 95) == 3.0
+    assert math.isnan(percentile([], 50))
+
+def test_run_workload_reports_every_operation():
+    operations = [
+        Operation("ok", 3, lambda state: Call("GET", "/ok")),
+        Operation("wrong_status", 1, lambda state: Call("GET", "/missing"), expect=(404,)),
+    ]
+
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await run_workload(client, operations, spec, requests=200, concurrency=4, warmup=8)
+
+    samples, elapsed = asyncio.run(run())
+    assert len(samples) == 200
+
+    report = build_report(samples, elapsed, {"workload": "test"})
+    assert set(report["operations"]) == {"ok", "wrong_status"}
+    assert report["operations"]["ok"]["errors"] == 0
+    assert report["operations"]["wrong_status"]["errors"] == report["operations"]["wrong_status"]["count"]
+    assert report["operations"]["wrong_status"]["error_statuses"] == {"200": report["operations"]["wrong_status"]["count"]}
+    assert report["total"]["count"] == 200
+    assert report["operations"]["ok"]["p50_ms"] <= report["operations"]["ok"]["p99_ms"]
+
+def operation_stats(p95: float, errors: int = 0, count: int = 100) -> dict:
+    return {"count": count, "errors": errors, "p50_ms": p95 / 2, "p95_ms": p95, "p99_ms": p95}
+
+def test_compare_flags_slower_tails_and_new_errors():
+    baseline = {"operations": {
+        "fast": operation_stats(10), "steady": operation_stats(10), "failing": operation_stats(10), "rare": operation_stats(10, count=5),
+    }}
+    current = {"operations": {
+        "fast": operation_stats(15), "steady": operation_stats(11), "failing": operation_stats(10, errors=3),
+        "rare": operation_stats(100, count=5), "new": operation_stats(100),
+    }}
+
+    regressions = compare(baseline, current, tolerance=0.2)
+    assert {(regression["operation"], regression["metric"]) for regression in regressions} == {
+        ("fast", "p95_ms"), ("fast", "p99_ms"), ("failing", "errors")
+    }
+    assert regressions[0]["operation"] == "failing"
+    assert compare(baseline, baseline) == []
+
+def test_mongo_standin_answers_the_app():
+    async def run():
+        database = InMemoryClient().user
+        assert await database.command("ping") == {"ok": 1}
+        await database["logs"].create_index("at", expireAfterSeconds=60)
+        await database["logs"].insert_many([{"kind": "audit"}] * 3, ordered=False)
+        return database["logs"]
+
+    logs = asyncio.run(run())
+    assert logs.inserted == 3 and logs.indexes == [("at", {"expireAfterSeconds": 60})]
@@ -0,0 +1,140 @@
+import asyncio
+from api.dependecies.models import Class, ClassPublic
+from api.dependecies.pagination import encode_cursor, paginate_rows
+from database.postgres.cache import CacheInvalidationListener, ReferenceCache
+
+class CountingSession:
+    """Answers every query with the same rows and counts the queries."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.queries = 0
+        self.statements = []
+
+    async def exec(self, statement):
+        self.queries += 1
+        self.statements.append(str(statement))
+        rows = self.rows
+        return type("Result", (), {"all": lambda self: rows})()
+
+def test_oversized_table_is_not_reloaded_on_every_call():
+    cache = ReferenceCache("class", Class, ClassPublic, ("name", "id"), max_rows=2)
+    oversized = [ClassPublic(id=i, name=f"c{i}") for i in range(3)]
+    session = CountingSession(oversized)
+
+    assert asyncio.run(cache.rows(session)) is None
+    assert asyncio.run(cache.rows(session)) is None
+    assert session.queries == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    # Lookups go straight to Postgres, without loading the table first
+    session.rows = [1]
+    assert asyncio.run(cache.existing_ids(session, [1])) == {1}
+    assert session.queries == 2
+
+    session.rows = oversized
+    cache.clear()
+    asyncio.run(cache.rows(session))
+    assert session.queries == 3
+
+def test_small_table_is_served_from_memory():
+    cache = ReferenceCache("class", Class, ClassPublic, ("name", "id"), max_rows=2)
+    # Kept in the order Postgres returned, which follows its collation rather than Python's
+    session = CountingSession([ClassPublic(id=2, name="b"), ClassPublic(id=1, name="a")])
+
+    assert [row.id for row in asyncio.run(cache.rows(session))] == [2, 1]
+    assert "ORDER BY class.name, class.id" in session.statements[0]
+    assert asyncio.run(cache.existing_ids(session, [1, 3])) == {1}
+    assert session.queries == 1
+    assert cache.stats()["rows"] == 2
+
+def test_cached_pages_follow_the_database_order():
+    rows = [ClassPublic(id=2, name="b"), ClassPublic(id=1, name="A"), ClassPublic(id=3, name="c")]
+    order = (Class.name, Class.id)
+    page, next_cursor = paginate_rows(rows, order, None, 2)
+    assert [row.id for row in page] == [2, 1]
+    page, next_cursor = paginate_rows(rows, order, next_cursor, 2)
+    assert [row.id for row in page] == [3] and next_cursor is None
+    # The cursor's row is gone from the cache; the page has to come from Postgres
+    assert paginate_rows(rows, order, encode_cursor(["gone", 9]), 2) is None
+
+class FakeDriverConnection:
+    def __init__(self):
+        self.on_terminate = None
+        self.alive = True
+
+    def add_termination_listener(self, callback):
+        self.on_terminate = callback
+
+    def remove_termination_listener(self, callback):
+        self.on_terminate = None
+
+    async def add_listener(self, channel, callback):
+        pass
+
+    async def remove_listener(self, channel, callback):
+        if not self.alive:
+            raise ConnectionError("connection is closed")
+
+    async def fetchval(self, query):
+        if not self.alive:
+            raise ConnectionError("connection is closed")
+        return 1
+
+class FakeConnection:
+    def __init__(self):
+        self.driver = FakeDriverConnection()
+        self.invalidated = False
+
+    async def get_raw_connection(self):
+        return type("Raw", (), {"driver_connection": self.driver})()
+
+    async def close(self):
+        pass
+
+    async def invalidate(self):
+        self.invalidated = True
+
+class FakeEngine:
+    def __init__(self):
+        self.connections = []
+
+    async def connect(self):
+        self.connections.append(FakeConnection())
+        return self.connections[-1]
+
+def _lose_connection(kill):
+    async def scenario():
+        cache = ReferenceCache("class", Class, ClassPublic, ("name", "id"))
+        await cache.rows(CountingSession([ClassPublic(id=1, name="a")]))
+        engine = FakeEngine()
+        listener = CacheInvalidationListener(engine, {"class": cache}, check_interval=0.01, retry_delay=0.01)
+        await listener.start()
+
+        kill(engine.connections[0].driver)
+        for _ in range(100):
+            if listener.reconnects:
+                break
+            await asyncio.sleep(0.01)
+        await listener.stop()
+        return cache, engine, listener
+
+    return asyncio.run(scenario())
+
+def test_listener_reconnects_after_termination():
+    def terminate(driver):
+        driver.alive = False
+        driver.on_terminate(driver)
+
+    cache, engine, listener = _lose_connection(terminate)
+    assert listener.reconnects == 1
+    assert len(engine.connections) == 2 and engine.connections[0].invalidated
+    assert cache.stats()["rows"] is None
+
+def test_listener_reconnects_after_silent_drop():
+    def drop(driver):
+        driver.alive = False
+
+    cache, engine, listener = _lose_connection(drop)
+    assert listener.reconnects == 1
+    assert cache.invalidations == 2
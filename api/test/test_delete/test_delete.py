@@ -0,0 +1,117 @@
+from fastapi.testclient import TestClient
+from sqlalchemy.exc import IntegrityError
+from api.main import app
+from api.test.helpers import unique, unique_class
+from api.routers.delete import _conflict
+
+client = TestClient(app)
+
+def _class_with_teacher():
+    subj = client.post("/subjects/", json={"name": unique("del_subj")}).json()
+    cls = client.post("/classes/", json={"name": unique_class()}).json()
+    teacher = client.post("/teachers/", json={
+        "first_name": "T", "last_name": "D", "email": f"{unique('del_t')}@test.com",
+        "age": 40, "subject_id": subj["id"], "class_id": cls["id"]
+    }).json()
+    return subj, cls, teacher
+
+def _schooler(class_id):
+    return client.post("/schoolers/", json={
+        "first_name": "S", "last_name": "D", "email": f"{unique('del_s')}@test.com", "age": 15, "class_id": class_id
+    }).json()
+
+def test_delete_class_with_teacher_conflicts():
+    _, cls, _ = _class_with_teacher()
+    response = client.delete(f"/delete/class/{cls['id']}")
+    assert response.status_code == 409
+
+def test_delete_teacher_cascades_to_assignments():
+    subj, cls, teacher = _class_with_teacher()
+    schooler = _schooler(cls["id"])
+    assignment = client.post("/assignments/", json={
+        "teacher_id": teacher["id"], "subject_id": subj["id"], "title": unique("del"),
+        "description": "Gone", "assign_type": "homework", "deadline": "2030-01-01"
+    }).json()
+    submission = client.post("/assignments/submit/", json={
+        "schooler_id": schooler["id"], "assignment_id": assignment["id"], "work": "Work"
+    }).json()
+    client.put(f"/give/garde/9/assignment/{submission['id']}")
+
+    response = client.delete(f"/delete/teacher/{teacher['id']}")
+    assert response.status_code == 200
+    assert client.get(f"/get/assignments/?teacher_id={teacher['id']}").json()["items"] == []
+    assert client.get(f"/get/submitted/assignments/{assignment['id']}/").status_code == 404
+    assert client.get(f"/stats/schooler/{schooler['id']}/averages").json()["subjects"] == []
+
+    # With the teacher gone the class goes too, schoolers included
+    assert client.delete(f"/delete/class/{cls['id']}").status_code == 200
+    assert client.get(f"/get/learners/list/schooler?class_id={cls['id']}").json()["items"] == []
+
+def test_bulk_delete_reports_missing_ids():
+    _, cls, _ = _class_with_teacher()
+    schoolers = [_schooler(cls["id"])["id"] for _ in range(3)]
+    response = client.request("DELETE", "/delete/bulk/schoolers", json=[*schoolers, schoolers[0], 999999999])
+    assert response.status_code == 200
+    assert response.json() == {"deleted": sorted(schoolers), "missing": [999999999]}
+
+def test_bulk_delete_unknown_entity():
+    response = client.request("DELETE", "/delete/bulk/planets", json=[1])
+    assert response.status_code == 422
+
+def test_deleted_class_is_hidden_and_its_name_reusable():
+    name = unique_class()
+    cls = client.post("/classes/", json={"name": name}).json()
+    schooler = _schooler(cls["id"])
+
+    assert client.delete(f"/delete/class/{cls['id']}").status_code == 200
+    assert client.get(f"/get/classes/?name={name}").json()["items"] == []
+    assert client.get(f"/get/learners/list/schooler?class_id={cls['id']}").json()["items"] == []
+    assert client.delete(f"/delete/class/{cls['id']}").json() == f"Class with id {cls['id']} not found."
+    # Rows under a deleted class can't be added before the purge removes it
+    assert client.post("/schoolers/", json={
+        "first_name": "S", "last_name": "D", "email": f"{unique('del_s')}@test.com", "age": 15, "class_id": cls["id"]
+    }).status_code == 400
+
+    again = client.post("/classes/", json={"name": name})
+    assert again.status_code == 201
+    assert again.json()["id"] != cls["id"]
+    assert schooler["id"] not in [row["id"] for row in client.get("/get/learners/list/schooler").json()["items"]]
+
+def test_deleted_subject_hides_its_assignments():
+    subj, _, teacher = _class_with_teacher()
+    other = client.post("/subjects/", json={"name": unique("del_subj")}).json()
+    assignment = client.post("/assignments/", json={
+        "teacher_id": teacher["id"], "subject_id": other["id"], "title": unique("del"),
+        "description": "Hidden", "assign_type": "homework", "deadline": "2030-01-01"
+    }).json()
+
+    assert client.delete(f"/delete/subject/{subj['id']}").status_code == 409
+    assert client.delete(f"/delete/subject/{other['id']}").status_code == 200
+    assert client.get(f"/get/assignments/?subject_id={other['id']}").json()["items"] == []
+    assert client.get(f"/get/submitted/assignments/{assignment['id']}/").status_code == 404
+
+def test_bulk_delete_soft_deletes_classes():
+    classes = [client.post("/classes/", json={"name": unique_class()}).json()["id"] for _ in range(2)]
+    response = client.request("DELETE", "/delete/bulk/classes", json=classes)
+    assert response.status_code == 200
+    assert response.json() == {"deleted": sorted(classes), "missing": []}
+    # Already deleted ones are reported missing the second time
+    assert client.request("DELETE", "/delete/bulk/classes", json=classes).json()["missing"] == classes
+
+class _DriverError(Exception):
+    def __init__(self, constraint_name):
+        self.constraint_name = constraint_name
+
+class _WrappedError(Exception):
+    def __init__(self, constraint_name, detail):
+        self.orig = _DriverError(constraint_name)
+        self.detail = detail
+
+def test_conflict_names_the_constraint():
+    taught = _conflict(IntegrityError("DELETE", {}, _WrappedError("teacher_class_id_fkey", "Key (id)=(1) is referenced")))
+    assert taught.status_code == 409
+    assert "teacher" in taught.detail
+
+    other = _conflict(IntegrityError("DELETE", {}, _WrappedError("audit_ref_fkey", "Key (id)=(1) is referenced")))
+    assert other.status_code == 409
+    assert other.detail == "Delete refused by constraint audit_ref_fkey: Key (id)=(1) is referenced"
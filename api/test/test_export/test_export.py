@@ -0,0 +1,35 @@
+import json
+from fastapi.testclient import TestClient
+from api.main import app
+from api.test.helpers import unique, unique_class
+
+client = TestClient(app)
+
+def test_export_schoolers_ndjson():
+    response = client.get("/export/schoolers?format=ndjson")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    for line in response.text.splitlines():
+        assert "email" in json.loads(line)
+
+def test_export_assignments_csv():
+    response = client.get("/export/assignments?format=csv")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    header = response.text.splitlines()[0]
+    assert header.startswith("teacher_id,subject_id,title")
+
+def test_export_unknown_entity():
+    response = client.get("/export/parents")
+    assert response.status_code == 422
+
+def test_export_hides_rows_of_deleted_class():
+    cls = client.post("/classes/", json={"name": unique_class()}).json()
+    schooler = client.post("/schoolers/", json={
+        "first_name": "S", "last_name": "E", "email": f"{unique('exp')}@test.com", "age": 15, "class_id": cls["id"]
+    }).json()
+    exported = lambda: [json.loads(line)["id"] for line in client.get("/export/schoolers").text.splitlines()]
+    assert schooler["id"] in exported()
+
+    assert client.delete(f"/delete/class/{cls['id']}").status_code == 200
+    assert schooler["id"] not in exported()
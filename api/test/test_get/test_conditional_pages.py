@@ -0,0 +1,61 @@
+import asyncio
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from fastapi import Request, Response
+from sqlmodel import select
+from api.dependecies.conditional import conditional_page
+from api.dependecies.models import Assignment
+
+class CountingSession:
+    """Answers every query with the same rows and counts the queries."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.queries = 0
+
+    async def exec(self, statement):
+        self.queries += 1
+        rows = self.rows
+        return type("Result", (), {"all": lambda self: rows})()
+
+def _request(headers=None):
+    raw = [(name.lower().encode(), value.encode()) for name, value in (headers or {}).items()]
+    return Request({"type": "http", "method": "GET", "path": "/get/assignments/", "query_string": b"limit=2", "headers": raw})
+
+def _page(session, request, response):
+    order = (Assignment.added, Assignment.id)
+    return asyncio.run(conditional_page(
+        request, response, session, select(Assignment).where(Assignment.id > 0), order, None, 2, Assignment.changed
+    ))
+
+ROWS = [
+    SimpleNamespace(id=i, added=datetime(2026, 1, i, tzinfo=timezone.utc), changed=datetime(2026, 2, i, tzinfo=timezone.utc))
+    for i in (1, 2, 3)
+]
+
+def test_plain_get_runs_only_the_page_query():
+    session, response = CountingSession(ROWS), Response()
+    rows, next_cursor = _page(session, _request(), response)
+    assert session.queries == 1
+    assert rows == ROWS[:2] and next_cursor is not None
+    assert response.headers["ETag"].startswith('W/"')
+
+def test_unchanged_poll_is_answered_from_the_key_window():
+    first = Response()
+    _page(CountingSession(ROWS), _request(), first)
+
+    session = CountingSession(ROWS)
+    answer = _page(session, _request({"If-None-Match": first.headers["ETag"]}), Response())
+    assert answer.status_code == 304
+    assert session.queries == 1
+
+def test_changed_poll_fetches_the_page():
+    first = Response()
+    _page(CountingSession(ROWS), _request(), first)
+
+    edited = [ROWS[0], SimpleNamespace(**{**vars(ROWS[1]), "changed": datetime(2026, 3, 1, tzinfo=timezone.utc)}), ROWS[2]]
+    session, response = CountingSession(edited), Response()
+    rows, _ = _page(session, _request({"If-None-Match": first.headers["ETag"]}), response)
+    assert rows == edited[:2]
+    assert session.queries == 2
+    assert response.headers["ETag"] != first.headers["ETag"]
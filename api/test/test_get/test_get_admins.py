@@ -1,3 +1,4 @@
+import uuid
 from fastapi.testclient import TestClient
 from api.main import app
 
@@ -6,4 +7,13 @@ client = TestClient(app)
 def test_get_admins():
     response = client.get("/get/admins/")
     assert response.status_code == 200
-    assert isinstance(response.json(), list)
\ No newline at end of file
+    assert isinstance(response.json()["items"], list)
+
+def test_get_admins_by_full_name():
+    last_name = f"Admin{uuid.uuid4().hex[:8]}"
+    client.post("/admins/", json={
+        "first_name": "Full", "last_name": last_name, "email": f"{last_name}@test.com", "age": 40
+    })
+    response = client.get("/get/admins/", params={"name": f"Full {last_name}"})
+    assert response.status_code == 200
+    assert [admin["last_name"] for admin in response.json()["items"]] == [last_name]
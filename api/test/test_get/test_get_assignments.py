@@ -6,4 +6,28 @@ client = TestClient(app)
 def test_get_assignments():
     response = client.get("/get/assignments/")
     assert response.status_code == 200
-    assert isinstance(response.json(), list)
+    assert isinstance(response.json()["items"], list)
+
+def test_get_assignments_not_modified():
+    first = client.get("/get/assignments/")
+    etag = first.headers["etag"]
+    assert etag.startswith('W/"')
+    response = client.get("/get/assignments/", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+
+def test_get_assignments_etag_depends_on_query():
+    first = client.get("/get/assignments/?limit=1")
+    second = client.get("/get/assignments/?limit=2", headers={"If-None-Match": first.headers["etag"]})
+    assert second.status_code == 200
+
+def test_get_assignments_sparse_fields():
+    response = client.get("/get/assignments/?fields=id,title")
+    assert response.status_code == 200
+    for item in response.json()["items"]:
+        assert set(item) == {"id", "title"}
+
+def test_get_assignments_sparse_fields_not_modified():
+    first = client.get("/get/assignments/?fields=id,title")
+    second = client.get("/get/assignments/?fields=id,title", headers={"If-None-Match": first.headers["ETag"]})
+    assert second.status_code == 304
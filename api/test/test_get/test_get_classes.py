@@ -6,4 +6,23 @@ client = TestClient(app)
 def test_get_classes():
     response = client.get("/get/classes/")
     assert response.status_code == 200
-    assert isinstance(response.json(), list)
+    assert isinstance(response.json()["items"], list)
+
+def test_get_classes_cursor_pagination():
+    first = client.get("/get/classes/?limit=1")
+    assert first.status_code == 200
+    body = first.json()
+    assert len(body["items"]) <= 1
+    if body["next_cursor"] is not None:
+        second = client.get(f"/get/classes/?limit=1&cursor={body['next_cursor']}")
+        assert second.status_code == 200
+        assert second.json()["items"][0]["id"] != body["items"][0]["id"]
+
+def test_get_classes_invalid_cursor():
+    response = client.get("/get/classes/?cursor=not-a-cursor")
+    assert response.status_code == 400
+
+def test_get_classes_not_modified():
+    first = client.get("/get/classes/")
+    response = client.get("/get/classes/", headers={"If-None-Match": first.headers["etag"]})
+    assert response.status_code == 304
@@ -6,9 +6,25 @@ client = TestClient(app)
 def test_get_learners_list_schooler():
     response = client.get("/get/learners/list/schooler")
     assert response.status_code == 200
-    assert isinstance(response.json(), list)
+    assert isinstance(response.json()["items"], list)
 
 def test_get_learners_list_teacher():
     response = client.get("/get/learners/list/teacher")
     assert response.status_code == 200
-    assert isinstance(response.json(), list)
+    assert isinstance(response.json()["items"], list)
+
+def test_get_learners_sparse_fields():
+    response = client.get("/get/learners/list/schooler?fields=id,first_name,last_name&limit=5")
+    assert response.status_code == 200
+    for item in response.json()["items"]:
+        assert set(item) == {"id", "first_name", "last_name"}
+
+def test_get_learners_sparse_fields_paginate():
+    first = client.get("/get/learners/list/teacher?fields=id&limit=1").json()
+    if first["next_cursor"] is not None:
+        second = client.get(f"/get/learners/list/teacher?fields=id&limit=1&cursor={first['next_cursor']}").json()
+        assert second["items"][0]["id"] != first["items"][0]["id"]
+
+def test_get_learners_unknown_field():
+    response = client.get("/get/learners/list/schooler?fields=id,password")
+    assert response.status_code == 422
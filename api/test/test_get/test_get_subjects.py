@@ -6,4 +6,4 @@ client = TestClient(app)
 def test_get_subjects():
     response = client.get("/get/subjects/")
     assert response.status_code == 200
-    assert isinstance(response.json(), list)
+    assert isinstance(response.json()["items"], list)
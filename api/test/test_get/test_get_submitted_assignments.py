@@ -1,5 +1,10 @@
+import hashlib
 from fastapi.testclient import TestClient
+from sqlmodel import select
 from api.main import app
+from api.test.helpers import unique, unique_class
+from api.dependecies.models import SubmittedAssignment, SUBMISSION_MAX_LENGTH
+from database.postgres.work_storage import SUBMISSION_INLINE_LIMIT
 
 client = TestClient(app)
 
@@ -7,6 +12,84 @@ def test_get_submitted_assignments():
     # Using assignment id 1 as example, handed_late True
     response = client.get("/get/submitted/assignments/1/?handed_late=true")
     assert response.status_code in (200, 404)  # Accept 404 if no data
-    # If 200, should be a dict
+    # If 200, should be a roster page
     if response.status_code == 200:
         assert isinstance(response.json(), dict)
+        for entry in response.json()["items"]:
+            assert entry["submission"]["schooler_id"] == entry["schooler"]["id"]
+
+def test_get_submitted_assignments_excludes_late():
+    response = client.get("/get/submitted/assignments/1/?handed_late=false")
+    assert response.status_code in (200, 404)
+    if response.status_code == 200:
+        assert all(not entry["late"] for entry in response.json()["items"])
+
+def test_get_submitted_assignments_missing_assignment():
+    response = client.get("/get/submitted/assignments/999999999/")
+    assert response.status_code == 404
+
+def _submission(work):
+    subj = client.post("/subjects/", json={"name": unique("work_subj")}).json()
+    cls = client.post("/classes/", json={"name": unique_class()}).json()
+    teacher = client.post("/teachers/", json={
+        "first_name": "T", "last_name": "W", "email": f"{unique('work_t')}@test.com",
+        "age": 40, "subject_id": subj["id"], "class_id": cls["id"]
+    }).json()
+    schooler = client.post("/schoolers/", json={
+        "first_name": "S", "last_name": "W", "email": f"{unique('work_s')}@test.com", "age": 15, "class_id": cls["id"]
+    }).json()
+    assignment = client.post("/assignments/", json={
+        "teacher_id": teacher["id"], "subject_id": subj["id"], "title": unique("work"),
+        "description": "Essay", "assign_type": "essay", "deadline": "2030-01-01"
+    }).json()
+    submission = client.post("/assignments/submit/", json={
+        "schooler_id": schooler["id"], "assignment_id": assignment["id"], "work": work
+    }).json()
+    return assignment, submission, schooler
+
+def test_roster_lists_work_size_and_hash_without_body():
+    work = "short essay"
+    assignment, submission, _ = _submission(work)
+    response = client.get(f"/get/submitted/assignments/{assignment['id']}/")
+    assert response.status_code == 200
+    entry = response.json()["items"][0]["submission"]
+    assert "work" not in entry
+    assert entry["work_size"] == len(work)
+    assert entry["work_hash"] == hashlib.sha256(work.encode()).hexdigest()
+
+def test_long_work_is_streamed_back_intact():
+    work = "Photosynthesis żywi rośliny. " * (SUBMISSION_INLINE_LIMIT // 10)
+    _, submission, _ = _submission(work)
+    assert submission["work"] == work
+    assert submission["work_size"] == len(work.encode())
+
+    response = client.get(f"/get/submitted/assignment/{submission['id']}/work")
+    assert response.status_code == 200
+    assert response.text == work
+    assert response.headers["ETag"] == f'"{hashlib.sha256(work.encode()).hexdigest()}"'
+
+    revalidated = client.get(
+        f"/get/submitted/assignment/{submission['id']}/work", headers={"If-None-Match": response.headers["ETag"]}
+    )
+    assert revalidated.status_code == 304
+
+def test_updated_work_moves_between_storages():
+    long_work = "x" * (SUBMISSION_INLINE_LIMIT + 1)
+    assignment, submission, schooler = _submission(long_work)
+    client.put(f"/update/submitted/assignment/{assignment['id']}/{schooler['id']}/work/short")
+    assert client.get(f"/get/submitted/assignment/{submission['id']}/work").text == "short"
+
+def test_work_over_the_length_cap_is_refused():
+    response = client.post("/assignments/submit/", json={
+        "schooler_id": 1, "assignment_id": 1, "work": "x" * (SUBMISSION_MAX_LENGTH + 1)
+    })
+    assert response.status_code == 422
+
+def test_work_of_missing_submission():
+    response = client.get("/get/submitted/assignment/999999999/work")
+    assert response.status_code == 404
+
+def test_loading_a_submission_leaves_the_body_out():
+    selected = str(select(SubmittedAssignment).compile()).split("FROM")[0]
+    assert "submittedassignment.work," not in selected
+    assert "submittedassignment.work_hash" in selected
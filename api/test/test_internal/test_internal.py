@@ -0,0 +1,34 @@
+import uuid
+from fastapi.testclient import TestClient
+from api.main import app
+
+client = TestClient(app)
+
+def test_get_pool_status():
+    response = client.get("/internal/pool")
+    assert response.status_code == 200
+    body = response.json()
+    assert "checked_out" in body
+    assert "idle" in body
+    assert "wait_max_ms" in body
+
+def test_get_cache_status():
+    client.get("/get/classes/")
+    client.get("/get/classes/")
+    response = client.get("/internal/cache")
+    assert response.status_code == 200
+    caches = {cache["name"]: cache for cache in response.json()}
+    assert caches["class"]["hits"] + caches["class"]["misses"] >= 2
+
+def test_get_audit_status_counts_mutations():
+    before = client.get("/internal/audit").json()
+    client.post("/subjects/", json={"name": f"audit_{uuid.uuid4().hex[:8]}"})
+    after = client.get("/internal/audit").json()
+    recorded = lambda status: status["queued"] + status["written"] + status["dropped"] + status["failed"]
+    assert recorded(after) == recorded(before) + 1
+
+def test_get_purge_status():
+    response = client.get("/internal/purge")
+    assert response.status_code == 200
+    body = response.json()
+    assert {"running", "purged", "deleted_rows", "failed"} <= body.keys()
@@ -0,0 +1,48 @@
+import gzip
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+from api.middleware.compression import CompressionMiddleware, choose_encoding
+
+app = FastAPI()
+app.add_middleware(CompressionMiddleware, minimum_size=100)
+
+@app.get("/small")
+async def small():
+    return PlainTextResponse("tiny")
+
+@app.get("/large")
+async def large():
+    return PlainTextResponse("x" * 5000)
+
+@app.get("/stream")
+async def stream():
+    async def chunks():
+        for _ in range(3):
+            yield "y" * 1000
+    return StreamingResponse(chunks(), media_type="text/plain")
+
+client = TestClient(app)
+
+def test_choose_encoding():
+    assert choose_encoding("gzip") == "gzip"
+    assert choose_encoding("identity") is None
+    assert choose_encoding("gzip;q=0") is None
+    assert choose_encoding("") is None
+
+def test_small_response_not_compressed():
+    response = client.get("/small", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+    assert response.text == "tiny"
+
+def test_large_response_gzip():
+    response = client.get("/large", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert response.text == "x" * 5000
+
+def test_streamed_response_gzip():
+    with client.stream("GET", "/stream", headers={"Accept-Encoding": "gzip"}) as response:
+        raw = b"".join(response.iter_raw())
+    assert response.headers["content-encoding"] == "gzip"
+    assert gzip.decompress(raw) == b"y" * 3000
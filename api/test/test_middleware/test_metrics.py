@@ -0,0 +1,49 @@
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
+from fastapi.testclient import TestClient
+from api.middleware.metrics import MetricsMiddleware, RouteMetrics, CONTENT_TYPE
+
+metrics = RouteMetrics()
+
+app = FastAPI()
+app.add_middleware(MetricsMiddleware, metrics=metrics)
+
+@app.get("/items/{item_id}")
+async def item(item_id: int):
+    return PlainTextResponse("x" * 300)
+
+@app.get("/sized")
+async def sized():
+    return PlainTextResponse("x" * 2000)
+
+@app.get("/metrics")
+async def get_metrics():
+    return PlainTextResponse(metrics.render(), media_type=CONTENT_TYPE)
+
+client = TestClient(app)
+
+def test_requests_are_grouped_by_route_template():
+    for item_id in (1, 2, 3):
+        client.get(f"/items/{item_id}")
+    client.get("/items/not-a-number")
+    body = client.get("/metrics").text
+    assert 'http_requests_total{method="GET",route="/items/{item_id}",status="200"} 3' in body
+    assert 'http_requests_total{method="GET",route="/items/{item_id}",status="422"} 1' in body
+    assert 'http_request_duration_seconds_count{method="GET",route="/items/{item_id}"} 4' in body
+
+def test_response_size_histogram():
+    client.get("/sized")
+    body = client.get("/metrics").text
+    assert 'http_response_size_bytes_bucket{method="GET",route="/sized",le="1024"} 0' in body
+    assert 'http_response_size_bytes_bucket{method="GET",route="/sized",le="4096"} 1' in body
+    assert 'http_response_size_bytes_sum{method="GET",route="/sized"} 2000' in body
+
+def test_unknown_paths_share_one_label():
+    client.get("/nope/1")
+    client.get("/nope/2")
+    assert 'route="<unmatched>",status="404"} 2' in client.get("/metrics").text
+
+def test_in_flight_returns_to_zero():
+    client.get("/items/1")
+    assert 'http_requests_in_flight{method="GET"} 1' in client.get("/metrics").text
+    assert metrics.in_flight["GET"] == 0
@@ -0,0 +1,41 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
+from fastapi.testclient import TestClient
+from api.middleware.queries import QueryStatsMiddleware
+from database.postgres.instrumentation import NPlusOneError, current_query_stats, normalize_sql, track_queries
+
+app = FastAPI()
+app.add_middleware(QueryStatsMiddleware, n_plus_one_limit=0)
+
+@app.get("/two-queries")
+async def two_queries():
+    # What the engine hooks do for every statement
+    stats = current_query_stats.get()
+    for statement in ("SELECT 1", "SELECT 2"):
+        stats.before(statement)
+        stats.after(statement, 0.002)
+    return PlainTextResponse("ok")
+
+client = TestClient(app)
+
+def test_query_headers():
+    response = client.get("/two-queries")
+    assert response.headers["X-Query-Count"] == "2"
+    assert response.headers["X-Query-Time-Ms"] == "4.000"
+    assert response.headers["X-Query-Slowest-Ms"] == "2.000"
+
+def test_normalize_sql_collapses_values():
+    assert normalize_sql("SELECT * FROM t WHERE id IN ($1::INTEGER, $2::INTEGER) AND name = 'x'") == (
+        "SELECT * FROM t WHERE id IN (?, ...) AND name = ?"
+    )
+    assert normalize_sql("INSERT INTO t (a, b) VALUES ($1, $2), ($3, $4)") == "INSERT INTO t (a, b) VALUES (?, ...), ..."
+    assert normalize_sql("SELECT anon_1.id FROM anon_1 LIMIT $1") == "SELECT anon_1.id FROM anon_1 LIMIT ?"
+
+def test_n_plus_one_raises_on_repeated_statement():
+    with track_queries(n_plus_one_limit=3) as stats:
+        for schooler_id in (1, 2):
+            stats.before(f"SELECT * FROM schooler WHERE id = {schooler_id}")
+        with pytest.raises(NPlusOneError):
+            stats.before("SELECT * FROM schooler WHERE id = 3")
+    assert current_query_stats.get() is None
@@ -5,6 +5,7 @@ Covers: Admin, Teacher, Schooler, Subject, Class, Assignment, SubmittedAssignmen
 import pytest
 from fastapi.testclient import TestClient
 from api.main import app
+from api.test.helpers import unique_class
 
 client = TestClient(app)
 
@@ -125,3 +126,62 @@ def test_submit_assignment():
     response = client.post("/assignments/submit/", json=data)
     assert response.status_code == 201
     assert response.json()["work"] == data["work"]
+
+def test_create_schoolers_bulk():
+    cls = client.post("/classes/", json={"name": unique_class()}).json()
+    email = unique_email("bulk_schooler")
+    data = [
+        {"first_name": "Bulk", "last_name": "One", "email": email, "age": 15, "class_id": cls["id"]},
+        {"first_name": "Bulk", "last_name": "Dup", "email": email, "age": 15, "class_id": cls["id"]},
+        {"first_name": "Bulk", "last_name": "Bad", "email": unique_email("bulk_bad"), "age": 15, "class_id": -1},
+    ]
+    response = client.post("/schoolers/bulk", json=data)
+    assert response.status_code == 200
+    body = response.json()
+    assert [item["status"] for item in body["items"]] == ["created", "conflict", "invalid"]
+    assert body["created"] == 1
+    assert body["items"][0]["id"] is not None
+
+def test_create_subjects_bulk_conflict():
+    name = f"Subject_{unique_email('bulk_subj')}"
+    client.post("/subjects/", json={"name": name})
+    response = client.post("/subjects/bulk", json=[{"name": name}, {"name": f"{name}_new"}])
+    assert response.status_code == 200
+    assert [item["status"] for item in response.json()["items"]] == ["conflict", "created"]
+
+def test_import_schoolers_csv():
+    cls = client.post("/classes/", json={"name": unique_class()}).json()
+    email = unique_email("csv_schooler")
+    rows = [
+        "first_name,last_name,email,age,class_id",
+        f"Csv,One,{email},16,{cls['id']}",
+        f"Csv,Dup,{email},16,{cls['id']}",
+        f"Csv,Bad,not-an-email,16,{cls['id']}",
+    ]
+    files = {"file": ("roster.csv", "\n".join(rows), "text/csv")}
+    response = client.post("/import/schooler/csv", files=files)
+    assert response.status_code == 200
+    report = response.json()
+    assert report["received"] == 3
+    assert report["inserted"] == 1
+    assert [error["line"] for error in report["errors"]] == [3, 4]
+
+def test_create_class_duplicate():
+    data = {"name": unique_class()}
+    assert client.post("/classes/", json=data).status_code == 201
+    response = client.post("/classes/", json=data)
+    assert response.status_code == 409
+
+def test_create_assignment_duplicate():
+    subj = client.post("/subjects/", json={"name": f"Subj_{unique_email('dup_asgn')}"}).json()
+    cls = client.post("/classes/", json={"name": unique_class()}).json()
+    teacher = client.post("/teachers/", json={
+        "first_name": "T", "last_name": "D", "email": unique_email("dup_asgn_teacher"), "age": 35,
+        "subject_id": subj["id"], "class_id": cls["id"]
+    }).json()
+    data = {
+        "teacher_id": teacher["id"], "subject_id": subj["id"], "title": f"Assignment {unique_email('dup_asgn')}",
+        "description": "Test assignment", "assign_type": "homework", "deadline": "2030-01-01"
+    }
+    assert client.post("/assignments/", json=data).status_code == 201
+    assert client.post("/assignments/", json=data).status_code == 409
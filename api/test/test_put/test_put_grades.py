@@ -0,0 +1,63 @@
+from fastapi.testclient import TestClient
+from api.main import app
+from api.test.helpers import unique, unique_class
+
+client = TestClient(app)
+
+def _submissions(count):
+    subj = client.post("/subjects/", json={"name": unique("grade_subj")}).json()
+    cls = client.post("/classes/", json={"name": unique_class()}).json()
+    teacher = client.post("/teachers/", json={
+        "first_name": "T", "last_name": "G", "email": f"{unique('grade_t')}@test.com",
+        "age": 40, "subject_id": subj["id"], "class_id": cls["id"]
+    }).json()
+    assignment = client.post("/assignments/", json={
+        "teacher_id": teacher["id"], "subject_id": subj["id"], "title": unique("grades"),
+        "description": "Grades", "assign_type": "homework", "deadline": "2030-01-01"
+    }).json()
+    submissions = []
+    for _ in range(count):
+        schooler = client.post("/schoolers/", json={
+            "first_name": "S", "last_name": "G", "email": f"{unique('grade_s')}@test.com",
+            "age": 15, "class_id": cls["id"]
+        }).json()
+        submissions.append(client.post("/assignments/submit/", json={
+            "schooler_id": schooler["id"], "assignment_id": assignment["id"], "work": "Work"
+        }).json())
+    return assignment, submissions
+
+def test_give_grades_bulk():
+    assignment, submissions = _submissions(3)
+    grades = [{"submitted_assignment_id": s["id"], "grade": grade} for s, grade in zip(submissions, (6, 8, 10))]
+    response = client.put("/grades/bulk", json=grades + [{"submitted_assignment_id": 999999999, "grade": 5}])
+    assert response.status_code == 200
+    assert response.json() == {"updated": 3, "missing": [999999999]}
+
+    stats = client.get(f"/stats/assignment/{assignment['id']}").json()
+    assert stats["graded"] == 3
+    assert stats["mean"] == 8
+
+def test_give_grades_bulk_updates_averages():
+    assignment, submissions = _submissions(1)
+    submission = submissions[0]
+    client.put("/grades/bulk", json=[{"submitted_assignment_id": submission["id"], "grade": 4}])
+    client.put("/grades/bulk", json=[{"submitted_assignment_id": submission["id"], "grade": 10}])
+    averages = client.get(f"/stats/schooler/{submission['schooler_id']}/averages").json()
+    assert averages["subjects"] == [
+        {"subject_id": assignment["subject_id"], "graded": 1, "mean": 10.0, "stddev": 0.0}
+    ]
+
+def test_give_grades_bulk_keeps_the_hand_in_time():
+    assignment, submissions = _submissions(1)
+    submission = submissions[0]
+    client.put("/grades/bulk", json=[{"submitted_assignment_id": submission["id"], "grade": 7}])
+    roster = client.get(f"/get/submitted/assignments/{assignment['id']}/").json()["items"]
+    assert roster[0]["submission"]["submitted"] == submission["submitted"]
+    assert roster[0]["submission"]["grade"] == 7
+
+def test_give_grades_bulk_rejects_invalid_items():
+    assert client.put("/grades/bulk", json=[{"submitted_assignment_id": "x"}]).status_code == 422
+
+def test_give_grades_bulk_rejects_grades_out_of_range():
+    for grade in (0, 13, -5):
+        assert client.put("/grades/bulk", json=[{"submitted_assignment_id": 1, "grade": grade}]).status_code == 422
@@ -0,0 +1,23 @@
+import pytest
+from fastapi.testclient import TestClient
+from api.main import app
+
+client = TestClient(app)
+
+# Most queries each endpoint may run for one page; keeps N+1 regressions out
+BUDGETS = [
+    ("/get/learners/list/schooler", 1),
+    ("/get/learners/list/teacher", 1),
+    ("/get/assignments/", 1),
+    ("/get/admins/", 1),
+    ("/get/classes/", 1),
+    ("/get/subjects/", 1),
+    ("/search/people?q=smith", 1),
+    ("/stats/schooler/1/averages", 2),
+]
+
+@pytest.mark.parametrize("path, budget", BUDGETS)
+def test_query_budget(path, budget):
+    response = client.get(path)
+    assert response.status_code in (200, 404)
+    assert int(response.headers["X-Query-Count"]) <= budget
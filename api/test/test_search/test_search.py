@@ -0,0 +1,81 @@
+import uuid
+from fastapi.testclient import TestClient
+from api.main import app
+from api.test.helpers import unique, unique_class
+
+client = TestClient(app)
+
+def _assignment_with_submission(word):
+    subj = client.post("/subjects/", json={"name": unique("search_subj")}).json()
+    cls = client.post("/classes/", json={"name": unique_class()}).json()
+    teacher = client.post("/teachers/", json={
+        "first_name": "T", "last_name": "Search", "email": f"{unique('search_t')}@test.com",
+        "age": 40, "subject_id": subj["id"], "class_id": cls["id"]
+    }).json()
+    assignment = client.post("/assignments/", json={
+        "teacher_id": teacher["id"], "subject_id": subj["id"], "title": f"Essay on {word}",
+        "description": f"Describe the {word} in your own words", "assign_type": "homework", "deadline": "2030-01-01"
+    }).json()
+    schooler = client.post("/schoolers/", json={
+        "first_name": "S", "last_name": "Search", "email": f"{unique('search_s')}@test.com",
+        "age": 15, "class_id": cls["id"]
+    }).json()
+    submission = client.post("/assignments/submit/", json={
+        "schooler_id": schooler["id"], "assignment_id": assignment["id"], "work": f"The {word} was fascinating"
+    }).json()
+    return cls, assignment, submission
+
+def test_search_assignments():
+    word = unique("volcano")
+    cls, assignment, _ = _assignment_with_submission(word)
+    response = client.get("/search/assignments", params={"q": word, "class_id": cls["id"]})
+    assert response.status_code == 200
+    items = response.json()["items"]
+    assert [item["id"] for item in items] == [assignment["id"]]
+    assert "<mark>" in items[0]["snippet"]
+
+def test_search_submissions_paginates():
+    word = unique("glacier")
+    first = _assignment_with_submission(word)[2]
+    second = _assignment_with_submission(word)[2]
+    page = client.get("/search/submissions", params={"q": word, "limit": 1}).json()
+    assert len(page["items"]) == 1
+    rest = client.get("/search/submissions", params={"q": word, "limit": 1, "cursor": page["next_cursor"]}).json()
+    assert {page["items"][0]["id"], rest["items"][0]["id"]} == {first["id"], second["id"]}
+
+def test_search_requires_query():
+    assert client.get("/search/submissions").status_code == 422
+
+def test_lookup_people_tolerates_typos():
+    last_name = f"Kowalczyk{uuid.uuid4().hex[:4]}"
+    admin = client.post("/admins/", json={
+        "first_name": "Bartholomew", "last_name": last_name, "email": f"{unique('lookup')}@test.com", "age": 40
+    }).json()
+    response = client.get("/search/people", params={"q": "Bartholomw", "kind": "admin", "limit": 20})
+    assert response.status_code == 200
+    assert admin["admin_id"] in [match["id"] for match in response.json() if match["kind"] == "admin"]
+
+def test_lookup_people_requires_two_characters():
+    assert client.get("/search/people", params={"q": "a"}).status_code == 422
+
+def test_search_hides_rows_of_deleted_class():
+    word = unique("lagoon")
+    _, assignment, _ = _assignment_with_submission(word)
+    untaught = client.post("/classes/", json={"name": unique_class()}).json()
+    last_name = unique("Hiddenname")
+    schooler = client.post("/schoolers/", json={
+        "first_name": "S", "last_name": last_name, "email": f"{unique('search_s')}@test.com",
+        "age": 15, "class_id": untaught["id"]
+    }).json()
+    submission = client.post("/assignments/submit/", json={
+        "schooler_id": schooler["id"], "assignment_id": assignment["id"], "work": f"Another {word} story"
+    }).json()
+    found = lambda: [item["id"] for item in client.get("/search/submissions", params={"q": word}).json()["items"]]
+    people = lambda: [match["id"] for match in client.get("/search/people", params={"q": last_name, "kind": "schooler"}).json()]
+    assert submission["id"] in found()
+    assert schooler["id"] in people()
+
+    assert client.delete(f"/delete/class/{untaught['id']}").status_code == 200
+    assert submission["id"] not in found()
+    assert len(found()) == 1
+    assert schooler["id"] not in people()
@@ -0,0 +1,127 @@
+from fastapi.testclient import TestClient
+from api.main import app
+from api.test.helpers import unique, unique_class
+
+client = TestClient(app)
+
+def _graded_assignment():
+    subj = client.post("/subjects/", json={"name": unique("stats_subj")}).json()
+    cls = client.post("/classes/", json={"name": unique_class()}).json()
+    teacher = client.post("/teachers/", json={
+        "first_name": "T", "last_name": "S", "email": f"{unique('stats_t')}@test.com",
+        "age": 40, "subject_id": subj["id"], "class_id": cls["id"]
+    }).json()
+    assignment = client.post("/assignments/", json={
+        "teacher_id": teacher["id"], "subject_id": subj["id"], "title": unique("stats"),
+        "description": "Stats", "assign_type": "homework", "deadline": "2030-01-01"
+    }).json()
+    for grade in (6, 8, 10):
+        schooler = client.post("/schoolers/", json={
+            "first_name": "S", "last_name": "S", "email": f"{unique('stats_s')}@test.com",
+            "age": 15, "class_id": cls["id"]
+        }).json()
+        submission = client.post("/assignments/submit/", json={
+            "schooler_id": schooler["id"], "assignment_id": assignment["id"], "work": "Work"
+        }).json()
+        client.put(f"/give/garde/{grade}/assignment/{submission['id']}")
+    return cls, assignment
+
+def test_assignment_stats():
+    cls, assignment = _graded_assignment()
+    response = client.get(f"/stats/assignment/{assignment['id']}")
+    assert response.status_code == 200
+    stats = response.json()
+    assert stats["graded"] == 3
+    assert stats["mean"] == 8
+    assert stats["median"] == 8
+    assert stats["histogram"] == {"6": 1, "8": 1, "10": 1}
+    assert stats["submission_rate"] == 1
+    assert stats["late_rate"] == 0
+
+def test_class_stats():
+    cls, _ = _graded_assignment()
+    response = client.get(f"/stats/class/{cls['id']}")
+    assert response.status_code == 200
+    assert response.json()["submissions"] == 3
+
+def test_stats_not_found():
+    assert client.get("/stats/schooler/999999999").status_code == 404
+
+def test_schooler_averages_follow_grade_changes():
+    cls, assignment = _graded_assignment()
+    schooler = client.post("/schoolers/", json={
+        "first_name": "S", "last_name": "S", "email": f"{unique('stats_avg')}@test.com",
+        "age": 15, "class_id": cls["id"]
+    }).json()
+    submission = client.post("/assignments/submit/", json={
+        "schooler_id": schooler["id"], "assignment_id": assignment["id"], "work": "Work"
+    }).json()
+    client.put(f"/give/garde/6/assignment/{submission['id']}")
+    client.put(f"/give/garde/9/assignment/{submission['id']}")
+    averages = client.get(f"/stats/schooler/{schooler['id']}/averages").json()
+    assert averages["subjects"] == [
+        {"subject_id": assignment["subject_id"], "graded": 1, "mean": 9.0, "stddev": 0.0}
+    ]
+
+    client.delete(f"/delete/submmited/assignment/{submission['id']}")
+    averages = client.get(f"/stats/schooler/{schooler['id']}/averages").json()
+    assert averages["subjects"] == []
+
+def test_schooler_averages_not_found():
+    assert client.get("/stats/schooler/999999999/averages").status_code == 404
+
+def _teacher():
+    subj = client.post("/subjects/", json={"name": unique("stats_subj")}).json()
+    cls = client.post("/classes/", json={"name": unique_class()}).json()
+    teacher = client.post("/teachers/", json={
+        "first_name": "T", "last_name": "S", "email": f"{unique('stats_t')}@test.com",
+        "age": 40, "subject_id": subj["id"], "class_id": cls["id"]
+    }).json()
+    return subj, cls, teacher
+
+def _assignment(teacher_id, subject_id):
+    return client.post("/assignments/", json={
+        "teacher_id": teacher_id, "subject_id": subject_id, "title": unique("stats"),
+        "description": "Stats", "assign_type": "homework", "deadline": "2030-01-01"
+    }).json()
+
+def _submit(class_id, assignment_id):
+    schooler = client.post("/schoolers/", json={
+        "first_name": "S", "last_name": "S", "email": f"{unique('stats_s')}@test.com",
+        "age": 15, "class_id": class_id
+    }).json()
+    client.post("/assignments/submit/", json={"schooler_id": schooler["id"], "assignment_id": assignment_id, "work": "Work"})
+    return schooler
+
+def test_assignment_stats_of_deleted_subject_not_found():
+    _, _, teacher = _teacher()
+    other = client.post("/subjects/", json={"name": unique("stats_subj")}).json()
+    assignment = _assignment(teacher["id"], other["id"])
+    assert client.delete(f"/delete/subject/{other['id']}").status_code == 200
+    assert client.get(f"/stats/assignment/{assignment['id']}").status_code == 404
+
+def test_schooler_stats_of_deleted_class_not_found():
+    subj, cls, teacher = _teacher()
+    assignment = _assignment(teacher["id"], subj["id"])
+    _submit(cls["id"], assignment["id"])
+    untaught = client.post("/classes/", json={"name": unique_class()}).json()
+    schooler = _submit(untaught["id"], assignment["id"])
+    assert client.get(f"/stats/assignment/{assignment['id']}").json()["submissions"] == 2
+
+    assert client.delete(f"/delete/class/{untaught['id']}").status_code == 200
+    assert client.get(f"/stats/schooler/{schooler['id']}").status_code == 404
+    assert client.get(f"/stats/schooler/{schooler['id']}/averages").status_code == 404
+    assert client.get(f"/stats/assignment/{assignment['id']}").json()["submissions"] == 1
+
+def test_class_stats_skip_deleted_subjects():
+    subj, cls, teacher = _teacher()
+    other = client.post("/subjects/", json={"name": unique("stats_subj")}).json()
+    kept, dropped = _assignment(teacher["id"], subj["id"]), _assignment(teacher["id"], other["id"])
+    schooler = _submit(cls["id"], kept["id"])
+    client.post("/assignments/submit/", json={"schooler_id": schooler["id"], "assignment_id": dropped["id"], "work": "Work"})
+
+    assert client.delete(f"/delete/subject/{other['id']}").status_code == 200
+    stats = client.get(f"/stats/class/{cls['id']}").json()
+    assert stats["submissions"] == 1
+    assert stats["expected_submissions"] == 1
+    assert client.get(f"/stats/schooler/{schooler['id']}").json()["submissions"] == 1
@@ -0,0 +1,85 @@
+"""
+Benchmark command line.
+
+    python -m benchmarks generate --scale medium --reset
+    python -m benchmarks run --scale medium --workload mixed --requests 5000 --output benchmarks/results/before.json
+    python -m benchmarks compare benchmarks/results/before.json benchmarks/results/after.json
+
+``run`` calls the app in process with an in-memory Mongo stand-in unless ``--base-url``
+points it at a running server. ``compare`` exits with status 1 when a run regressed.
+"""
+from dataclasses import asdict
+import argparse
+import asyncio
+import os
+import sys
+
+from benchmarks.generate import add_spec_arguments, generate, spec_from_args
+from benchmarks.report import build_report, compare, format_report, load_report, save_report
+from benchmarks.workloads import WORKLOADS, http_client, in_process_client, run_workload
+
+async def _run(args: argparse.Namespace):
+    spec = spec_from_args(args)
+    client = http_client(args.base_url, args.concurrency) if args.base_url else in_process_client()
+    async with client as client:
+        samples, elapsed = await run_workload(
+            client, WORKLOADS[args.workload], spec, args.requests, args.concurrency, args.warmup, args.run_seed
+        )
+    report = build_report(samples, elapsed, {
+        "workload": args.workload,
+        "scale": args.scale,
+        "spec": asdict(spec),
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "run_seed": args.run_seed,
+        "target": args.base_url or "in-process",
+    })
+    print(format_report(report))
+    if args.output:
+        os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+        save_report(report, args.output)
+        print(f"Saved to {args.output}")
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Synthetic data and load tests for the API.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    generate_parser = commands.add_parser("generate", help="Bulk load a synthetic dataset into Postgres")
+    add_spec_arguments(generate_parser)
+    generate_parser.add_argument("--reset", action="store_true", help="TRUNCATE every table first")
+
+    run_parser = commands.add_parser("run", help="Run a workload and report latency percentiles")
+    add_spec_arguments(run_parser)
+    run_parser.add_argument("--workload", choices=sorted(WORKLOADS), default="mixed")
+    run_parser.add_argument("--requests", type=int, default=2000)
+    run_parser.add_argument("--concurrency", type=int, default=8)
+    run_parser.add_argument("--warmup", type=int, default=100)
+    run_parser.add_argument("--run-seed", dest="run_seed", type=int, default=0, help="Seed of the request mix; --seed is the dataset's")
+    run_parser.add_argument("--base-url", help="Benchmark a running server instead of the app in process")
+    run_parser.add_argument("--output", help="Where to save the JSON report")
+
+    compare_parser = commands.add_parser("compare", help="Compare two saved reports")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed growth, 0.2 is 20%%")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "generate":
+        print(asyncio.run(generate(spec_from_args(args), args.reset)))
+    elif args.command == "run":
+        asyncio.run(_run(args))
+    else:
+        regressions = compare(load_report(args.baseline), load_report(args.current), args.tolerance)
+        for regression in regressions:
+            print(
+                f"{regression['operation']}: {regression['metric']} {regression['baseline']} -> "
+                f"{regression['current']} (x{regression['ratio']})"
+            )
+        if regressions:
+            return 1
+        print("No regressions.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,243 @@
+"""Seeded synthetic school dataset, bulk loaded with COPY.
+
+Ids are assigned here (1..n per table) so workloads can pick valid ids without asking the
+database; the serial sequences are moved past them afterwards.
+
+Usage:
+    python -m benchmarks generate --scale small --reset
+"""
+from dataclasses import asdict, dataclass
+from datetime import date, datetime, timedelta, timezone
+from typing import Iterator, List, Sequence
+from sqlalchemy import text
+from sqlmodel import SQLModel, func, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+import argparse
+import hashlib
+import random
+import string
+
+from api.dependecies.models import (
+    Class, Subject, Teacher, Schooler, Admin, Assignment, SubmittedAssignment, SubmissionBody, GradeSummary, SEARCH_CONFIG
+)
+from database.postgres.grade_summary import rebuild_grade_summary
+from database.postgres.work_storage import offload_inline_work
+
+# Rows handed to one copy_records_to_table call
+COPY_CHUNK_SIZE = 10000
+
+FIRST_NAMES = [
+    "Anna", "Bohdan", "Chloe", "Dmytro", "Emma", "Farid", "Greta", "Hugo", "Iryna", "Jonas", "Kateryna",
+    "Liam", "Maria", "Nazar", "Olivia", "Petro", "Quinn", "Roman", "Sofia", "Taras", "Uma", "Viktor",
+    "Wiktoria", "Xavier", "Yana", "Zoran",
+]
+LAST_NAMES = [
+    "Andersen", "Bondarenko", "Castillo", "Dovzhenko", "Eriksen", "Fedorenko", "Garcia", "Horvath",
+    "Ivanenko", "Jensen", "Kowalczyk", "Lysenko", "Moreau", "Novak", "Olsen", "Petrenko", "Quintero",
+    "Rossi", "Shevchenko", "Tkachenko", "Urban", "Vasylenko", "Weber", "Yakovenko", "Zelenko",
+]
+SUBJECTS = [
+    "Mathematics", "Physics", "Chemistry", "Biology", "History", "Geography", "Literature", "English",
+    "Computer Science", "Art", "Music", "Physical Education", "Economics", "Philosophy", "Astronomy",
+]
+ASSIGN_TYPES = ["homework", "essay", "project", "quiz", "lab"]
+VOCABULARY = (
+    "analysis argument atom cell climate continent democracy derivative ecosystem energy equation "
+    "evolution experiment fraction galaxy gravity hypothesis integral kingdom language liberty "
+    "literature molecule momentum narrative orbit photosynthesis poem population probability "
+    "reaction revolution river sequence society spectrum theorem treaty velocity volcano wave"
+).split()
+
+@dataclass
+class DatasetSpec:
+    """Volumes of the generated dataset; every class gets exactly one teacher."""
+    seed: int = 42
+    classes: int = 10
+    subjects: int = 8
+    schoolers_per_class: int = 25
+    admins: int = 5
+    assignments_per_teacher: int = 10
+    submission_rate: float = 0.85
+    graded_rate: float = 0.7
+    work_words: int = 40
+    # Share of essays long enough to be kept in submissionbody
+    long_work_rate: float = 0.1
+    long_work_words: int = 600
+
+    @property
+    def teachers(self) -> int:
+        return self.classes
+
+    @property
+    def schoolers(self) -> int:
+        return self.classes * self.schoolers_per_class
+
+    @property
+    def assignments(self) -> int:
+        return self.classes * self.assignments_per_teacher
+
+SCALES = {
+    "small": DatasetSpec(),
+    "medium": DatasetSpec(classes=100, subjects=12, schoolers_per_class=30, admins=20, assignments_per_teacher=30),
+    "district": DatasetSpec(classes=1000, subjects=15, schoolers_per_class=30, admins=100, assignments_per_teacher=50),
+}
+
+def class_name(class_id: int) -> str:
+    """Unique three character class name (the column is VARCHAR(3))."""
+    digits = string.digits + string.ascii_uppercase
+    name = ""
+    while class_id:
+        class_id, remainder = divmod(class_id, len(digits))
+        name = digits[remainder] + name
+    return name.rjust(3, "0")
+
+def _text(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choices(VOCABULARY, k=words))
+
+def _chunks(rows: Iterator[tuple], size: int = COPY_CHUNK_SIZE) -> Iterator[List[tuple]]:
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def _people(rng: random.Random, count: int, prefix: str) -> Iterator[tuple]:
+    """``(id, first_name, last_name, email, age)`` with unique emails."""
+    for person_id in range(1, count + 1):
+        yield person_id, rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES), f"{prefix}{person_id}@bench.school", rng.randint(20, 65)
+
+def generate_rows(spec: DatasetSpec, today: date) -> Iterator[tuple[str, Sequence[str], Iterator[tuple]]]:
+    """Yield ``(table, columns, rows)`` in foreign key order; the same spec always yields the same rows."""
+    rng = random.Random(spec.seed)
+    added = today - timedelta(days=365)
+    now = datetime.combine(today, datetime.min.time(), tzinfo=timezone.utc)
+
+    yield Class.__tablename__, ["id", "name", "added"], (
+        (class_id, class_name(class_id), added) for class_id in range(1, spec.classes + 1)
+    )
+    yield Subject.__tablename__, ["id", "name", "added"], (
+        (subject_id, SUBJECTS[(subject_id - 1) % len(SUBJECTS)] + ("" if subject_id <= len(SUBJECTS) else f" {subject_id}"), added)
+        for subject_id in range(1, spec.subjects + 1)
+    )
+
+    # Teacher i teaches class i, so a teacher's assignments are handed in by that class
+    teacher_subjects = [rng.randint(1, spec.subjects) for _ in range(spec.teachers)]
+    yield Teacher.__tablename__, ["id", "first_name", "last_name", "email", "age", "class_id", "subject_id", "added"], (
+        (*person, person[0], teacher_subjects[person[0] - 1], added) for person in _people(rng, spec.teachers, "teacher")
+    )
+    yield Schooler.__tablename__, ["id", "first_name", "last_name", "email", "age", "class_id", "added"], (
+        (*person[:4], rng.randint(6, 18), (person[0] - 1) // spec.schoolers_per_class + 1, added)
+        for person in _people(rng, spec.schoolers, "schooler")
+    )
+    yield Admin.__tablename__, ["admin_id", "first_name", "last_name", "email", "age", "added"], (
+        (*person, added) for person in _people(rng, spec.admins, "admin")
+    )
+
+    deadlines = {}
+    def assignments():
+        for assignment_id in range(1, spec.assignments + 1):
+            teacher_id = (assignment_id - 1) // spec.assignments_per_teacher + 1
+            created = now - timedelta(days=rng.randint(1, 300), minutes=rng.randint(0, 1440))
+            deadlines[assignment_id] = (created + timedelta(days=rng.randint(3, 21))).date()
+            yield (
+                assignment_id, teacher_id, teacher_subjects[teacher_id - 1],
+                f"{rng.choice(ASSIGN_TYPES).capitalize()} {assignment_id}: {_text(rng, 4)}",
+                _text(rng, 30), rng.choice(ASSIGN_TYPES), deadlines[assignment_id], created, created
+            )
+    yield Assignment.__tablename__, [
+        "id", "teacher_id", "subject_id", "title", "description", "assign_type", "deadline", "added", "changed"
+    ], assignments()
+
+    def submissions():
+        submission_id = 0
+        for assignment_id in range(1, spec.assignments + 1):
+            class_id = (assignment_id - 1) // spec.assignments_per_teacher + 1
+            first_schooler = (class_id - 1) * spec.schoolers_per_class + 1
+            for schooler_id in range(first_schooler, first_schooler + spec.schoolers_per_class):
+                if rng.random() >= spec.submission_rate:
+                    continue
+                submission_id += 1
+                # Roughly one in ten is handed in late
+                submitted = datetime.combine(
+                    deadlines[assignment_id] - timedelta(days=rng.randint(-2, 15)), datetime.min.time(), tzinfo=timezone.utc
+                )
+                grade = rng.randint(1, 12) if rng.random() < spec.graded_rate else None
+                work = _text(rng, spec.long_work_words if rng.random() < spec.long_work_rate else spec.work_words)
+                encoded = work.encode()
+                yield (
+                    submission_id, work, len(encoded), hashlib.sha256(encoded).hexdigest(),
+                    grade, schooler_id, assignment_id, submitted
+                )
+    # Loaded inline; load_dataset moves the long bodies out afterwards, as the migration does
+    yield SubmittedAssignment.__tablename__, [
+        "id", "work", "work_size", "work_hash", "grade", "schooler_id", "assignment_id", "submitted"
+    ], submissions()
+
+async def load_dataset(session: AsyncSession, spec: DatasetSpec, reset: bool = False) -> dict[str, int]:
+    """
+    COPY the dataset into an empty database and return the row count per table.
+
+    Args:
+        session (AsyncSession): Database session; committed on success.
+        spec (DatasetSpec): Volumes and seed.
+        reset (bool): TRUNCATE every table first; without it the tables have to be empty.
+
+    Returns:
+        dict[str, int]: Rows loaded per table.
+    """
+    if reset:
+        tables = ", ".join(table.name for table in SQLModel.metadata.sorted_tables)
+        await session.exec(text(f"TRUNCATE {tables} RESTART IDENTITY CASCADE"))
+    elif (await session.exec(select(func.count()).select_from(Class))).one():
+        raise RuntimeError("The database already has data; pass reset=True (--reset) to replace it.")
+
+    connection = await session.connection()
+    # COPY is only reachable on the asyncpg connection itself
+    driver_connection = (await connection.get_raw_connection()).driver_connection
+
+    loaded = {}
+    for table, columns, rows in generate_rows(spec, date.today()):
+        loaded[table] = 0
+        for chunk in _chunks(rows):
+            await driver_connection.copy_records_to_table(table, records=chunk, columns=columns)
+            loaded[table] += len(chunk)
+        primary_key = columns[0]
+        # Let ids created later through the API continue after the generated ones
+        await session.exec(text(
+            f"SELECT setval(pg_get_serial_sequence('{table}', '{primary_key}'), "
+            f"(SELECT coalesce(max({primary_key}), 0) + 1 FROM {table}), false)"
+        ))
+
+    # COPY can't compute tsvectors, so the search vectors are filled in one pass at the end
+    await session.exec(text(f"UPDATE {SubmittedAssignment.__tablename__} SET search_vector = to_tsvector('{SEARCH_CONFIG}', work)"))
+    await session.commit()
+    loaded[SubmissionBody.__tablename__] = await offload_inline_work(session)
+    loaded[GradeSummary.__tablename__] = await rebuild_grade_summary(session)
+    return loaded
+
+async def generate(spec: DatasetSpec, reset: bool = False) -> dict[str, int]:
+    """Load the dataset with the application's engine, then refresh the planner statistics."""
+    from database.postgres.db import engine
+
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        loaded = await load_dataset(session, spec, reset)
+    # Fresh statistics, or the first benchmark run plans against empty tables
+    async with engine.connect() as connection:
+        connection = await connection.execution_options(isolation_level="AUTOCOMMIT")
+        await connection.execute(text("ANALYZE"))
+    await engine.dispose()
+    return loaded
+
+def add_spec_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small")
+    for field, value in asdict(DatasetSpec()).items():
+        parser.add_argument(f"--{field.replace('_', '-')}", dest=field, type=type(value), help=f"Override the scale's {field}")
+
+def spec_from_args(args: argparse.Namespace) -> DatasetSpec:
+    """The ``--scale`` preset with any per-field overrides applied."""
+    fields = asdict(SCALES[args.scale])
+    fields.update({field: getattr(args, field) for field in fields if getattr(args, field, None) is not None})
+    return DatasetSpec(**fields)
@@ -0,0 +1,65 @@
+"""In-memory stand-in for the Mongo client, so benchmarks don't need a Mongo server.
+
+It covers what the application uses: ``command("ping")`` in the lifespan and
+``create_index``/``insert_many`` on the logs collection from the audit logger.
+"""
+from typing import Any, List
+import asyncio
+
+class InMemoryCollection:
+    """Keeps inserted documents in a list; ``max_documents`` bounds memory on long runs."""
+
+    def __init__(self, name: str, max_documents: int = 100000, insert_latency: float = 0.0):
+        self.name = name
+        self.max_documents = max_documents
+        # Seconds per insert_many call, to roughly model the round trip to a real server
+        self.insert_latency = insert_latency
+        self.documents: List[dict[str, Any]] = []
+        self.inserted = 0
+        self.indexes: List[tuple[Any, dict[str, Any]]] = []
+
+    async def create_index(self, keys, **options) -> str:
+        self.indexes.append((keys, options))
+        return keys if isinstance(keys, str) else "_".join(str(key) for key in keys)
+
+    async def insert_many(self, documents, ordered: bool = True):
+        if self.insert_latency:
+            await asyncio.sleep(self.insert_latency)
+        documents = list(documents)
+        self.inserted += len(documents)
+        self.documents.extend(documents)
+        del self.documents[:-self.max_documents]
+
+class InMemoryDatabase:
+    def __init__(self, name: str, **collection_options):
+        self.name = name
+        self._collection_options = collection_options
+        self._collections: dict[str, InMemoryCollection] = {}
+
+    def __getitem__(self, name: str) -> InMemoryCollection:
+        if name not in self._collections:
+            self._collections[name] = InMemoryCollection(name, **self._collection_options)
+        return self._collections[name]
+
+    async def command(self, command: str) -> dict[str, Any]:
+        if command != "ping":
+            raise NotImplementedError(f"The Mongo stand-in only answers ping, not {command}.")
+        return {"ok": 1}
+
+class InMemoryClient:
+    def __init__(self, **collection_options):
+        self._collection_options = collection_options
+        self._databases: dict[str, InMemoryDatabase] = {}
+
+    def __getitem__(self, name: str) -> InMemoryDatabase:
+        if name not in self._databases:
+            self._databases[name] = InMemoryDatabase(name, **self._collection_options)
+        return self._databases[name]
+
+    def __getattr__(self, name: str) -> InMemoryDatabase:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return self[name]
+
+    async def close(self):
+        pass
@@ -0,0 +1,120 @@
+"""Latency percentiles of a run, saved as JSON, and comparison of two saved runs."""
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Any, Iterable, List, Sequence
+import json
+import math
+import platform
+
+from benchmarks.workloads import Sample
+
+PERCENTILES = (50, 95, 99)
+# Operations with fewer samples than this are reported but never flagged by compare
+MIN_SAMPLES = 20
+
+def percentile(sorted_values: Sequence[float], q: float) -> float:
+    """``q``-th percentile of already sorted values, interpolating between the closest ranks."""
+    if not sorted_values:
+        return math.nan
+    position = (len(sorted_values) - 1) * q / 100
+    lower = math.floor(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+def summarize(seconds: Iterable[float], errors: int = 0) -> dict[str, Any]:
+    """Count, errors and latency statistics in milliseconds."""
+    values = sorted(value * 1000 for value in seconds)
+    summary = {"count": len(values), "errors": errors}
+    for q in PERCENTILES:
+        summary[f"p{q}_ms"] = round(percentile(values, q), 3)
+    summary["mean_ms"] = round(sum(values) / len(values), 3) if values else math.nan
+    summary["max_ms"] = round(values[-1], 3) if values else math.nan
+    return summary
+
+def build_report(samples: List[Sample], elapsed: float, meta: dict[str, Any]) -> dict[str, Any]:
+    """
+    The report of one run.
+
+    Every operation gets its own statistics, plus ``total`` over all of them and the
+    throughput of the whole run. Statuses other than the expected ones are counted as
+    errors and listed per operation, but their latencies are still included.
+    """
+    by_operation: dict[str, List[Sample]] = defaultdict(list)
+    for sample in samples:
+        by_operation[sample.operation].append(sample)
+
+    operations = {}
+    for name, operation_samples in sorted(by_operation.items()):
+        failed = [sample for sample in operation_samples if not sample.ok]
+        operations[name] = summarize((sample.seconds for sample in operation_samples), len(failed))
+        if failed:
+            statuses: dict[str, int] = defaultdict(int)
+            for sample in failed:
+                statuses[str(sample.status)] += 1
+            operations[name]["error_statuses"] = dict(statuses)
+
+    return {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            **meta,
+        },
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(len(samples) / elapsed, 2) if elapsed else None,
+        "total": summarize((sample.seconds for sample in samples), sum(not sample.ok for sample in samples)),
+        "operations": operations,
+    }
+
+def save_report(report: dict[str, Any], path: str):
+    with open(path, "w") as file:
+        json.dump(report, file, indent=2)
+        file.write("\n")
+
+def load_report(path: str) -> dict[str, Any]:
+    with open(path) as file:
+        return json.load(file)
+
+def compare(
+    baseline: dict[str, Any],
+    current: dict[str, Any],
+    tolerance: float = 0.2,
+    metrics: Sequence[str] = ("p95_ms", "p99_ms")
+) -> List[dict[str, Any]]:
+    """
+    Regressions of ``current`` against ``baseline``.
+
+    An operation regresses when one of ``metrics`` grew by more than ``tolerance`` (0.2 is 20%),
+    or when it has errors the baseline didn't have. Operations missing from either run and
+    those with fewer than ``MIN_SAMPLES`` samples are skipped, as their tails are noise.
+
+    Returns:
+        List[dict]: One entry per regressed metric, worst ratio first.
+    """
+    regressions = []
+    for name, now in current["operations"].items():
+        before = baseline["operations"].get(name)
+        if before is None or min(before["count"], now["count"]) < MIN_SAMPLES:
+            continue
+        for metric in metrics:
+            if before[metric] > 0 and now[metric] > before[metric] * (1 + tolerance):
+                regressions.append({
+                    "operation": name, "metric": metric, "baseline": before[metric],
+                    "current": now[metric], "ratio": round(now[metric] / before[metric], 2),
+                })
+        if now["errors"] and not before["errors"]:
+            regressions.append({
+                "operation": name, "metric": "errors", "baseline": 0, "current": now["errors"], "ratio": math.inf,
+            })
+    return sorted(regressions, key=lambda regression: regression["ratio"], reverse=True)
+
+def format_report(report: dict[str, Any]) -> str:
+    """Plain text table of a report, for the terminal."""
+    header = f"{'operation':<30}{'count':>8}{'errors':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+    lines = [header, "-" * len(header)]
+    for name, stats in [*report["operations"].items(), ("total", report["total"])]:
+        lines.append(
+            f"{name:<30}{stats['count']:>8}{stats['errors']:>8}"
+            f"{stats['p50_ms']:>10.1f}{stats['p95_ms']:>10.1f}{stats['p99_ms']:>10.1f}"
+        )
+    lines.append(f"{report['throughput_rps']} requests/s over {report['elapsed_s']} s")
+    return "\n".join(lines)
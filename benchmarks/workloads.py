@@ -0,0 +1,270 @@
+"""Scripted mixed read/write workloads over every router.
+
+A workload is a weighted list of operations. Each worker of a run draws operations by weight
+and sends them until the request budget is spent; every response is timed and checked
+against the statuses the operation expects, and anything else counts as an error.
+
+Ids are drawn from the ranges the generator loaded (see ``benchmarks.generate``), so a run
+needs a dataset loaded with the same spec. Writes stay inside that dataset: deletes only
+remove rows the run itself created.
+"""
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from time import perf_counter
+from typing import AsyncIterator, Callable, List, Optional
+import asyncio
+import itertools
+import os
+import random
+import httpx
+
+from benchmarks.generate import DatasetSpec, VOCABULARY, FIRST_NAMES, LAST_NAMES
+
+@dataclass
+class Call:
+    """One HTTP request of an operation."""
+    method: str
+    url: str
+    params: Optional[dict] = None
+    json: Optional[object] = None
+
+@dataclass
+class RunState:
+    """What the workers share: the dataset spec, the rng and the rows the run created."""
+    spec: DatasetSpec
+    rng: random.Random
+    created_admins: List[int] = field(default_factory=list)
+    created_assignments: List[tuple[int, int]] = field(default_factory=list)
+    created_submissions: List[int] = field(default_factory=list)
+    # Unique suffixes for emails and titles, which have unique constraints
+    sequence: itertools.count = field(default_factory=lambda: itertools.count(1))
+
+    def schooler(self) -> int:
+        return self.rng.randint(1, self.spec.schoolers)
+
+    def class_id(self) -> int:
+        return self.rng.randint(1, self.spec.classes)
+
+    def teacher(self) -> int:
+        return self.rng.randint(1, self.spec.teachers)
+
+    def subject(self) -> int:
+        return self.rng.randint(1, self.spec.subjects)
+
+    def assignment(self) -> int:
+        return self.rng.randint(1, self.spec.assignments)
+
+    def submission(self) -> int:
+        # The generator skips (1 - submission_rate) of the pairs, so this is the expected last id
+        expected = int(self.spec.assignments * self.spec.schoolers_per_class * self.spec.submission_rate)
+        return self.rng.randint(1, max(expected, 1))
+
+    def words(self, count: int) -> str:
+        return " ".join(self.rng.choices(VOCABULARY, k=count))
+
+@dataclass
+class Operation:
+    """
+    A named kind of request.
+
+    ``build`` returns the call to make, or None when the operation has nothing to work on
+    yet (a delete before anything was created), in which case the worker draws again.
+    ``on_response`` lets writes remember what they created.
+    """
+    name: str
+    weight: int
+    build: Callable[[RunState], Optional[Call]]
+    expect: tuple[int, ...] = (200,)
+    on_response: Optional[Callable[[RunState, httpx.Response], None]] = None
+
+def _pop(items: list, rng: random.Random):
+    return items.pop(rng.randrange(len(items))) if items else None
+
+def _remember_admin(state: RunState, response: httpx.Response):
+    if response.status_code == 201:
+        state.created_admins.append(response.json()["admin_id"])
+
+def _remember_assignment(state: RunState, response: httpx.Response):
+    if response.status_code == 201:
+        body = response.json()
+        state.created_assignments.append((body["id"], body["teacher_id"]))
+
+def _remember_submission(state: RunState, response: httpx.Response):
+    if response.status_code == 201:
+        state.created_submissions.append(response.json()["id"])
+
+def _create_admin(state: RunState) -> Call:
+    number = next(state.sequence)
+    return Call("POST", "/admins/", json={
+        "first_name": state.rng.choice(FIRST_NAMES), "last_name": state.rng.choice(LAST_NAMES),
+        "email": f"bench-admin-{state.rng.getrandbits(32):08x}-{number}@bench.school", "age": state.rng.randint(25, 60),
+    })
+
+def _create_assignment(state: RunState) -> Call:
+    teacher_id = state.teacher()
+    return Call("POST", "/assignments/", json={
+        "teacher_id": teacher_id, "subject_id": state.subject(),
+        "title": f"Bench {state.rng.getrandbits(32):08x}-{next(state.sequence)}", "description": state.words(30),
+        "assign_type": "homework", "deadline": (date.today() + timedelta(days=7)).isoformat(),
+    })
+
+def _submit(state: RunState) -> Optional[Call]:
+    # Only assignments created by this run are known to have no submissions yet
+    if not state.created_assignments:
+        return None
+    assignment_id, teacher_id = state.rng.choice(state.created_assignments)
+    # Teacher i teaches class i, see the generator
+    first = (teacher_id - 1) * state.spec.schoolers_per_class + 1
+    return Call("POST", "/assignments/submit/", json={
+        "work": state.words(state.spec.work_words), "grade": None,
+        "schooler_id": state.rng.randint(first, first + state.spec.schoolers_per_class - 1),
+        "assignment_id": assignment_id,
+    })
+
+def _delete_admin(state: RunState) -> Optional[Call]:
+    admin_id = _pop(state.created_admins, state.rng)
+    return None if admin_id is None else Call("DELETE", f"/delete/admin/{admin_id}")
+
+def _delete_admins_bulk(state: RunState) -> Optional[Call]:
+    if len(state.created_admins) < 5:
+        return None
+    return Call("DELETE", "/delete/bulk/admins", json=[_pop(state.created_admins, state.rng) for _ in range(5)])
+
+def _delete_submission(state: RunState) -> Optional[Call]:
+    submission_id = _pop(state.created_submissions, state.rng)
+    return None if submission_id is None else Call("DELETE", f"/delete/submmited/assignment/{submission_id}")
+
+MIXED: List[Operation] = [
+    # get
+    Operation("get.schoolers_by_class", 10, lambda s: Call("GET", "/get/learners/list/schooler", {"class_id": s.class_id()})),
+    Operation("get.teachers_by_subject", 4, lambda s: Call("GET", "/get/learners/list/teacher", {"subject_id": s.subject()})),
+    Operation("get.schoolers_thin", 4, lambda s: Call("GET", "/get/learners/list/schooler", {"class_id": s.class_id(), "fields": "id,first_name,last_name"})),
+    Operation("get.assignments_by_teacher", 8, lambda s: Call("GET", "/get/assignments/", {"teacher_id": s.teacher()})),
+    Operation("get.submission_roster", 8, lambda s: Call("GET", f"/get/submitted/assignments/{s.assignment()}/", {"handed_late": s.rng.random() < 0.5})),
+    Operation("get.submission_work", 4, lambda s: Call("GET", f"/get/submitted/assignment/{s.submission()}/work"), (200, 404)),
+    Operation("get.classes", 3, lambda s: Call("GET", "/get/classes/")),
+    Operation("get.subjects", 3, lambda s: Call("GET", "/get/subjects/")),
+    Operation("get.admins", 2, lambda s: Call("GET", "/get/admins/")),
+    # stats
+    Operation("stats.assignment", 5, lambda s: Call("GET", f"/stats/assignment/{s.assignment()}")),
+    Operation("stats.class", 3, lambda s: Call("GET", f"/stats/class/{s.class_id()}")),
+    Operation("stats.schooler", 3, lambda s: Call("GET", f"/stats/schooler/{s.schooler()}")),
+    Operation("stats.schooler_averages", 5, lambda s: Call("GET", f"/stats/schooler/{s.schooler()}/averages")),
+    # search
+    Operation("search.assignments", 4, lambda s: Call("GET", "/search/assignments", {"q": s.words(2)})),
+    Operation("search.submissions", 3, lambda s: Call("GET", "/search/submissions", {"q": s.words(2), "class_id": s.class_id()})),
+    Operation("search.people", 4, lambda s: Call("GET", "/search/people", {"q": s.rng.choice(LAST_NAMES)[:5]})),
+    # export, internal, metrics
+    Operation("export.teachers", 1, lambda s: Call("GET", "/export/teachers", {"format": "csv"})),
+    Operation("internal.pool", 1, lambda s: Call("GET", "/internal/pool")),
+    Operation("metrics", 1, lambda s: Call("GET", "/metrics")),
+    # post
+    Operation("post.admin", 3, _create_admin, (201,), _remember_admin),
+    Operation("post.assignment", 2, _create_assignment, (201,), _remember_assignment),
+    # A random schooler may already have handed the assignment in
+    Operation("post.submission", 4, _submit, (201, 409), _remember_submission),
+    # put
+    Operation("put.grade", 6, lambda s: Call("PUT", f"/give/garde/{s.rng.randint(1, 12)}/assignment/{s.submission()}")),
+    Operation("put.grades_bulk", 1, lambda s: Call("PUT", "/grades/bulk", json=[
+        {"submitted_assignment_id": s.submission(), "grade": s.rng.randint(1, 12)} for _ in range(100)
+    ])),
+    Operation("put.assignment", 2, lambda s: Call("PUT", f"/update/assignment/{s.assignment()}/", {"description": s.words(30)})),
+    # delete, only what this run created
+    Operation("delete.admin", 2, _delete_admin),
+    Operation("delete.submission", 2, _delete_submission),
+    Operation("delete.admins_bulk", 1, _delete_admins_bulk),
+]
+
+READ_ONLY: List[Operation] = [operation for operation in MIXED if operation.name.split(".")[0] not in ("post", "put", "delete")]
+
+WORKLOADS = {
+    "mixed": MIXED,
+    "read": READ_ONLY,
+}
+
+@dataclass
+class Sample:
+    operation: str
+    seconds: float
+    status: int
+    ok: bool
+
+async def _worker(
+    client: httpx.AsyncClient, operations: List[Operation], state: RunState, budget: itertools.count,
+    requests: int, samples: List[Sample]
+):
+    weights = [operation.weight for operation in operations]
+    while next(budget) < requests:
+        call = None
+        while call is None:
+            operation = state.rng.choices(operations, weights)[0]
+            call = operation.build(state)
+        started = perf_counter()
+        try:
+            response = await client.request(call.method, call.url, params=call.params, json=call.json)
+            status = response.status_code
+        except httpx.HTTPError:
+            response, status = None, 0
+        seconds = perf_counter() - started
+        samples.append(Sample(operation.name, seconds, status, status in operation.expect))
+        if response is not None and operation.on_response is not None:
+            operation.on_response(state, response)
+
+async def run_workload(
+    client: httpx.AsyncClient,
+    operations: List[Operation],
+    spec: DatasetSpec,
+    requests: int = 1000,
+    concurrency: int = 8,
+    warmup: int = 50,
+    seed: int = 0
+) -> tuple[List[Sample], float]:
+    """
+    Send ``requests`` requests from ``concurrency`` workers and return the samples and the wall time.
+
+    The first ``warmup`` requests fill the pool and the caches and are not reported.
+    """
+    state = RunState(spec, random.Random(seed))
+    if warmup:
+        await asyncio.gather(*(
+            _worker(client, operations, state, itertools.count(), warmup // concurrency, [])
+            for _ in range(concurrency)
+        ))
+    samples: List[Sample] = []
+    # Shared counter: the workers together send exactly `requests` requests
+    budget = itertools.count()
+    started = perf_counter()
+    await asyncio.gather(*(_worker(client, operations, state, budget, requests, samples) for _ in range(concurrency)))
+    return samples, perf_counter() - started
+
+@asynccontextmanager
+async def in_process_client() -> AsyncIterator[httpx.AsyncClient]:
+    """
+    A client calling the app in this process, with Mongo replaced by the in-memory stand-in.
+
+    The app's lifespan is run around it, so the audit flusher and cache listener behave as
+    they do under uvicorn; Postgres is whatever ``POSTGRES_URL`` points at. The X-Query-*
+    headers are switched on unless ``API_QUERY_HEADERS`` says otherwise.
+    """
+    os.environ.setdefault("API_QUERY_HEADERS", "1")
+    import api.main
+    from benchmarks.mongo_standin import InMemoryClient
+    from database.mongodb.audit import audit_logger
+
+    mongo = InMemoryClient()
+    api.main.client, api.main.database = mongo, mongo.user
+    audit_logger.collection = mongo.user["logs"]
+
+    app = api.main.app
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", headers={"X-Actor": "benchmark"}) as client:
+            yield client
+
+@asynccontextmanager
+async def http_client(base_url: str, concurrency: int) -> AsyncIterator[httpx.AsyncClient]:
+    """A client for a server that is already running, e.g. uvicorn with several workers."""
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60, headers={"X-Actor": "benchmark"}) as client:
+        yield client
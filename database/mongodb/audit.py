@@ -0,0 +1,138 @@
+from typing import Any, List, Optional
+from pymongo.asynchronous.collection import AsyncCollection
+from datetime import datetime, timezone
+from dotenv import load_dotenv
+import asyncio
+import logging
+import os
+
+from database.mongodb.db import collection
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+AUDIT_QUEUE_SIZE = int(os.getenv("AUDIT_QUEUE_SIZE", "10000"))
+AUDIT_BATCH_SIZE = int(os.getenv("AUDIT_BATCH_SIZE", "500"))
+AUDIT_FLUSH_INTERVAL = float(os.getenv("AUDIT_FLUSH_INTERVAL", "1.0"))
+AUDIT_TTL_DAYS = int(os.getenv("AUDIT_TTL_DAYS", "90"))
+
+def model_diff(before: dict[str, Any], after: dict[str, Any]) -> dict[str, List[Any]]:
+    """
+    ``{field: [old, new]}`` for every field that differs between two ``model_dump(mode="json")`` snapshots.
+
+    A create diffs against ``{}`` and a delete against ``{}`` the other way round, so missing values read as None.
+    """
+    return {
+        field: [before.get(field), after.get(field)]
+        for field in {**before, **after}
+        if before.get(field) != after.get(field)
+    }
+
+class AuditLogger:
+    """
+    Buffers audit events in a bounded in-memory queue and writes them to Mongo in batches.
+
+    ``record`` never waits: it only appends to the queue, and when the queue is full the event
+    is dropped and counted rather than slowing the request down. A background task flushes
+    with ``insert_many`` once ``batch_size`` events are waiting or ``flush_interval`` seconds
+    have passed since the first one arrived.
+    """
+
+    def __init__(
+        self,
+        collection: AsyncCollection,
+        max_queue: int = AUDIT_QUEUE_SIZE,
+        batch_size: int = AUDIT_BATCH_SIZE,
+        flush_interval: float = AUDIT_FLUSH_INTERVAL,
+        ttl_days: int = AUDIT_TTL_DAYS
+    ):
+        self.collection = collection
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.ttl_days = ttl_days
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self._task: Optional[asyncio.Task] = None
+        self._writing: Optional[asyncio.Future] = None
+        self._batch: List[dict[str, Any]] = []
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+
+    def record(self, event: dict[str, Any]):
+        """Queue one event; ``at`` is stamped here so batching doesn't skew the times."""
+        event.setdefault("at", datetime.now(timezone.utc))
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.dropped += 1
+
+    async def start(self):
+        # Mongo's TTL monitor removes events older than ttl_days in the background
+        await self.collection.create_index("at", expireAfterSeconds=self.ttl_days * 24 * 3600)
+        self._task = asyncio.create_task(self._run())
+        logger.info("Audit logging started.")
+
+    async def stop(self):
+        """Stop the flusher and write whatever is still queued."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        if self._writing is not None:
+            await self._writing
+        batch, self._batch = self._batch, []
+        await self._write(batch)
+        while not self._queue.empty():
+            await self._write(self._take(self.batch_size))
+
+    def _take(self, limit: int) -> List[dict[str, Any]]:
+        batch = []
+        while len(batch) < limit and not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+        return batch
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            # Events taken off the queue live in self._batch until written, so stop() can still flush them
+            self._batch.append(await self._queue.get())
+            deadline = loop.time() + self.flush_interval
+            while len(self._batch) < self.batch_size:
+                self._batch.extend(self._take(self.batch_size - len(self._batch)))
+                remaining = deadline - loop.time()
+                if len(self._batch) >= self.batch_size or remaining <= 0:
+                    break
+                try:
+                    self._batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            batch, self._batch = self._batch, []
+            # Shielded so stopping the flusher mid-write doesn't lose the batch in flight
+            self._writing = asyncio.ensure_future(self._write(batch))
+            await asyncio.shield(self._writing)
+
+    async def _write(self, batch: List[dict[str, Any]]):
+        if not batch:
+            return
+        try:
+            # Unordered, so one bad document doesn't stop the rest of the batch
+            await self.collection.insert_many(batch, ordered=False)
+            self.written += len(batch)
+        except Exception as e:
+            self.failed += len(batch)
+            logger.warning(f"Dropped {len(batch)} audit events: {e}")
+
+    def stats(self) -> dict:
+        return {
+            "queued": self._queue.qsize(),
+            "written": self.written,
+            "dropped": self.dropped,
+            "failed": self.failed,
+        }
+
+audit_logger = AuditLogger(collection)
@@ -0,0 +1,60 @@
+from typing import Any, List, Type
+from sqlalchemy import exists, literal, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.sql.elements import ColumnElement
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+# Rows per multi-row INSERT; keeps the bind parameter count well below Postgres' 32767 limit
+BULK_BATCH_SIZE = 1000
+
+async def insert_ignoring_conflicts(
+    session: AsyncSession,
+    model: Type[SQLModel],
+    rows: List[dict[str, Any]],
+    batch_size: int = BULK_BATCH_SIZE
+) -> List[SQLModel]:
+    """
+    Insert ``rows`` into ``model``'s table with one ``INSERT ... ON CONFLICT DO NOTHING RETURNING`` per batch.
+
+    Rows that hit any unique constraint are skipped by Postgres and are simply absent from the result.
+    The caller owns the transaction and has to commit.
+    """
+    created: List[SQLModel] = []
+    for start in range(0, len(rows), batch_size):
+        statement = (
+            pg_insert(model)
+            .values(rows[start:start + batch_size])
+            .on_conflict_do_nothing()
+            .returning(model)
+        )
+        created.extend((await session.scalars(statement)).all())
+    return created
+
+async def insert_one_ignoring_conflicts(
+    session: AsyncSession,
+    model: Type[SQLModel],
+    row: dict[str, Any]
+) -> SQLModel | None:
+    """Insert a single row in one round trip; returns None when a unique constraint already holds the value."""
+    created = await insert_ignoring_conflicts(session, model, [row])
+    return created[0] if created else None
+
+async def insert_one_unless(
+    session: AsyncSession,
+    model: Type[SQLModel],
+    row: dict[str, Any],
+    duplicate: ColumnElement[bool]
+) -> SQLModel | None:
+    """
+    Insert a single row in one round trip with ``INSERT ... SELECT ... WHERE NOT EXISTS RETURNING``.
+
+    For duplicate rules no unique constraint backs: returns None when a row matching ``duplicate``
+    is already there. Without a constraint two concurrent inserts can still both get through.
+    """
+    columns = model.__table__.c
+    values = select(*[literal(value, columns[name].type) for name, value in row.items()]).where(
+        ~exists().where(duplicate)
+    )
+    statement = pg_insert(model).from_select(list(row), values).returning(model)
+    return (await session.scalars(statement)).first()
@@ -0,0 +1,247 @@
+from typing import Iterable, List, Sequence, Type
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+from sqlmodel import SQLModel, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from dotenv import load_dotenv
+from time import monotonic
+import asyncio
+import logging
+import os
+
+from api.dependecies.models import Class, ClassPublic, Subject, SubjectPublic, live
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Postgres channel the workers use to tell each other which cache went stale
+INVALIDATION_CHANNEL = "reference_cache"
+
+REFERENCE_CACHE_TTL = float(os.getenv("REFERENCE_CACHE_TTL", "300"))
+REFERENCE_CACHE_MAX_ROWS = int(os.getenv("REFERENCE_CACHE_MAX_ROWS", "10000"))
+# Seconds between checks of the LISTEN connection, and between attempts to reconnect it
+CACHE_LISTEN_CHECK_INTERVAL = float(os.getenv("CACHE_LISTEN_CHECK_INTERVAL", "30"))
+CACHE_LISTEN_RETRY_DELAY = float(os.getenv("CACHE_LISTEN_RETRY_DELAY", "5"))
+
+# Held in place of the rows of a table that turned out larger than max_rows, so the table isn't
+# read again on every call; it expires and is invalidated like a normal load
+TOO_LARGE = object()
+
+class ReferenceCache:
+    """
+    In-process read-through cache of a small reference table.
+
+    The live rows of the table are held as ``*Public`` models in Postgres' ``ORDER BY order``, so
+    the database collation sorts them as it sorts the uncached pages, and are reloaded once
+    ``ttl`` seconds have passed or an invalidation arrives. Tables larger than ``max_rows``
+    are not cached; callers then get None and query Postgres themselves until the TTL runs
+    out or an invalidation arrives.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        model: Type[SQLModel],
+        public: Type[SQLModel],
+        order: Sequence[str],
+        ttl: float = REFERENCE_CACHE_TTL,
+        max_rows: int = REFERENCE_CACHE_MAX_ROWS
+    ):
+        self.name = name
+        self.model = model
+        self.public = public
+        self.order = tuple(order)
+        self.ttl = ttl
+        self.max_rows = max_rows
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._rows: List[SQLModel] | object | None = None
+        self._ids: frozenset[int] = frozenset()
+        self._loaded_at = 0.0
+        self._generation = 0
+        self._lock = asyncio.Lock()
+
+    def _fresh(self) -> bool:
+        return self._rows is not None and monotonic() - self._loaded_at < self.ttl
+
+    def _cached(self) -> List[SQLModel] | None:
+        return None if self._rows is TOO_LARGE else self._rows
+
+    async def rows(self, session: AsyncSession) -> List[SQLModel] | None:
+        """Return every live row of the table, loading it on a miss; None when the table is too big to cache."""
+        if self._fresh():
+            self.hits += 1
+            return self._cached()
+
+        # Only one request per worker reloads, the others wait for its result
+        async with self._lock:
+            if self._fresh():
+                self.hits += 1
+                return self._cached()
+
+            self.misses += 1
+            generation = self._generation
+            statement = (
+                select(self.model)
+                .where(live(self.model))
+                .order_by(*(getattr(self.model, key) for key in self.order))
+                .limit(self.max_rows + 1)
+            )
+            loaded = (await session.exec(statement)).all()
+            rows = None if len(loaded) > self.max_rows else [self.public.model_validate(row) for row in loaded]
+            # An invalidation that arrived while loading means the rows may already be stale
+            if generation == self._generation:
+                self._rows = TOO_LARGE if rows is None else rows
+                self._ids = frozenset(row.id for row in rows or ())
+                self._loaded_at = monotonic()
+            return rows
+
+    async def existing_ids(self, session: AsyncSession, ids: Iterable[int]) -> set[int]:
+        """Return the subset of ``ids`` that exist in the table and aren't deleted."""
+        wanted = set(ids)
+        if await self.rows(session) is not None and self._fresh():
+            return wanted & self._ids
+        return set((await session.exec(
+            select(self.model.id).where(self.model.id.in_(wanted), live(self.model))
+        )).all())
+
+    def clear(self):
+        self._rows = None
+        self._ids = frozenset()
+        self._generation += 1
+        self.invalidations += 1
+
+    def stats(self) -> dict:
+        return {
+            "name": self.name,
+            "rows": len(self._cached()) if self._cached() is not None else None,
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "age_seconds": monotonic() - self._loaded_at if self._rows is not None else None,
+        }
+
+class_cache = ReferenceCache("class", Class, ClassPublic, ("name", "id"))
+subject_cache = ReferenceCache("subject", Subject, SubjectPublic, ("name", "id"))
+
+REFERENCE_CACHES = {cache.name: cache for cache in (class_cache, subject_cache)}
+
+async def commit_and_invalidate(session: AsyncSession, *caches: ReferenceCache):
+    """
+    Commit a write to a cached table and invalidate it in every worker.
+
+    NOTIFY is transactional, so other workers only hear about the change once it is committed.
+    """
+    for cache in caches:
+        await session.exec(text("SELECT pg_notify(:channel, :payload)").bindparams(
+            channel=INVALIDATION_CHANNEL, payload=cache.name
+        ))
+    await session.commit()
+    for cache in caches:
+        cache.clear()
+
+class CacheInvalidationListener:
+    """
+    Keeps one connection LISTENing for invalidations sent by ``commit_and_invalidate`` in other workers.
+
+    A dropped connection is noticed through asyncpg's termination callback, or by a ``SELECT 1``
+    every ``check_interval`` seconds when the connection died silently. The listener then
+    reconnects every ``retry_delay`` seconds until it succeeds, and clears the caches both when
+    the connection is lost and once it is back, as notifications sent in between were missed.
+    """
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        caches: dict[str, ReferenceCache] = REFERENCE_CACHES,
+        check_interval: float = CACHE_LISTEN_CHECK_INTERVAL,
+        retry_delay: float = CACHE_LISTEN_RETRY_DELAY
+    ):
+        self.engine = engine
+        self.caches = caches
+        self.check_interval = check_interval
+        self.retry_delay = retry_delay
+        self.reconnects = 0
+        self._connection: AsyncConnection | None = None
+        self._driver_connection = None
+        self._lost = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    def _on_notify(self, connection, pid, channel, payload):
+        cache = self.caches.get(payload)
+        if cache is not None:
+            cache.clear()
+
+    def _on_terminate(self, connection):
+        self._lost.set()
+
+    def _clear_caches(self):
+        for cache in self.caches.values():
+            cache.clear()
+
+    async def _listen(self):
+        self._lost.clear()
+        self._connection = await self.engine.connect()
+        raw_connection = await self._connection.get_raw_connection()
+        self._driver_connection = raw_connection.driver_connection
+        self._driver_connection.add_termination_listener(self._on_terminate)
+        await self._driver_connection.add_listener(INVALIDATION_CHANNEL, self._on_notify)
+
+    async def _close(self):
+        """Drop the listening connection; it may already be dead, so its pool slot is invalidated."""
+        if self._connection is None:
+            return
+        connection, self._connection = self._connection, None
+        try:
+            self._driver_connection.remove_termination_listener(self._on_terminate)
+            await self._driver_connection.remove_listener(INVALIDATION_CHANNEL, self._on_notify)
+            await connection.close()
+        except Exception:
+            await connection.invalidate()
+
+    async def _is_alive(self) -> bool:
+        try:
+            await asyncio.wait_for(self._lost.wait(), self.check_interval)
+            return False
+        except asyncio.TimeoutError:
+            pass
+        try:
+            await asyncio.wait_for(self._driver_connection.fetchval("SELECT 1"), self.check_interval)
+            return True
+        except Exception:
+            return False
+
+    async def _watch(self):
+        while True:
+            if await self._is_alive():
+                continue
+            logger.warning("Lost the reference cache invalidation connection; reconnecting.")
+            self._clear_caches()
+            await self._close()
+            while True:
+                try:
+                    await self._listen()
+                    break
+                except Exception:
+                    logger.exception("Reconnecting for cache invalidations failed; retrying in %s seconds.", self.retry_delay)
+                    await asyncio.sleep(self.retry_delay)
+            self._clear_caches()
+            self.reconnects += 1
+            logger.info("Listening for reference cache invalidations again.")
+
+    async def start(self):
+        await self._listen()
+        self._task = asyncio.create_task(self._watch())
+        logger.info("Listening for reference cache invalidations.")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self._close()
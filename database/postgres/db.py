@@ -1,14 +1,63 @@
-from sqlmodel import Session, SQLModel, create_engine
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import NullPool
 from dotenv import load_dotenv
+from time import perf_counter
 import os
 
+from .pool import pool_metrics
+from .instrumentation import instrument_engine
+
 load_dotenv()
 
-engine = create_engine(os.getenv("POSTGRES_URL"), echo=True)
+def get_async_url(url: str) -> str:
+    """Point a plain ``postgresql://`` url at the asyncpg driver."""
+    return make_url(url).set(drivername="postgresql+asyncpg").render_as_string(hide_password=False)
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+def get_engine_options() -> dict:
+    """Build engine keyword arguments from the POSTGRES_* environment variables."""
+    options = {"echo": _env_bool("POSTGRES_ECHO", False)}
+
+    # NullPool opens a connection per session, e.g. for TestClient runs where every request gets its own event loop
+    if _env_bool("POSTGRES_POOL_DISABLED", False):
+        options["poolclass"] = NullPool
+        return options
+
+    options.update(
+        pool_size=int(os.getenv("POSTGRES_POOL_SIZE", "5")),
+        max_overflow=int(os.getenv("POSTGRES_POOL_MAX_OVERFLOW", "10")),
+        pool_timeout=float(os.getenv("POSTGRES_POOL_TIMEOUT", "30")),
+        pool_recycle=int(os.getenv("POSTGRES_POOL_RECYCLE", "1800")),
+        pool_pre_ping=_env_bool("POSTGRES_POOL_PRE_PING", True),
+    )
+    return options
+
+engine: AsyncEngine = create_async_engine(get_async_url(os.getenv("POSTGRES_URL")), **get_engine_options())
+# Per-request query counts, the slow-query log and the optional N+1 check
+instrument_engine(engine)
 
-def create_db_and_tables():
-    SQLModel.metadata.create_all(engine)
+async def create_db_and_tables():
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
 
-def get_session_db():
-    with Session(engine) as session:
+async def get_session_db():
+    # expire_on_commit=False keeps loaded attributes usable after commit without implicit IO
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        # Check the connection out up front so the pool wait can be measured
+        started = perf_counter()
+        try:
+            await session.connection()
+        except PoolTimeoutError:
+            pool_metrics.record_timeout()
+            raise
+        pool_metrics.record_wait(perf_counter() - started)
         yield session
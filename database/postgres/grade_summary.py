@@ -0,0 +1,128 @@
+"""Per-schooler, per-subject grade aggregates maintained incrementally next to every grade write.
+
+Each row keeps ``graded``, ``grade_sum`` and ``grade_sum_squares`` so the mean and the standard
+deviation are O(1) to read. Writers add signed deltas with ``INSERT ... ON CONFLICT DO UPDATE`` in
+the same transaction as the submission change; the upsert takes the row lock, so concurrent
+writers serialize on the summary row instead of losing updates.
+
+Usage:
+    python -m database.postgres.grade_summary
+"""
+from typing import Iterable, Optional, Tuple
+from collections import defaultdict
+from sqlalchemy import BigInteger, cast, delete, func, literal, text, true
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.sql.elements import ColumnElement
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+import asyncio
+
+from api.dependecies.models import Assignment, SubmittedAssignment, GradeSummary
+from database.postgres.bulk import BULK_BATCH_SIZE
+
+def _upsert(statement):
+    """Turn an insert into GradeSummary into one that adds to the existing row instead of failing."""
+    excluded = statement.excluded
+    return statement.on_conflict_do_update(
+        index_elements=[GradeSummary.schooler_id, GradeSummary.subject_id],
+        set_={
+            "graded": GradeSummary.graded + excluded.graded,
+            "grade_sum": GradeSummary.grade_sum + excluded.grade_sum,
+            "grade_sum_squares": GradeSummary.grade_sum_squares + excluded.grade_sum_squares,
+        }
+    )
+
+async def apply_grade_changes(
+    session: AsyncSession,
+    changes: Iterable[Tuple[int, int, Optional[int], Optional[int]]],
+    batch_size: int = BULK_BATCH_SIZE
+):
+    """
+    Apply ``(schooler_id, subject_id, old, new)`` grade moves with one multi-row upsert per batch; None means ungraded.
+
+    Moves are summed per summary row first, since one statement may not touch a row twice.
+    The caller owns the transaction and has to commit.
+    """
+    deltas: dict[Tuple[int, int], list[int]] = defaultdict(lambda: [0, 0, 0])
+    for schooler_id, subject_id, old, new in changes:
+        delta = deltas[(schooler_id, subject_id)]
+        delta[0] += (new is not None) - (old is not None)
+        delta[1] += (new or 0) - (old or 0)
+        delta[2] += (new or 0) ** 2 - (old or 0) ** 2
+    rows = [
+        {"schooler_id": schooler_id, "subject_id": subject_id, "graded": graded, "grade_sum": grade_sum, "grade_sum_squares": squares}
+        for (schooler_id, subject_id), (graded, grade_sum, squares) in deltas.items()
+        if graded or grade_sum or squares
+    ]
+    for start in range(0, len(rows), batch_size):
+        await session.exec(_upsert(pg_insert(GradeSummary).values(rows[start:start + batch_size])))
+
+async def apply_grade_change(
+    session: AsyncSession,
+    schooler_id: int,
+    subject_id: int,
+    old: Optional[int],
+    new: Optional[int]
+):
+    """
+    Move one submission's grade from ``old`` to ``new`` in the summary; None means ungraded.
+
+    The caller owns the transaction and has to commit.
+    """
+    await apply_grade_changes(session, [(schooler_id, subject_id, old, new)])
+
+async def apply_submission_grades(
+    session: AsyncSession,
+    where: ColumnElement,
+    sign: int,
+    subject_id: Optional[int] = None
+):
+    """
+    Add (``sign=1``) or subtract (``sign=-1``) the graded submissions matched by ``where`` in one statement.
+
+    Call it before deleting submissions and after inserting them. ``subject_id`` books the grades
+    against another subject than the assignment's, which is how a subject change is moved over.
+    The caller owns the transaction and has to commit.
+    """
+    grade = cast(SubmittedAssignment.grade, BigInteger)
+    subject = Assignment.subject_id if subject_id is None else literal(subject_id)
+    group_by = [SubmittedAssignment.schooler_id] if subject_id is not None else [SubmittedAssignment.schooler_id, Assignment.subject_id]
+    aggregates = (
+        select(
+            SubmittedAssignment.schooler_id,
+            subject,
+            sign * func.count(grade),
+            sign * func.sum(grade),
+            sign * func.sum(grade * grade),
+        )
+        .join(Assignment, Assignment.id == SubmittedAssignment.assignment_id)
+        .where(where, SubmittedAssignment.grade.is_not(None))
+        .group_by(*group_by)
+    )
+    columns = ["schooler_id", "subject_id", "graded", "grade_sum", "grade_sum_squares"]
+    await session.exec(_upsert(pg_insert(GradeSummary).from_select(columns, aggregates)))
+
+async def rebuild_grade_summary(session: AsyncSession) -> int:
+    """
+    Recompute the whole summary from ``submittedassignment`` and commit; returns the number of rows.
+
+    The EXCLUSIVE lock still lets readers through but makes incremental writers wait, so their deltas
+    land on top of the rebuilt rows instead of being counted twice or lost.
+    """
+    await session.exec(text(f"LOCK TABLE {GradeSummary.__tablename__} IN EXCLUSIVE MODE"))
+    await session.exec(delete(GradeSummary))
+    await apply_submission_grades(session, true(), 1)
+    rows = (await session.exec(select(func.count()).select_from(GradeSummary))).one()
+    await session.commit()
+    return rows
+
+async def _main():
+    from database.postgres.db import engine
+
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        rows = await rebuild_grade_summary(session)
+    await engine.dispose()
+    print(f"Rebuilt {rows} grade summary rows.")
+
+if __name__ == "__main__":
+    asyncio.run(_main())
@@ -0,0 +1,129 @@
+"""Per-request SQL instrumentation through engine events.
+
+Every statement run on the engine is counted into the ``QueryStats`` of the current request,
+which ``track_queries`` installs in a context variable. Statements slower than
+``POSTGRES_SLOW_QUERY_MS`` are sent to the Mongo logs collection with their SQL normalized,
+and with ``POSTGRES_N_PLUS_ONE_LIMIT`` set, the same normalized statement running that many
+times in one request raises ``NPlusOneError``.
+"""
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from time import perf_counter
+from typing import Any, Callable, Iterator, Optional
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from dotenv import load_dotenv
+import os
+import re
+
+from database.mongodb.audit import audit_logger
+
+load_dotenv()
+
+POSTGRES_SLOW_QUERY_MS = float(os.getenv("POSTGRES_SLOW_QUERY_MS", "200"))
+# 0 turns the N+1 check off
+POSTGRES_N_PLUS_ONE_LIMIT = int(os.getenv("POSTGRES_N_PLUS_ONE_LIMIT", "0"))
+
+class NPlusOneError(RuntimeError):
+    """The same statement ran too many times in one request, usually a lazy load inside a loop."""
+
+class QueryStats:
+    """Queries run on behalf of one request."""
+
+    def __init__(self, n_plus_one_limit: int = POSTGRES_N_PLUS_ONE_LIMIT, path: Optional[str] = None):
+        self.n_plus_one_limit = n_plus_one_limit
+        self.path = path
+        self.count = 0
+        self.total = 0.0
+        self.slowest = 0.0
+        self.slowest_statement: Optional[str] = None
+        self.statements: Counter = Counter()
+
+    def before(self, statement: str):
+        normalized = normalize_sql(statement)
+        self.statements[normalized] += 1
+        if self.n_plus_one_limit and self.statements[normalized] >= self.n_plus_one_limit:
+            raise NPlusOneError(
+                f"Statement ran {self.statements[normalized]} times in one request: {normalized}"
+            )
+
+    def after(self, statement: str, seconds: float):
+        self.count += 1
+        self.total += seconds
+        if seconds > self.slowest:
+            self.slowest = seconds
+            self.slowest_statement = normalize_sql(statement)
+
+current_query_stats: ContextVar[Optional[QueryStats]] = ContextVar("current_query_stats", default=None)
+
+@contextmanager
+def track_queries(n_plus_one_limit: int = POSTGRES_N_PLUS_ONE_LIMIT, path: Optional[str] = None) -> Iterator[QueryStats]:
+    """Count the queries run inside the block, including those of tasks it starts."""
+    stats = QueryStats(n_plus_one_limit, path)
+    token = current_query_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        current_query_stats.reset(token)
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_OR_PARAM = re.compile(r"(?<![\w.])(?:\$\d+|%\(\w+\)s|-?\d+(?:\.\d+)?)\b")
+_PLACEHOLDER_LIST = re.compile(r"\?(?:\s*,\s*\?)+")
+_REPEATED_ROWS = re.compile(r"(\([^()]*\))(?:\s*,\s*\1)+")
+_CASTS = re.compile(r"\?::\w+(?:\s*\[\])?")
+_WHITESPACE = re.compile(r"\s+")
+
+@lru_cache(maxsize=2048)
+def normalize_sql(statement: str) -> str:
+    """
+    Strip the values out of a statement so its different runs compare equal.
+
+    Literals and bind parameters become ``?``, expanded ``IN`` lists and multi-row ``VALUES``
+    collapse to one element followed by ``...``, and whitespace is squeezed.
+    """
+    normalized = _STRING_LITERAL.sub("?", statement)
+    normalized = _NUMBER_OR_PARAM.sub("?", normalized)
+    normalized = _CASTS.sub("?", normalized)
+    normalized = _PLACEHOLDER_LIST.sub("?, ...", normalized)
+    normalized = _REPEATED_ROWS.sub(r"\1, ...", normalized)
+    return _WHITESPACE.sub(" ", normalized).strip()
+
+def _log_slow_query(record: dict[str, Any]):
+    audit_logger.record({"kind": "slow_query", **record})
+
+def instrument_engine(
+    engine: AsyncEngine,
+    slow_query_ms: float = POSTGRES_SLOW_QUERY_MS,
+    on_slow_query: Callable[[dict[str, Any]], None] = _log_slow_query
+):
+    """Attach the cursor execute hooks to ``engine``; the hooks cost two clock reads outside of a request."""
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def before_cursor_execute(connection, cursor, statement, parameters, context, executemany):
+        connection.info.setdefault("query_started", []).append(perf_counter())
+        stats = current_query_stats.get()
+        if stats is not None:
+            stats.before(statement)
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def after_cursor_execute(connection, cursor, statement, parameters, context, executemany):
+        seconds = perf_counter() - connection.info["query_started"].pop()
+        stats = current_query_stats.get()
+        if stats is not None:
+            stats.after(statement, seconds)
+        if seconds * 1000 >= slow_query_ms:
+            on_slow_query({
+                "statement": normalize_sql(statement),
+                "duration_ms": seconds * 1000,
+                "executemany": executemany,
+                "path": stats.path if stats is not None else None,
+            })
+
+    @event.listens_for(engine.sync_engine, "handle_error")
+    def handle_error(exception_context):
+        # A failed statement never reaches after_cursor_execute, so drop its start time here
+        connection = exception_context.connection
+        if connection is not None and connection.info.get("query_started"):
+            connection.info["query_started"].pop()
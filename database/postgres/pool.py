@@ -0,0 +1,53 @@
+from sqlalchemy.pool import Pool
+from threading import Lock
+
+class PoolMetrics:
+    """Running counters for how long sessions waited to check out a connection."""
+
+    def __init__(self):
+        self._lock = Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.last_wait = 0.0
+
+    def record_wait(self, seconds: float):
+        with self._lock:
+            self.checkouts += 1
+            self.total_wait += seconds
+            self.last_wait = seconds
+            if seconds > self.max_wait:
+                self.max_wait = seconds
+
+    def record_timeout(self):
+        with self._lock:
+            self.timeouts += 1
+
+    def snapshot(self, pool: Pool) -> dict:
+        """Combine the live pool counters with the recorded wait times.
+
+        NullPool exposes no sizing information, so those counters are reported as ``None``.
+        """
+        size = getattr(pool, "size", None)
+        checked_in = getattr(pool, "checkedin", None)
+        checked_out = getattr(pool, "checkedout", None)
+        overflow = getattr(pool, "overflow", None)
+
+        with self._lock:
+            average = self.total_wait / self.checkouts if self.checkouts else 0.0
+            return {
+                "pool_class": type(pool).__name__,
+                "size": size() if size else None,
+                "checked_out": checked_out() if checked_out else None,
+                "idle": checked_in() if checked_in else None,
+                # overflow() goes negative while the pool is still below pool_size
+                "overflow": max(overflow(), 0) if overflow else None,
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_avg_ms": average * 1000,
+                "wait_max_ms": self.max_wait * 1000,
+                "wait_last_ms": self.last_wait * 1000,
+            }
+
+pool_metrics = PoolMetrics()
@@ -0,0 +1,189 @@
+"""Physical removal of soft-deleted classes and subjects.
+
+Deleting a class or subject only stamps ``deleted_at``; the live-row filters hide it and the
+rows under it at once, and ``PurgeWorker`` removes them later. Rows go leaves first, at most
+``PURGE_BATCH_SIZE`` per transaction with ``PURGE_BATCH_PAUSE`` seconds between batches, so a
+large cascade never holds its locks for long or crowds out the requests. The parent row goes
+last, when nothing is left for its ON DELETE CASCADE to do.
+
+Purge everything that is waiting right away, without pauses, with:
+    python -m database.postgres.purge
+"""
+from typing import Callable, List, Optional, Tuple, Type
+from sqlalchemy import delete, exists, text, tuple_
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.sql.elements import ColumnElement
+from sqlmodel import SQLModel, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from dotenv import load_dotenv
+import asyncio
+import logging
+import os
+
+from api.dependecies.models import Class, Subject, Teacher, Schooler, Assignment, SubmittedAssignment, GradeSummary
+from database.postgres.db import engine
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+PURGE_BATCH_SIZE = int(os.getenv("PURGE_BATCH_SIZE", "500"))
+PURGE_BATCH_PAUSE = float(os.getenv("PURGE_BATCH_PAUSE", "0.1"))
+PURGE_INTERVAL = float(os.getenv("PURGE_INTERVAL", "30"))
+# A batch gives up on a lock it can't get quickly instead of queueing requests up behind it
+PURGE_LOCK_TIMEOUT = os.getenv("PURGE_LOCK_TIMEOUT", "1s")
+# Advisory lock taken by every batch, so only one worker process purges at a time
+PURGE_LOCK_KEY = 250008
+
+# Soft-deleted table -> (teacher column that keeps a row from being deleted, children leaves first).
+# Each child is (table model, rows under the parent with the given id). Submission bodies and the
+# schoolers' summary rows are small and go with their batch through the cascade.
+PURGE_PLANS: dict[Type[SQLModel], Tuple[ColumnElement, List[Tuple[Type[SQLModel], Callable]]]] = {
+    Class: (Teacher.class_id, [
+        (
+            SubmittedAssignment,
+            lambda class_id: SubmittedAssignment.schooler_id.in_(select(Schooler.id).where(Schooler.class_id == class_id))
+        ),
+        (Schooler, lambda class_id: Schooler.class_id == class_id),
+    ]),
+    Subject: (Teacher.subject_id, [
+        (
+            SubmittedAssignment,
+            lambda subject_id: SubmittedAssignment.assignment_id.in_(select(Assignment.id).where(Assignment.subject_id == subject_id))
+        ),
+        (Assignment, lambda subject_id: Assignment.subject_id == subject_id),
+        (GradeSummary, lambda subject_id: GradeSummary.subject_id == subject_id),
+    ]),
+}
+
+class PurgeLocked(Exception):
+    """Another worker process holds the purge lock."""
+
+class PurgeWorker:
+    """
+    Background task that removes soft-deleted classes and subjects every ``interval`` seconds.
+
+    A pass works through the pending rows oldest first. A row that a teacher was attached to
+    after its delete is left alone, as deleting it would fail on the teacher's foreign key.
+    """
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        batch_size: int = PURGE_BATCH_SIZE,
+        pause: float = PURGE_BATCH_PAUSE,
+        interval: float = PURGE_INTERVAL
+    ):
+        self.engine = engine
+        self.batch_size = batch_size
+        self.pause = pause
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+        self.purged = 0
+        self.deleted_rows = 0
+        self.failed = 0
+
+    async def start(self):
+        self._task = asyncio.create_task(self._run())
+        logger.info("Purge worker started.")
+
+    async def stop(self):
+        """Stop between statements; an unfinished purge carries on with the next start."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self):
+        while True:
+            try:
+                await self.purge_pending()
+            except PurgeLocked:
+                pass
+            except Exception:
+                self.failed += 1
+                logger.exception("Purge pass failed; retrying in %s seconds.", self.interval)
+            await asyncio.sleep(self.interval)
+
+    async def purge_pending(self) -> int:
+        """
+        Purge every soft-deleted row that is waiting.
+
+        Returns:
+            int: Number of classes and subjects removed.
+
+        Raises:
+            PurgeLocked: Another worker process is purging.
+        """
+        purged = 0
+        async with AsyncSession(self.engine) as session:
+            for model, (taught, _) in PURGE_PLANS.items():
+                pending = (await session.exec(
+                    select(model.id)
+                    .where(model.deleted_at.is_not(None), ~exists().where(taught == model.id))
+                    .order_by(model.deleted_at, model.id)
+                )).all()
+                await session.commit()
+                for row_id in pending:
+                    purged += await self.purge_row(session, model, row_id)
+        return purged
+
+    async def purge_row(self, session: AsyncSession, model: Type[SQLModel], row_id: int) -> int:
+        """Remove one soft-deleted row batch by batch; 1 when it was removed, 0 when it was gone or still taught."""
+        taught, children = PURGE_PLANS[model]
+        for child, under in children:
+            key = list(child.__table__.primary_key.columns)
+            # SKIP LOCKED leaves rows a request is writing to the cascade of the final delete
+            batch = select(*key).where(under(row_id)).limit(self.batch_size).with_for_update(skip_locked=True)
+            while True:
+                deleted = await self._batch(session, delete(child.__table__).where(tuple_(*key).in_(batch)))
+                if deleted < self.batch_size:
+                    break
+                await asyncio.sleep(self.pause)
+
+        table = model.__table__
+        removed = await self._batch(session, delete(table).where(
+            table.c.id == row_id, table.c.deleted_at.is_not(None), ~exists().where(taught == table.c.id)
+        ))
+        self.purged += removed
+        return removed
+
+    async def _batch(self, session: AsyncSession, statement) -> int:
+        """Run one delete in a transaction of its own and return the number of rows it removed."""
+        try:
+            locked = (await session.exec(
+                text("SELECT pg_try_advisory_xact_lock(:key)").bindparams(key=PURGE_LOCK_KEY)
+            )).scalar()
+            if not locked:
+                raise PurgeLocked()
+            await session.exec(text(f"SET LOCAL lock_timeout = '{PURGE_LOCK_TIMEOUT}'"))
+            deleted = (await session.exec(statement)).rowcount
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+        self.deleted_rows += deleted
+        return deleted
+
+    def stats(self) -> dict:
+        return {
+            "running": self._task is not None,
+            "purged": self.purged,
+            "deleted_rows": self.deleted_rows,
+            "failed": self.failed,
+        }
+
+purge_worker = PurgeWorker(engine)
+
+async def _main():
+    worker = PurgeWorker(engine, pause=0)
+    purged = await worker.purge_pending()
+    await engine.dispose()
+    print(f"Purged {purged} deleted classes and subjects ({worker.deleted_rows} rows in total).")
+
+if __name__ == "__main__":
+    asyncio.run(_main())
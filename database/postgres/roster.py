@@ -0,0 +1,170 @@
+"""Roster CSV import: validate in chunks, COPY into a staging table and merge with one statement.
+
+Usage:
+    python -m database.postgres.roster schooler roster.csv
+"""
+from typing import IO, Iterator, List, Tuple, Type
+from sqlalchemy import text
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+from pydantic import ValidationError
+from datetime import date
+import argparse
+import asyncio
+import csv
+
+from api.dependecies.models import (
+    Schooler, SchoolerCreate, Teacher, TeacherCreate, Class, Subject,
+    RosterRowError, RosterImportReport
+)
+
+# Rows validated and copied per round trip
+ROSTER_CHUNK_SIZE = 5000
+# Only the first errors are returned, the counts always cover the whole file
+MAX_REPORTED_ERRORS = 1000
+
+STAGING_TABLE = "roster_staging"
+
+# learner -> (table model, create model, foreign keys)
+ROSTERS: dict[str, Tuple[Type[SQLModel], Type[SQLModel], dict[str, Type[SQLModel]]]] = {
+    "schooler": (Schooler, SchoolerCreate, {"class_id": Class}),
+    "teacher": (Teacher, TeacherCreate, {"class_id": Class, "subject_id": Subject}),
+}
+
+def read_roster_chunks(
+    stream: IO[str],
+    create_model: Type[SQLModel],
+    columns: List[str],
+    chunk_size: int = ROSTER_CHUNK_SIZE
+) -> Iterator[Tuple[List[tuple], List[RosterRowError]]]:
+    """Yield ``(records, errors)`` per chunk of CSV rows; records follow ``columns`` and end with the line number."""
+    reader = csv.DictReader(stream)
+    today = date.today()
+    records: List[tuple] = []
+    errors: List[RosterRowError] = []
+
+    for row in reader:
+        try:
+            item = create_model.model_validate(row)
+        except ValidationError as e:
+            errors.append(RosterRowError(
+                line=reader.line_num,
+                errors=[f"{'.'.join(map(str, error['loc']))}: {error['msg']}" for error in e.errors()]
+            ))
+        else:
+            values = item.model_dump()
+            records.append(tuple(today if column == "added" else values[column] for column in columns) + (reader.line_num,))
+
+        if len(records) + len(errors) >= chunk_size:
+            yield records, errors
+            records, errors = [], []
+
+    if records or errors:
+        yield records, errors
+
+def _merge_statement(model: Type[SQLModel], columns: List[str], references: dict[str, Type[SQLModel]]):
+    """Build the set-based merge from the staging table into ``model``'s table.
+
+    The statement returns one row per rejected staging line with the reason it was rejected.
+    """
+    table = model.__tablename__
+    column_list = ", ".join(columns)
+    staged_columns = ", ".join(f"s.{column}" for column in columns)
+    reference_checks = [
+        # Both referenced tables are soft-deleted; a deleted class or subject counts as missing
+        (column, f"EXISTS (SELECT 1 FROM {target.__tablename__} t WHERE t.id = s.{column} AND t.deleted_at IS NULL)")
+        for column, target in references.items()
+    ]
+    references_ok = " AND ".join(check for _, check in reference_checks) or "TRUE"
+    reasons = " ".join(
+        f"WHEN NOT {check} THEN '{column} ' || s.{column} || ' does not exist'" for column, check in reference_checks
+    )
+
+    return text(f"""
+        WITH candidates AS (
+            SELECT DISTINCT ON (s.email) {staged_columns}, s.line
+            FROM {STAGING_TABLE} s
+            WHERE {references_ok}
+            ORDER BY s.email, s.line
+        ), inserted AS (
+            INSERT INTO {table} ({column_list})
+            SELECT {column_list} FROM candidates
+            ON CONFLICT DO NOTHING
+            RETURNING email
+        )
+        SELECT s.line, CASE {reasons} ELSE 'duplicates an existing unique value' END AS reason
+        FROM {STAGING_TABLE} s
+        WHERE s.line NOT IN (
+            SELECT c.line FROM candidates c JOIN inserted i ON i.email = c.email
+        )
+        ORDER BY s.line
+    """)
+
+async def import_roster(session: AsyncSession, learner: str, stream: IO[str]) -> RosterImportReport:
+    """
+    Import a schooler or teacher roster CSV in one transaction.
+
+    Args:
+        session (AsyncSession): Database session; committed on success.
+        learner (str): ``schooler`` or ``teacher``.
+        stream (IO[str]): CSV text with a header row naming the ``*Create`` fields.
+
+    Returns:
+        RosterImportReport: Row counts and the rejected lines with their reasons.
+    """
+    model, create_model, references = ROSTERS[learner]
+    columns = [*create_model.model_fields, "added"]
+
+    connection = await session.connection()
+    await connection.execute(text(
+        f"CREATE TEMP TABLE {STAGING_TABLE} ON COMMIT DROP AS "
+        f"SELECT {', '.join(columns)}, NULL::integer AS line FROM {model.__tablename__} WITH NO DATA"
+    ))
+    # COPY is only reachable on the asyncpg connection itself
+    raw_connection = await connection.get_raw_connection()
+    driver_connection = raw_connection.driver_connection
+
+    received = staged = 0
+    errors: List[RosterRowError] = []
+    chunks = read_roster_chunks(stream, create_model, columns)
+    while True:
+        # Parsing and validation are CPU bound, keep them off the event loop
+        chunk = await asyncio.to_thread(next, chunks, None)
+        if chunk is None:
+            break
+        records, chunk_errors = chunk
+        received += len(records) + len(chunk_errors)
+        staged += len(records)
+        errors.extend(chunk_errors)
+        if records:
+            await driver_connection.copy_records_to_table(STAGING_TABLE, records=records, columns=[*columns, "line"])
+
+    rejected = (await connection.execute(_merge_statement(model, columns, references))).all()
+    errors.extend(RosterRowError(line=line, errors=[reason]) for line, reason in rejected)
+    await session.commit()
+
+    errors.sort(key=lambda error: error.line)
+    return RosterImportReport(
+        learner=learner,
+        received=received,
+        staged=staged,
+        inserted=staged - len(rejected),
+        rejected=len(errors),
+        errors=errors[:MAX_REPORTED_ERRORS]
+    )
+
+async def _main(learner: str, path: str):
+    from database.postgres.db import engine
+
+    with open(path, encoding="utf-8-sig", newline="") as stream:
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            report = await import_roster(session, learner, stream)
+    await engine.dispose()
+    print(report.model_dump_json(indent=2))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import a schooler or teacher roster CSV.")
+    parser.add_argument("learner", choices=sorted(ROSTERS))
+    parser.add_argument("path", help="CSV file with a header row")
+    args = parser.parse_args()
+    asyncio.run(_main(args.learner, args.path))
@@ -0,0 +1,124 @@
+"""Storage of submitted work.
+
+Bodies up to ``SUBMISSION_INLINE_LIMIT`` bytes stay in ``submittedassignment.work``; longer
+ones go to the ``submissionbody`` side table, which TOAST stores compressed, and ``work`` is
+left NULL. Either way the submission row carries ``work_size`` and ``work_hash`` and a search
+vector of the full text, so listings never have to read a body.
+
+After lowering the limit, move existing bodies with:
+    python -m database.postgres.work_storage
+"""
+from typing import Any, Iterator
+from sqlalchemy import delete, func, select, text, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlmodel.ext.asyncio.session import AsyncSession
+from dotenv import load_dotenv
+import asyncio
+import hashlib
+import os
+
+from api.dependecies.models import SubmittedAssignment, SubmissionBody, SEARCH_CONFIG
+
+load_dotenv()
+
+# Matches the TOAST threshold, below which Postgres wouldn't compress the body anyway
+SUBMISSION_INLINE_LIMIT = int(os.getenv("SUBMISSION_INLINE_LIMIT", "2048"))
+# Bytes per chunk when streaming a body
+WORK_CHUNK_SIZE = 16384
+# Rows moved per transaction by offload_inline_work
+OFFLOAD_BATCH_SIZE = 1000
+
+def is_offloaded(work: str) -> bool:
+    return len(work.encode()) > SUBMISSION_INLINE_LIMIT
+
+def work_columns(work: str) -> dict[str, Any]:
+    """Values of the ``submittedassignment`` columns that describe ``work``, for an INSERT or UPDATE."""
+    encoded = work.encode()
+    return {
+        "work": None if len(encoded) > SUBMISSION_INLINE_LIMIT else work,
+        "work_size": len(encoded),
+        "work_hash": hashlib.sha256(encoded).hexdigest(),
+        "search_vector": func.to_tsvector(SEARCH_CONFIG, work),
+    }
+
+async def write_work_body(session: AsyncSession, submitted_assignment_id: int, work: str, replace: bool = True):
+    """
+    Keep ``submissionbody`` in step after writing ``work_columns(work)`` to a submission.
+
+    With ``replace`` a previous long body is overwritten or, when ``work`` now fits inline,
+    removed; a fresh submission has none, so creates pass ``replace=False`` and short bodies
+    cost no statement at all. The caller owns the transaction.
+    """
+    if is_offloaded(work):
+        statement = pg_insert(SubmissionBody).values(submitted_assignment_id=submitted_assignment_id, body=work)
+        if replace:
+            statement = statement.on_conflict_do_update(
+                index_elements=[SubmissionBody.submitted_assignment_id], set_={"body": statement.excluded.body}
+            )
+        await session.exec(statement)
+    elif replace:
+        await session.exec(delete(SubmissionBody).where(SubmissionBody.submitted_assignment_id == submitted_assignment_id))
+
+async def update_work(session: AsyncSession, submitted_assignment_id: int, work: str):
+    """Replace the body of a submission in both tables; the caller commits."""
+    # Core update on the table, as search_vector isn't a mapped attribute
+    await session.exec(
+        update(SubmittedAssignment.__table__)
+        .where(SubmittedAssignment.__table__.c.id == submitted_assignment_id)
+        .values(**work_columns(work))
+    )
+    await write_work_body(session, submitted_assignment_id, work)
+
+def work_text():
+    """The body of ``SubmittedAssignment`` as a SQL expression, wherever it is stored."""
+    # A correlated subquery rather than a join, so it is only evaluated for the rows that are returned
+    offloaded = (
+        select(SubmissionBody.body)
+        .where(SubmissionBody.submitted_assignment_id == SubmittedAssignment.id)
+        .scalar_subquery()
+    )
+    return func.coalesce(SubmittedAssignment.work, offloaded)
+
+def iter_work(work: str, chunk_size: int = WORK_CHUNK_SIZE) -> Iterator[bytes]:
+    encoded = work.encode()
+    for start in range(0, len(encoded), chunk_size):
+        yield encoded[start:start + chunk_size]
+
+async def offload_inline_work(session: AsyncSession, batch_size: int = OFFLOAD_BATCH_SIZE) -> int:
+    """
+    Move inline bodies longer than ``SUBMISSION_INLINE_LIMIT`` to ``submissionbody``, one committed batch at a time.
+
+    Returns:
+        int: Number of bodies moved.
+    """
+    moved = 0
+    while True:
+        # SKIP LOCKED so a batch never waits on a submission that is being graded
+        result = await session.exec(text("""
+            WITH batch AS (
+                SELECT id, work FROM submittedassignment
+                WHERE work IS NOT NULL AND octet_length(work) > :limit
+                ORDER BY id LIMIT :batch_size
+                FOR UPDATE SKIP LOCKED
+            ), stored AS (
+                INSERT INTO submissionbody (submitted_assignment_id, body)
+                SELECT id, work FROM batch
+                ON CONFLICT (submitted_assignment_id) DO UPDATE SET body = EXCLUDED.body
+            )
+            UPDATE submittedassignment SET work = NULL FROM batch WHERE submittedassignment.id = batch.id
+        """).bindparams(limit=SUBMISSION_INLINE_LIMIT, batch_size=batch_size))
+        await session.commit()
+        if not result.rowcount:
+            return moved
+        moved += result.rowcount
+
+async def _main():
+    from database.postgres.db import engine
+
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        moved = await offload_inline_work(session)
+    await engine.dispose()
+    print(f"Moved {moved} submission bodies to {SubmissionBody.__tablename__}.")
+
+if __name__ == "__main__":
+    asyncio.run(_main())
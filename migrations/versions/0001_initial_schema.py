@@ -0,0 +1,106 @@
+"""initial schema
+
+The tables as create_all used to build them on startup. Databases created that way
+already match this revision and only need ``alembic stamp 0001``; the unique key that
+the ON CONFLICT submit relies on came later and is added by 0001b.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+def _user_columns():
+    return [
+        sa.Column("first_name", sa.String(100), nullable=False),
+        sa.Column("last_name", sa.String(100), nullable=False),
+        sa.Column("email", sa.String(100), nullable=False),
+        sa.Column("age", sa.Integer(), nullable=False),
+    ]
+
+def upgrade():
+    op.create_table(
+        "class",
+        sa.Column("name", sa.String(3), nullable=False),
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("added", sa.Date(), nullable=False),
+        sa.UniqueConstraint("name", name="class_name_key"),
+    )
+    op.create_table(
+        "subject",
+        sa.Column("name", sa.String(100), nullable=False),
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("added", sa.Date(), nullable=False),
+        sa.UniqueConstraint("name", name="subject_name_key"),
+    )
+    op.create_table(
+        "admin",
+        *_user_columns(),
+        sa.Column("admin_id", sa.Integer(), primary_key=True),
+        sa.Column("added", sa.Date(), nullable=False),
+    )
+    op.create_index("ix_admin_email", "admin", ["email"], unique=True)
+    op.create_table(
+        "teacher",
+        *_user_columns(),
+        sa.Column("class_id", sa.Integer(), nullable=False),
+        sa.Column("subject_id", sa.Integer(), nullable=False),
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("added", sa.Date(), nullable=False),
+        sa.ForeignKeyConstraint(["class_id"], ["class.id"], name="teacher_class_id_fkey"),
+        sa.ForeignKeyConstraint(["subject_id"], ["subject.id"], name="teacher_subject_id_fkey"),
+        sa.UniqueConstraint("class_id", name="teacher_class_id_key"),
+    )
+    op.create_index("ix_teacher_email", "teacher", ["email"], unique=True)
+    op.create_table(
+        "schooler",
+        *_user_columns(),
+        sa.Column("class_id", sa.Integer(), nullable=False),
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("added", sa.Date(), nullable=False),
+        sa.ForeignKeyConstraint(["class_id"], ["class.id"], name="schooler_class_id_fkey"),
+    )
+    op.create_index("ix_schooler_email", "schooler", ["email"], unique=True)
+    op.create_table(
+        "assignment",
+        sa.Column("teacher_id", sa.Integer(), nullable=False),
+        sa.Column("subject_id", sa.Integer(), nullable=False),
+        sa.Column("title", sa.String(150), nullable=False),
+        sa.Column("description", sa.String(1000), nullable=False),
+        sa.Column("assign_type", sa.String(25), nullable=False),
+        sa.Column("deadline", sa.Date(), nullable=False),
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("added", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("changed", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.ForeignKeyConstraint(["teacher_id"], ["teacher.id"], name="assignment_teacher_id_fkey"),
+        sa.ForeignKeyConstraint(["subject_id"], ["subject.id"], name="assignment_subject_id_fkey"),
+    )
+    op.create_index("ix_assignment_added", "assignment", ["added"])
+    op.create_index("ix_assignment_changed", "assignment", ["changed"])
+    op.create_table(
+        "submittedassignment",
+        sa.Column("work", sa.String(15000), nullable=False),
+        sa.Column("grade", sa.Integer(), nullable=True),
+        sa.Column("schooler_id", sa.Integer(), nullable=False),
+        sa.Column("assignment_id", sa.Integer(), nullable=False),
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("submitted", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.ForeignKeyConstraint(["schooler_id"], ["schooler.id"], name="submittedassignment_schooler_id_fkey"),
+        sa.ForeignKeyConstraint(["assignment_id"], ["assignment.id"], name="submittedassignment_assignment_id_fkey"),
+    )
+    op.create_index("ix_submittedassignment_submitted", "submittedassignment", ["submitted"])
+
+def downgrade():
+    op.drop_table("submittedassignment")
+    op.drop_table("assignment")
+    op.drop_table("schooler")
+    op.drop_table("teacher")
+    op.drop_table("admin")
+    op.drop_table("subject")
+    op.drop_table("class")
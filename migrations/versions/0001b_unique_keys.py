@@ -0,0 +1,37 @@
+"""unique key for conflict-free submission inserts
+
+Adds the unique key on submittedassignment (schooler_id, assignment_id) that the
+INSERT ... ON CONFLICT DO NOTHING submit relies on. A database stamped at 0001 from an older
+create_all may already hold several submissions by a schooler to one assignment. Those are
+left for a person to resolve: the upgrade stops and names them instead of deleting any.
+
+Revision ID: 0001b
+Revises: 0001
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001b"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    duplicates = op.get_bind().execute(sa.text("""
+        SELECT schooler_id, assignment_id, count(*) FROM submittedassignment
+        GROUP BY schooler_id, assignment_id HAVING count(*) > 1
+        ORDER BY schooler_id, assignment_id LIMIT 20
+    """)).all()
+    if duplicates:
+        listed = ", ".join(f"schooler {s} / assignment {a} ({n} rows)" for s, a, n in duplicates)
+        raise RuntimeError(
+            "submittedassignment holds duplicate (schooler_id, assignment_id) pairs; "
+            f"remove them before upgrading: {listed}"
+        )
+    op.create_unique_constraint(
+        "submittedassignment_schooler_id_assignment_id_key", "submittedassignment", ["schooler_id", "assignment_id"]
+    )
+
+def downgrade():
+    op.drop_constraint("submittedassignment_schooler_id_assignment_id_key", "submittedassignment", type_="unique")
@@ -0,0 +1,39 @@
+"""foreign key and keyset indexes
+
+Built with CREATE INDEX CONCURRENTLY so a live database keeps taking writes.
+submittedassignment.schooler_id is already covered by the leading column of its unique
+key and gets no separate index.
+
+Revision ID: 0002
+Revises: 0001b
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+revision = "0002"
+down_revision = "0001b"
+branch_labels = None
+depends_on = None
+
+# name, table, columns
+INDEXES = [
+    ("ix_schooler_class_id_last_name_id", "schooler", ["class_id", "last_name", "id"]),
+    ("ix_schooler_last_name_id", "schooler", ["last_name", "id"]),
+    ("ix_teacher_subject_id", "teacher", ["subject_id"]),
+    ("ix_teacher_last_name_id", "teacher", ["last_name", "id"]),
+    ("ix_admin_last_name_admin_id", "admin", ["last_name", "admin_id"]),
+    ("ix_assignment_teacher_id", "assignment", ["teacher_id"]),
+    ("ix_assignment_subject_id", "assignment", ["subject_id"]),
+    ("ix_submittedassignment_assignment_id_submitted_id", "submittedassignment", ["assignment_id", "submitted", "id"]),
+]
+
+def upgrade():
+    # CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, postgresql_concurrently=True, if_not_exists=True)
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
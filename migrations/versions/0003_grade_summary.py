@@ -0,0 +1,42 @@
+"""grade summary table
+
+Per-schooler, per-subject running aggregates of graded submissions, backfilled from
+submittedassignment. ``python -m database.postgres.grade_summary`` rebuilds it later on.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_table(
+        "gradesummary",
+        sa.Column("schooler_id", sa.Integer(), primary_key=True),
+        sa.Column("subject_id", sa.Integer(), primary_key=True),
+        sa.Column("graded", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("grade_sum", sa.BigInteger(), server_default="0", nullable=False),
+        sa.Column("grade_sum_squares", sa.BigInteger(), server_default="0", nullable=False),
+        sa.ForeignKeyConstraint(["schooler_id"], ["schooler.id"], name="gradesummary_schooler_id_fkey", ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["subject_id"], ["subject.id"], name="gradesummary_subject_id_fkey", ondelete="CASCADE"),
+    )
+    op.create_index("ix_gradesummary_subject_id", "gradesummary", ["subject_id"])
+    op.execute(
+        """
+        INSERT INTO gradesummary (schooler_id, subject_id, graded, grade_sum, grade_sum_squares)
+        SELECT s.schooler_id, a.subject_id, count(s.grade), sum(s.grade::bigint), sum(s.grade::bigint * s.grade)
+        FROM submittedassignment s
+        JOIN assignment a ON a.id = s.assignment_id
+        WHERE s.grade IS NOT NULL
+        GROUP BY s.schooler_id, a.subject_id
+        """
+    )
+
+def downgrade():
+    op.drop_table("gradesummary")
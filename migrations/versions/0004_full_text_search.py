@@ -0,0 +1,45 @@
+"""full-text search vectors
+
+Adds stored generated tsvector columns to assignment and submittedassignment and GIN
+indexes over them. Adding a stored generated column rewrites the table, so plan the
+upgrade for a quiet window on large databases; the indexes are then built concurrently.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import TSVECTOR
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+# table, generated expression, index name
+SEARCH_VECTORS = [
+    (
+        "assignment",
+        "setweight(to_tsvector('english', title), 'A') || setweight(to_tsvector('english', description), 'B')",
+        "ix_assignment_search_vector",
+    ),
+    ("submittedassignment", "to_tsvector('english', work)", "ix_submittedassignment_search_vector"),
+]
+
+def upgrade():
+    for table, expression, _ in SEARCH_VECTORS:
+        op.add_column(table, sa.Column("search_vector", TSVECTOR(), sa.Computed(expression, persisted=True)))
+    # CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        for table, _, name in SEARCH_VECTORS:
+            op.create_index(
+                name, table, ["search_vector"], postgresql_using="gin", postgresql_concurrently=True, if_not_exists=True
+            )
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for table, _, name in reversed(SEARCH_VECTORS):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+    for table, _, _ in reversed(SEARCH_VECTORS):
+        op.drop_column(table, "search_vector")
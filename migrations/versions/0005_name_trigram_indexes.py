@@ -0,0 +1,33 @@
+"""name trigram indexes
+
+Enables pg_trgm and builds GIN trigram indexes over ``first_name || ' ' || last_name`` of
+every person table for the fuzzy name lookup. The expression has to stay identical to
+``full_name`` in the models, or the planner won't use the indexes.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+TABLES = ["schooler", "teacher", "admin"]
+
+def upgrade():
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        for table in TABLES:
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_{table}_full_name_trgm "
+                f"ON {table} USING gin ((first_name || ' ' || last_name) gin_trgm_ops)"
+            )
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for table in reversed(TABLES):
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS ix_{table}_full_name_trgm")
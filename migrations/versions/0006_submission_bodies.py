@@ -0,0 +1,66 @@
+"""submission body storage
+
+Adds ``work_size`` and ``work_hash`` to submittedassignment and the ``submissionbody`` side
+table, then moves bodies longer than 2048 bytes (``SUBMISSION_INLINE_LIMIT``'s default) there
+and leaves ``work`` NULL. ``search_vector`` stops being generated, keeping its values, because
+the application now writes it from the full text wherever that is stored.
+``python -m database.postgres.work_storage`` moves bodies again after changing the limit.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import TSVECTOR
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+INLINE_LIMIT = 2048
+
+def upgrade():
+    op.add_column("submittedassignment", sa.Column("work_size", sa.Integer(), server_default="0", nullable=False))
+    op.add_column("submittedassignment", sa.Column("work_hash", sa.String(64), nullable=True))
+    op.alter_column("submittedassignment", "work", existing_type=sa.String(15000), nullable=True)
+    # Before work is cleared below, or the generated vector would be recomputed from NULL
+    op.execute("ALTER TABLE submittedassignment ALTER COLUMN search_vector DROP EXPRESSION")
+
+    op.create_table(
+        "submissionbody",
+        sa.Column(
+            "submitted_assignment_id", sa.Integer(),
+            sa.ForeignKey("submittedassignment.id", ondelete="CASCADE"), primary_key=True
+        ),
+        sa.Column("body", sa.Text(), nullable=False),
+    )
+
+    op.execute(
+        "UPDATE submittedassignment SET work_size = octet_length(work), "
+        "work_hash = encode(sha256(convert_to(work, 'UTF8')), 'hex')"
+    )
+    op.execute(
+        "INSERT INTO submissionbody (submitted_assignment_id, body) "
+        f"SELECT id, work FROM submittedassignment WHERE octet_length(work) > {INLINE_LIMIT}"
+    )
+    op.execute(f"UPDATE submittedassignment SET work = NULL WHERE octet_length(work) > {INLINE_LIMIT}")
+
+def downgrade():
+    op.execute(
+        "UPDATE submittedassignment SET work = submissionbody.body FROM submissionbody "
+        "WHERE submissionbody.submitted_assignment_id = submittedassignment.id"
+    )
+    op.drop_table("submissionbody")
+    op.alter_column("submittedassignment", "work", existing_type=sa.String(15000), nullable=False)
+    # A column can't become generated again, so it is recreated the way 0004 added it
+    op.drop_index("ix_submittedassignment_search_vector", table_name="submittedassignment", if_exists=True)
+    op.drop_column("submittedassignment", "search_vector")
+    op.add_column(
+        "submittedassignment",
+        sa.Column("search_vector", TSVECTOR(), sa.Computed("to_tsvector('english', work)", persisted=True))
+    )
+    op.create_index("ix_submittedassignment_search_vector", "submittedassignment", ["search_vector"], postgresql_using="gin")
+    op.drop_column("submittedassignment", "work_hash")
+    op.drop_column("submittedassignment", "work_size")
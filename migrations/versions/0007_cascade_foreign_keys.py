@@ -0,0 +1,47 @@
+"""on delete cascade foreign keys
+
+Recreates the foreign keys under class, teacher, subject, schooler and assignment with
+ON DELETE CASCADE, so deleting a parent is one statement instead of the ORM loading and
+deleting every child. teacher.class_id and teacher.subject_id keep refusing the delete.
+
+Each key is added NOT VALID first, which needs only a brief lock, and validated afterwards
+without blocking writes. Every cascading column already has an index leading with it.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+# table, column, referenced table
+FOREIGN_KEYS = [
+    ("schooler", "class_id", "class"),
+    ("assignment", "teacher_id", "teacher"),
+    ("assignment", "subject_id", "subject"),
+    ("submittedassignment", "schooler_id", "schooler"),
+    ("submittedassignment", "assignment_id", "assignment"),
+]
+
+def _replace(on_delete: str):
+    for table, column, referenced in FOREIGN_KEYS:
+        name = f"{table}_{column}_fkey"
+        op.execute(f"ALTER TABLE {table} DROP CONSTRAINT {name}")
+        op.execute(
+            f"ALTER TABLE {table} ADD CONSTRAINT {name} FOREIGN KEY ({column}) "
+            f"REFERENCES {referenced} (id) ON DELETE {on_delete} NOT VALID"
+        )
+    # Validation scans the tables under a lock that still lets reads and writes through
+    with op.get_context().autocommit_block():
+        for table, column, _ in FOREIGN_KEYS:
+            op.execute(f"ALTER TABLE {table} VALIDATE CONSTRAINT {table}_{column}_fkey")
+
+def upgrade():
+    _replace("CASCADE")
+
+def downgrade():
+    _replace("NO ACTION")
@@ -0,0 +1,43 @@
+"""soft delete of classes and subjects
+
+Adds ``deleted_at`` to class and subject. A delete now only stamps it and the purge worker
+(``database.postgres.purge``) removes the rows and their cascade later, in small batches.
+The unique names become partial unique indexes over live rows, and a partial index over the
+deleted ones lets the worker find what is waiting without scanning the tables.
+
+Both tables are small; the new unique index is built before the old constraint goes, so names
+stay unique throughout.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+TABLES = ["class", "subject"]
+
+def upgrade():
+    for table in TABLES:
+        op.add_column(table, sa.Column("deleted_at", sa.DateTime(timezone=True), nullable=True))
+        op.create_index(
+            f"uq_{table}_name_live", table, ["name"], unique=True, postgresql_where=sa.text("deleted_at IS NULL")
+        )
+        op.drop_constraint(f"{table}_name_key", table, type_="unique")
+        op.create_index(
+            f"ix_{table}_deleted_at", table, ["deleted_at"], postgresql_where=sa.text("deleted_at IS NOT NULL")
+        )
+
+def downgrade():
+    # Rows still waiting for the purge would be live again, so they go now, cascade included
+    for table in TABLES:
+        op.execute(f"DELETE FROM {table} WHERE deleted_at IS NOT NULL")
+        op.drop_index(f"ix_{table}_deleted_at", table_name=table)
+        op.create_unique_constraint(f"{table}_name_key", table, ["name"])
+        op.drop_index(f"uq_{table}_name_live", table_name=table)
+        op.drop_column(table, "deleted_at")